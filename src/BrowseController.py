@@ -0,0 +1,150 @@
+"""
+Page requests for the Browse Mods tab.
+
+Every navigation (page change, search, refresh) starts a new generation. A
+fetch is tagged with the generation that wants it, and its result is shown
+only if that is still the current generation; older results are kept in the
+page cache but never overwrite what the user has moved on to. Navigating to
+a page that is already being fetched (typically the prefetch of the next
+page) adopts that fetch instead of starting a second one.
+
+While page N is shown, page N+1 is fetched in the background, so Next is
+usually served from the cache. Search-as-you-type is debounced.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Tuple
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+import Util
+
+# Game ID for "Sonic Racing Crossworlds"
+GAME_ID = 21640
+SORT = "Featured"  # Hardcoded to always use Featured
+PAGE_TTL = 2 * 60  # seconds
+MAX_CACHED_PAGES = 20
+SEARCH_DEBOUNCE_MS = 400
+
+PageKey = Tuple[str, int]  # (search query, page)
+
+
+def fetch_page(search: str, page: int):
+    """Fetches one page of Browse results: (mods, metadata)."""
+    # Search overrides all other filters and uses the Subfeed endpoint.
+    if search:
+        return Util.get_gb_mod_list(GAME_ID, 'default', page, search, None)
+    return Util.fetch_specialized_lists(GAME_ID, SORT, page)
+
+
+class BrowseController(QObject):
+    """Fetches, caches and prefetches Browse pages, and drops results nobody is waiting for."""
+    loading = Signal(int, str)  # (page, search query)
+    page_ready = Signal(int, str, object, object)  # (page, search query, mods, metadata)
+    page_failed = Signal(int, str, str)  # (page, search query, message)
+    _fetched = Signal(int, object, object, object, str)  # (generation, key, mods, metadata, error)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._generation = 0
+        self._current: PageKey = ("", 1)
+        self._in_flight: Dict[PageKey, int] = {}  # key -> generation that wants it shown (0 = prefetch)
+        self._cache: "OrderedDict[PageKey, tuple]" = OrderedDict()  # key -> (expires at, mods, metadata)
+        self._fetched.connect(self._on_fetched)
+
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(SEARCH_DEBOUNCE_MS)
+        self._search_timer.timeout.connect(self._on_search_settled)
+        self._pending_search = ""
+
+    @property
+    def current_page(self) -> int:
+        return self._current[1]
+
+    @property
+    def current_search(self) -> str:
+        return self._current[0]
+
+    def show_page(self, page: int, search: str = "", refresh: bool = False) -> None:
+        """Shows a page: from the cache when possible, otherwise once its fetch returns."""
+        self._search_timer.stop()
+        self._generation += 1
+        key = (search, page)
+        self._current = key
+        if refresh:
+            self._cache.pop(key, None)
+        else:
+            cached = self._cached(key)
+            if cached is not None:
+                print(f"[DEBUG] Browse page {page} (search='{search}') served from cache.")
+                self.page_ready.emit(page, search, cached[0], cached[1])
+                self._prefetch_next(key, cached[1])
+                return
+
+        self.loading.emit(page, search)
+        if key in self._in_flight and not refresh:
+            # Already on its way (e.g. prefetched): show it when it arrives.
+            self._in_flight[key] = self._generation
+            return
+        self._start_fetch(key, self._generation)
+
+    def search_changed(self, text: str) -> None:
+        """Search-as-you-type: runs the search once typing pauses."""
+        self._pending_search = text.strip()
+        self._search_timer.start()
+
+    def _on_search_settled(self):
+        if self._pending_search != self.current_search:
+            self.show_page(1, self._pending_search)
+
+    def _cached(self, key: PageKey):
+        entry = self._cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] < time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return entry[1], entry[2]
+
+    def _start_fetch(self, key: PageKey, generation: int) -> None:
+        self._in_flight[key] = generation
+        print(f"[DEBUG] Fetching browse page {key[1]} (search='{key[0]}', generation {generation}).")
+        threading.Thread(target=self._fetch_worker, args=(generation, key), daemon=True, name="BrowseFetch").start()
+
+    def _fetch_worker(self, generation, key):
+        try:
+            mods, metadata = fetch_page(*key)
+            self._fetched.emit(generation, key, mods, metadata, "")
+        except Exception as e:
+            error_message = f"Failed to fetch mods: {e}"
+            print(error_message)
+            self._fetched.emit(generation, key, None, None, error_message)
+
+    def _prefetch_next(self, key: PageKey, metadata) -> None:
+        if (metadata or {}).get('_bIsComplete', True):
+            return
+        next_key = (key[0], key[1] + 1)
+        if next_key not in self._in_flight and self._cached(next_key) is None:
+            self._start_fetch(next_key, 0)
+
+    def _on_fetched(self, generation, key, mods, metadata, error):
+        wanted_by = self._in_flight.pop(key, generation)
+        if not error:
+            self._cache[key] = (time.monotonic() + PAGE_TTL, mods, metadata)
+            self._cache.move_to_end(key)
+            while len(self._cache) > MAX_CACHED_PAGES:
+                self._cache.popitem(last=False)
+
+        if wanted_by != self._generation or key != self._current:
+            if wanted_by:
+                print(f"[DEBUG] Discarded stale browse page {key[1]} (search='{key[0]}', generation {wanted_by}).")
+            return
+        if error:
+            self.page_failed.emit(key[1], key[0], error)
+            return
+        self.page_ready.emit(key[1], key[0], mods, metadata)
+        self._prefetch_next(key, metadata)
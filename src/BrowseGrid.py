@@ -0,0 +1,401 @@
+"""
+Browse Mods grid.
+
+The grid is a QListView in icon mode over BrowseModsModel. ModCardDelegate
+paints every card (thumbnail, name, author, stats and a Download button) with
+the same fonts and style options, so there are no per-card widgets: a page of
+results costs one dict per mod, resizing is a relayout of fixed-size cells,
+and only cards that are actually painted ask for their thumbnail.
+
+Thumbnails come from ThumbnailService. The view reports which rows are on
+screen; those are fetched first, the next screenful is prefetched at a lower
+priority, and fetches for rows scrolled far out of view are cancelled.
+Visible and hovered cards also have their full item details prefetched by
+DetailsPrefetcher, which is where cards without preview media get theirs.
+"""
+
+from PySide6.QtCore import (
+    QAbstractListModel, QEvent, QModelIndex, QRect, QSize, Qt, QTimer, Signal
+)
+from PySide6.QtGui import QColor, QFont, QFontMetrics, QPixmap
+from PySide6.QtWidgets import (
+    QApplication, QListView, QStyle, QStyledItemDelegate, QStyleOptionButton
+)
+
+import DetailsPrefetcher
+from DetailsPrefetcher import details_prefetcher, item_key
+from ThumbnailService import thumbnail_service, PRIORITY_PREFETCH, PRIORITY_VISIBLE
+
+CARD_WIDTH = 220
+CARD_HEIGHT = 280
+CARD_SPACING = 10
+THUMB_WIDTH = 210
+THUMB_HEIGHT = 118  # 16:9 aspect ratio
+THUMB_SIZE = QSize(THUMB_WIDTH, THUMB_HEIGHT)
+PADDING = 5
+BUTTON_HEIGHT = 28
+
+MOD_DATA_ROLE = Qt.UserRole
+THUMBNAIL_ROLE = Qt.UserRole + 1
+
+
+def thumbnail_url(mod_data):
+    """URL of the 220px wide preview image of a mod, or None."""
+    images = mod_data.get('_aPreviewMedia', {}).get('_aImages', [])
+    if not images:
+        return None
+    return f"{images[0].get('_sBaseUrl')}/{images[0].get('_sFile220')}"
+
+
+class BrowseModsModel(QAbstractListModel):
+    """The mods of the current Browse page, plus their thumbnails once loaded."""
+
+    # Thumbnail states besides a QPixmap
+    LOADING = "Loading..."
+    NO_IMAGE = "No Image"
+    FAILED = "Load Failed"
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._mods = []
+        self._thumbnails = {}  # row -> QPixmap or one of the states above
+        self._thumb_rows = {}  # ThumbnailService key -> rows waiting for it
+        self._detail_rows = {}  # item key -> rows waiting for full details (no preview media yet)
+        thumbnail_service.loaded.connect(self._on_thumbnail_loaded)
+        thumbnail_service.failed.connect(self._on_thumbnail_failed)
+        details_prefetcher.loaded.connect(self._on_details_loaded)
+        details_prefetcher.failed.connect(self._on_details_failed)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._mods)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        mod_data = self._mods[index.row()]
+        if role == Qt.DisplayRole:
+            return mod_data.get('_sName', 'N/A')
+        if role == MOD_DATA_ROLE:
+            return mod_data
+        if role == THUMBNAIL_ROLE:
+            return self._thumbnails.get(index.row())
+        return None
+
+    def mods(self):
+        return list(self._mods)
+
+    def set_mods(self, mods):
+        """Replaces the page; thumbnails of the old page that are still loading are ignored."""
+        self.beginResetModel()
+        self._mods = list(mods)
+        self._thumbnails = {}
+        self._thumb_rows = {}
+        self._detail_rows = {}
+        thumbnail_service.cancel_all(self)
+        details_prefetcher.cancel_pending()
+        self.endResetModel()
+
+    def request_thumbnail(self, row, priority=PRIORITY_VISIBLE):
+        """Starts loading the thumbnail of `row` unless it is loaded or loading already."""
+        if not 0 <= row < len(self._mods):
+            return
+        mod_data = self._mods[row]
+        url = thumbnail_url(mod_data)
+        if row in self._thumbnails:
+            if url and priority > PRIORITY_PREFETCH and self._thumbnails[row] is self.LOADING:
+                # A prefetched row came into view: move its fetch forward.
+                thumbnail_service.request(url, THUMB_SIZE, self, priority)
+            return
+        if url is None:
+            # If image data is missing, it's likely from a minimal API response.
+            # Fetch the full details for this mod in the background.
+            key = item_key(mod_data)
+            if '_aPreviewMedia' not in mod_data and key is not None:
+                full_mod_data = details_prefetcher.get(mod_data)
+                if full_mod_data is not None:
+                    self._use_full_details(row, full_mod_data)
+                    self.request_thumbnail(row, priority)
+                    return
+                print(f"[DEBUG] Missing preview media for '{mod_data.get('_sName')}'. Fetching full details.")
+                self._thumbnails[row] = self.LOADING
+                self._detail_rows.setdefault(key, set()).add(row)
+                details_prefetcher.prefetch(mod_data, DetailsPrefetcher.PRIORITY_VISIBLE)
+            else:
+                self._set_thumbnail(row, self.NO_IMAGE)
+            return
+        key, image = thumbnail_service.request(url, THUMB_SIZE, self, priority)
+        if image is not None:
+            self._thumbnails[row] = QPixmap.fromImage(image)
+        else:
+            self._thumbnails[row] = self.LOADING
+            self._thumb_rows.setdefault(key, set()).add(row)
+
+    def set_visible_rows(self, first, last):
+        """
+        Fetches the thumbnails of rows first..last, prefetches the next
+        screenful and cancels fetches for rows further away.
+        """
+        if not self._mods or last < first:
+            return
+        page = last - first + 1
+        keep_from, keep_to = max(0, first - page), min(len(self._mods) - 1, last + 2 * page)
+        for row in range(first, last + 1):
+            self.request_thumbnail(row, PRIORITY_VISIBLE)
+            # Download needs the full item; fetch it while the card is on screen.
+            details_prefetcher.prefetch(self._mods[row], DetailsPrefetcher.PRIORITY_VISIBLE)
+        for row in range(last + 1, min(len(self._mods), last + 1 + page)):
+            self.request_thumbnail(row, PRIORITY_PREFETCH)
+        for key, rows in list(self._thumb_rows.items()):
+            far = {r for r in rows if not keep_from <= r <= keep_to}
+            if not far:
+                continue
+            for row in far:
+                del self._thumbnails[row]
+            rows -= far
+            if not rows:
+                del self._thumb_rows[key]
+                thumbnail_service.cancel(key, self)
+
+    def prefetch_details(self, row):
+        """A card is hovered: its Download click is likely, so its details go first."""
+        if 0 <= row < len(self._mods):
+            details_prefetcher.prefetch(self._mods[row], DetailsPrefetcher.PRIORITY_HOVER)
+
+    def _set_thumbnail(self, row, thumbnail):
+        self._thumbnails[row] = thumbnail
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [THUMBNAIL_ROLE])
+
+    def _use_full_details(self, row, full_mod_data):
+        full_mod_data = dict(full_mod_data)  # The prefetcher's copy stays as fetched.
+        full_mod_data.setdefault('_aPreviewMedia', {})  # Don't ask again.
+        self._mods[row] = full_mod_data
+        self._thumbnails.pop(row, None)
+        index = self.index(row)
+        self.dataChanged.emit(index, index)
+
+    def _on_details_loaded(self, key, full_mod_data):
+        for row in self._detail_rows.pop(key, ()):
+            self._use_full_details(row, full_mod_data)
+
+    def _on_details_failed(self, key, message):
+        for row in self._detail_rows.pop(key, ()):
+            self._set_thumbnail(row, self.FAILED)
+
+    def _on_thumbnail_loaded(self, key, image):
+        rows = self._thumb_rows.pop(key, ())
+        if rows:
+            # The service already decoded and scaled it; this is only an upload.
+            pixmap = QPixmap.fromImage(image)
+            for row in rows:
+                self._set_thumbnail(row, pixmap)
+
+    def _on_thumbnail_failed(self, key, message):
+        for row in self._thumb_rows.pop(key, ()):
+            self._set_thumbnail(row, self.FAILED)
+
+
+class ModCardDelegate(QStyledItemDelegate):
+    """Paints Browse cards and turns clicks on their Download button into `downloadRequested`."""
+    downloadRequested = Signal(dict)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.name_font = QFont("Segoe UI", 10, QFont.Bold)
+        self._name_metrics = QFontMetrics(self.name_font)
+        self._hovered_button = None  # row whose Download button is under the mouse
+        self._pressed_button = None
+
+    def sizeHint(self, option, index):
+        return QSize(CARD_WIDTH, CARD_HEIGHT)
+
+    @staticmethod
+    def _button_rect(card_rect):
+        return QRect(card_rect.left() + PADDING, card_rect.bottom() - PADDING - BUTTON_HEIGHT + 1,
+                     card_rect.width() - 2 * PADDING, BUTTON_HEIGHT)
+
+    def button_at(self, card_rect, pos):
+        return self._button_rect(card_rect).contains(pos)
+
+    def set_hovered_button(self, row):
+        changed = row != self._hovered_button
+        self._hovered_button = row
+        return changed
+
+    def paint(self, painter, option, index):
+        mod_data = index.data(MOD_DATA_ROLE)
+        row = index.row()
+        widget = option.widget
+        style = widget.style() if widget else QApplication.style()
+        palette = option.palette
+        card = option.rect.adjusted(0, 0, -1, -1)
+
+        painter.save()
+        painter.setRenderHint(painter.RenderHint.Antialiasing)
+
+        # Card frame
+        painter.setPen(palette.mid().color())
+        painter.setBrush(palette.base() if not option.state & QStyle.State_MouseOver else palette.alternateBase())
+        painter.drawRoundedRect(card, 4, 4)
+
+        # Thumbnail, requested the first time the card is painted (i.e. visible).
+        thumb_rect = QRect(card.left() + PADDING, card.top() + PADDING, THUMB_WIDTH, THUMB_HEIGHT)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor("#2a2a2a"))
+        painter.drawRoundedRect(thumb_rect, 3, 3)
+        thumbnail = index.data(THUMBNAIL_ROLE)
+        if thumbnail is None:
+            index.model().request_thumbnail(row)
+            thumbnail = BrowseModsModel.LOADING
+        if isinstance(thumbnail, QPixmap):
+            target = thumbnail.rect()
+            target.moveCenter(thumb_rect.center())
+            painter.drawPixmap(target, thumbnail)
+        else:
+            painter.setPen(QColor("#bbbbbb"))
+            painter.drawText(thumb_rect, Qt.AlignCenter, thumbnail)
+
+        # Mod name (up to two lines) and author
+        painter.setPen(palette.text().color())
+        text_left = card.left() + PADDING
+        text_width = card.width() - 2 * PADDING
+        y = thumb_rect.bottom() + PADDING + 1
+        name = mod_data.get('_sName', 'N/A')
+        name_rect = QRect(text_left, y, text_width, self._name_metrics.lineSpacing() * 2)
+        painter.setFont(self.name_font)
+        bounding = painter.boundingRect(name_rect, Qt.TextWordWrap, name)
+        if bounding.height() > name_rect.height():
+            name = self._name_metrics.elidedText(name, Qt.ElideRight, text_width * 2 - self._name_metrics.averageCharWidth() * 2)
+        painter.drawText(name_rect, Qt.TextWordWrap | Qt.AlignTop, name)
+        y += min(bounding.height(), name_rect.height()) + PADDING
+
+        painter.setFont(option.font)
+        metrics = option.fontMetrics
+        author = mod_data.get('_aSubmitter', {}).get('_sName', 'N/A')
+        painter.drawText(QRect(text_left, y, text_width, metrics.height()), Qt.AlignLeft,
+                         metrics.elidedText(f"by {author}", Qt.ElideRight, text_width))
+
+        # Stats (Likes/Downloads) above the button
+        button_rect = self._button_rect(card)
+        stats_rect = QRect(text_left, button_rect.top() - PADDING - metrics.height(), text_width, metrics.height())
+        likes = mod_data.get('_nLikeCount', 0)
+        downloads = mod_data.get('_nTotalDownloads', 0)
+        painter.drawText(stats_rect, Qt.AlignLeft, f"👍 {likes}    📥 {downloads}")
+
+        # Download Button
+        button = QStyleOptionButton()
+        button.rect = button_rect
+        button.text = " Download"
+        button.icon = style.standardIcon(QStyle.SP_ArrowDown)
+        button.iconSize = QSize(16, 16)
+        button.palette = palette
+        button.state = QStyle.State_Enabled | QStyle.State_Raised
+        if row == self._hovered_button:
+            button.state |= QStyle.State_MouseOver
+        if row == self._pressed_button:
+            button.state |= QStyle.State_Sunken
+        style.drawControl(QStyle.CE_PushButton, button, painter, widget)
+
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() not in (QEvent.MouseButtonPress, QEvent.MouseButtonRelease) or event.button() != Qt.LeftButton:
+            return False
+        on_button = self.button_at(option.rect, event.position().toPoint())
+        if event.type() == QEvent.MouseButtonPress:
+            self._pressed_button = index.row() if on_button else None
+            return on_button
+        was_pressed = self._pressed_button == index.row()
+        self._pressed_button = None
+        if on_button and was_pressed:
+            # Pass the full mod_data to avoid a second API call
+            self.downloadRequested.emit(index.data(MOD_DATA_ROLE))
+            return True
+        return False
+
+
+class BrowseGridView(QListView):
+    """Icon-mode list of fixed-size cards that reflows on resize without recreating anything."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setViewMode(QListView.IconMode)
+        self.setResizeMode(QListView.Adjust)
+        self.setMovement(QListView.Static)
+        self.setFlow(QListView.LeftToRight)
+        self.setWrapping(True)
+        self.setUniformItemSizes(True)
+        self.setSpacing(CARD_SPACING // 2)
+        self.setSelectionMode(QListView.NoSelection)
+        self.setVerticalScrollMode(QListView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(20)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.NoFocus)
+        self.card_delegate = ModCardDelegate(self)
+        self.setItemDelegate(self.card_delegate)
+        self._hovered_row = None
+
+        # Tell the model which rows are on screen once scrolling or resizing settles.
+        self._visible_timer = QTimer(self)
+        self._visible_timer.setSingleShot(True)
+        self._visible_timer.setInterval(50)
+        self._visible_timer.timeout.connect(self._report_visible_rows)
+        self.verticalScrollBar().valueChanged.connect(self._visible_timer.start)
+
+    def setModel(self, model):
+        super().setModel(model)
+        model.modelReset.connect(self._visible_timer.start)
+        model.rowsInserted.connect(self._visible_timer.start)
+        model.layoutChanged.connect(self._visible_timer.start)
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._visible_timer.start()
+
+    def visible_rows(self):
+        """(first, last) rows intersecting the viewport; last < first if none."""
+        model = self.model()
+        count = model.rowCount() if model else 0
+        height = self.viewport().height()
+        if not count or not self.isVisible():
+            return 0, -1
+        # Rows are laid out left to right, top to bottom, so their rects are
+        # ordered and the visible range can be found by bisection.
+        def first_row(predicate):
+            lo, hi = 0, count
+            while lo < hi:
+                mid = (lo + hi) // 2
+                if predicate(self.visualRect(model.index(mid, 0))):
+                    hi = mid
+                else:
+                    lo = mid + 1
+            return lo
+
+        first = first_row(lambda rect: rect.bottom() >= 0)
+        last = first_row(lambda rect: rect.top() > height) - 1
+        return first, last
+
+    def _report_visible_rows(self):
+        first, last = self.visible_rows()
+        if last >= first:
+            self.model().set_visible_rows(first, last)
+
+    def mouseMoveEvent(self, event):
+        """Highlights the Download button under the mouse and shows a pointing hand over it."""
+        pos = event.position().toPoint()
+        index = self.indexAt(pos)
+        if index.isValid() and index.row() != self._hovered_row:
+            self.model().prefetch_details(index.row())
+        self._hovered_row = index.row() if index.isValid() else None
+        row = index.row() if index.isValid() and self.card_delegate.button_at(self.visualRect(index), pos) else None
+        if self.card_delegate.set_hovered_button(row):
+            self.viewport().update()
+        self.viewport().setCursor(Qt.PointingHandCursor if row is not None else Qt.ArrowCursor)
+        super().mouseMoveEvent(event)
+
+    def leaveEvent(self, event):
+        self._hovered_row = None
+        if self.card_delegate.set_hovered_button(None):
+            self.viewport().update()
+        super().leaveEvent(event)
@@ -2,10 +2,9 @@ import platform
 import os
 import json
 import sys
-import ctypes
 import re
-if platform.system() == "Windows": import winreg
 from PySide6.QtWidgets import QApplication, QFileDialog, QMessageBox
+from Profiler import profiled
  
 def is_packaged():
     """Checks if the application is running as a packaged executable."""
@@ -49,11 +48,13 @@ def default_mods_folder():
         sys.exit("No mods folder selected. Exiting.")
     return folder
 
+@profiled("default_game_folder")
 def default_game_folder():
     """Tries to auto-detect the game folder, and prompts the user if it fails."""
     default_root = ""
     detected = False
     if platform.system() == "Windows":
+        import winreg  # Only needed on first launch, when there is no config yet
         try:
             with winreg.OpenKey(winreg.HKEY_CURRENT_USER, r"Software\\Valve\\Steam") as key:
                 steam_path = winreg.QueryValueEx(key, "SteamPath")[0]
@@ -91,6 +92,7 @@ def show_console():
     if platform.system() != "Windows":
         print("Console toggling is only supported on Windows.")
         return
+    import ctypes  # Local import, only needed when the console is toggled
     global _console_streams
     try:
         if ctypes.windll.kernel32.AllocConsole():
@@ -110,6 +112,7 @@ def hide_console():
     if platform.system() != "Windows":
         # Nothing to do on non-Windows platforms
         return
+    import ctypes  # Local import, only needed when the console is toggled
     global _console_streams
     try:
         sys.stdout = _original_stdout
@@ -164,6 +167,7 @@ def _find_game_in_steam_libraries(steam_path, app_id="2486820"):
     print("Game not found in any Steam library.")
     return "" # Return empty if not found
 
+@profiled("load_config")
 def load_config():
     """Loads the configuration from disk, creating a default one only if it doesn't exist."""
     if os.path.exists(CONFIG_FILE):
@@ -231,6 +235,7 @@ def register_url_protocol():
         print("URL protocol registration is only supported on Windows.")
         return
 
+    import winreg
     try:
         # The command to execute. It differs between dev and packaged app.
         if is_packaged(): # Packaged app
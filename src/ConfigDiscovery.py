@@ -0,0 +1,111 @@
+"""
+Cached discovery of file-based mod configuration.
+
+Discovering a mod's configuration lists its category folders and parses the
+desc.ini of every option. The result is cached per mod (in memory and in the
+catalog, so it survives restarts) together with the size and mtime of
+everything discovery looked at: the mod folder, the category and option
+folders and the desc.ini files. Adding or removing a category or option
+changes a folder mtime and editing a desc.ini changes its own, so re-checking
+a cached result takes only a few stats and no directory listings or INI
+parsing.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import ModCatalog
+from MetadataCache import thaw, freeze
+
+DESC_INI = "desc.ini"
+# Results involving something modified this recently are not cached: a second
+# change within the same mtime tick would go unnoticed.
+_RACY_WINDOW_NS = 2_000_000_000
+
+_cache: Dict[str, Tuple[List[tuple], Optional[Dict]]] = {}
+_lock = threading.Lock()
+
+
+def _key(mod_path: str) -> str:
+    return os.path.normcase(os.path.abspath(mod_path))
+
+
+def _stat(mod_path: str, rel: str) -> tuple:
+    st = os.stat(os.path.join(mod_path, rel) if rel else mod_path)
+    # Folder sizes are meaningless (and vary by platform); only files record one.
+    return (rel, st.st_size if rel.endswith(DESC_INI) else 0, st.st_mtime_ns)
+
+
+def _scan(mod_path: str) -> Tuple[List[tuple], Optional[Dict]]:
+    """Full discovery: returns (stats of everything looked at, configuration or None)."""
+    from ModConfigDialog import read_desc_ini  # Local import
+    stats = [_stat(mod_path, "")]
+    discovered_config = {}
+    with os.scandir(mod_path) as categories:
+        for category in sorted(categories, key=lambda e: e.name):
+            if not category.is_dir():
+                continue
+            stats.append(_stat(mod_path, category.name))
+            options = {}
+            with os.scandir(category.path) as option_entries:
+                for option in sorted(option_entries, key=lambda e: e.name):
+                    if not option.is_dir():
+                        continue
+                    rel = os.path.join(category.name, option.name)
+                    stats.append(_stat(mod_path, rel))
+                    desc_ini_path = os.path.join(option.path, DESC_INI)
+                    if os.path.exists(desc_ini_path):
+                        stats.append(_stat(mod_path, os.path.join(rel, DESC_INI)))
+                        ini_data = read_desc_ini(desc_ini_path)
+                        if ini_data:
+                            options[option.name] = ini_data
+            # A valid category must have at least two configurable options
+            if len(options) >= 2:
+                discovered_config[category.name] = options
+    return stats, (discovered_config or None)
+
+
+def _unchanged(mod_path: str, stats: List[tuple]) -> bool:
+    try:
+        return all(_stat(mod_path, entry[0]) == tuple(entry) for entry in stats)
+    except OSError:
+        return False
+
+
+def discover(mod_path: str) -> Optional[Dict]:
+    """
+    The mod's file-based configuration (see Util.discover_mod_configuration),
+    or None. Returns a copy the caller may modify.
+    """
+    if not os.path.isdir(mod_path):
+        return None
+    key = _key(mod_path)
+    with _lock:
+        cached = _cache.get(key)
+    if cached is None:
+        stored = ModCatalog.catalog.stored_configuration(mod_path)
+        if stored is not None:
+            cached = (stored[0], freeze(stored[1]) if stored[1] is not None else None)
+    if cached is not None and _unchanged(mod_path, cached[0]):
+        with _lock:
+            _cache[key] = cached
+        return thaw(cached[1]) if cached[1] is not None else None
+
+    try:
+        stats, config = _scan(mod_path)
+    except OSError as e:
+        print(f"Could not discover configuration of {os.path.basename(mod_path)}: {e}")
+        return None
+    now_ns = time.time_ns()
+    if all(now_ns - mtime_ns > _RACY_WINDOW_NS for _, _, mtime_ns in stats):
+        frozen = freeze(config) if config is not None else None
+        with _lock:
+            _cache[key] = (stats, frozen)
+        ModCatalog.catalog.store_configuration(mod_path, stats, config)
+    return config
+
+
+def has_configuration(mod_path: str) -> bool:
+    return discover(mod_path) is not None
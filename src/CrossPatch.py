@@ -2,21 +2,19 @@ import os
 import ctypes
 import threading
 import platform
-import requests
 import subprocess
 import sys
-import json
 import shutil
 
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QTabWidget,
-    QTreeWidget, QTreeWidgetItem, QHeaderView, QPushButton, QLineEdit, QLabel, QStyle,
-    QFrame, QComboBox, QCheckBox, QMenu, QSplitter, QSpacerItem, QSizePolicy, QScrollArea,
-    QDialog, QTableWidget, QTableWidgetItem, QGridLayout,
+    QTreeView, QAbstractItemView, QHeaderView, QPushButton, QLineEdit, QLabel, QStyle,
+    QFrame, QComboBox, QCheckBox, QMenu, QSplitter, QSpacerItem, QSizePolicy,
+    QTableWidget, QTableWidgetItem,
     QMessageBox, QFileDialog, QInputDialog
 )
-from PySide6.QtGui import QIcon, QAction, QFont, QDrag, QPixmap, QPainter, QColor, QDesktopServices, QImage, QDropEvent, QShortcut, QKeySequence, QMouseEvent
-from PySide6.QtCore import Qt, QMimeData, QPoint, Signal, QObject, QUrl, QSize, QThread, QTimer, QRunnable, QThreadPool, QEvent
+from PySide6.QtGui import QIcon, QAction, QDrag, QPainter, QDesktopServices, QDropEvent, QShortcut, QKeySequence, QMouseEvent
+from PySide6.QtCore import Qt, QMimeData, QPoint, Signal, QUrl, QSize, QThread, QTimer, QEvent
 
 from Credits import CreditsWindow
 from ModUpdatePrompt import ModUpdatePromptWindow
@@ -31,210 +29,58 @@ import Config
 import Util
 from Constants import APP_TITLE, APP_VERSION
 import PakInspector
-
-class WorkerSignals(QObject):
-    """Defines signals available from a running worker thread."""
-    finished = Signal()
-    error = Signal(tuple)
-    result = Signal(object)
-
-# --- Worker for background image loading ---
-class ImageLoader(QRunnable):
-    """Worker thread for loading an image from a URL."""
-
-    def __init__(self, url):
-        super().__init__()
-        self.url = url
-        self.signals = WorkerSignals()
-
-    def run(self):
-        """Downloads an image and emits it as a QPixmap."""
-        try:
-            response = requests.get(self.url, headers={'User-Agent': Util.BROWSER_USER_AGENT}, timeout=10)
-            response.raise_for_status()
-            image = QImage()
-            image.loadFromData(response.content)
-            self.signals.result.emit(image)
-        except Exception as e:
-            self.signals.error.emit((e, f"Failed to load image from {self.url}: {e}"))
-        finally:
-            self.signals.finished.emit()
-
-# --- Worker for fetching full mod details ---
-class ModDetailsLoader(QRunnable):
-    """Worker thread for fetching the full data for a single mod."""
-
-    def __init__(self, mod_data):
-        super().__init__()
-        self.mod_data = mod_data
-        self.signals = WorkerSignals()
-
-    def run(self):
-        """Fetches full mod data and emits it."""
-        try:
-            url = f"https://gamebanana.com/{self.mod_data.get('_sProfileUrl')}"
-            full_mod_data = Util.get_gb_item_data_from_url(url)
-            self.signals.result.emit(full_mod_data)
-        except Exception as e:
-            self.signals.error.emit((e, f"Failed to load details for {self.mod_data.get('_sName')}: {e}"))
-        finally:
-            self.signals.finished.emit()
-
-# --- Custom Mod Card Widget ---
-class ModCard(QFrame):
-    def __init__(self, mod_data, download_callback, parent=None):
-        super().__init__(parent)
-        self.mod_data = mod_data
-        self.download_callback = download_callback
-        self.worker = None # To hold a reference to the running worker
-
-        self.setFrameShape(QFrame.StyledPanel)
-        self.setFixedWidth(220)
-        self.setFixedHeight(280)
-
-        layout = QVBoxLayout(self)
-        layout.setContentsMargins(5, 5, 5, 5)
-        layout.setSpacing(5)
-
-        # Image Label
-        self.image_label = QLabel("Loading...")
-        self.image_label.setAlignment(Qt.AlignCenter)
-        self.image_label.setFixedSize(210, 118) # 16:9 aspect ratio
-        self.image_label.setStyleSheet("background-color: #2a2a2a; border-radius: 3px;")
-        layout.addWidget(self.image_label)
-
-        # Mod Name
-        name = self.mod_data.get('_sName', 'N/A')
-        name_label = QLabel(name)
-        name_label.setFont(QFont("Segoe UI", 10, QFont.Bold))
-        name_label.setWordWrap(True)
-        layout.addWidget(name_label)
-
-        # Author
-        author = self.mod_data.get('_aSubmitter', {}).get('_sName', 'N/A')
-        author_label = QLabel(f"by {author}")
-        layout.addWidget(author_label)
-
-        layout.addStretch()
-
-        # Stats (Likes/Downloads)
-        stats_layout = QHBoxLayout()
-        likes = self.mod_data.get('_nLikeCount', 0)
-        downloads = self.mod_data.get('_nTotalDownloads', 0)
-        stats_layout.addWidget(QLabel(f"👍 {likes}"))
-        stats_layout.addWidget(QLabel(f"📥 {downloads}"))
-        stats_layout.addStretch()
-        layout.addLayout(stats_layout)
-
-        # Download Button
-        download_btn = QPushButton(self.style().standardIcon(QStyle.SP_ArrowDown), " Download")
-        download_btn.clicked.connect(self.on_download_clicked)
-        layout.addWidget(download_btn)
-
-        self._load_image()
-
-    def _update_with_full_data(self, full_mod_data):
-        """Updates the card's internal data and then loads the image."""
-        self.mod_data = full_mod_data
-        self._load_image() # Now try loading the image again with the full data
-
-    def _load_image(self):
-        preview_media = self.mod_data.get('_aPreviewMedia', {})
-        images = preview_media.get('_aImages', [])
-        
-        if not images:
-            # If image data is missing, it's likely from a minimal API response.
-            # Fetch the full details for this mod in the background.
-            if '_aPreviewMedia' not in self.mod_data:
-                print(f"[DEBUG] Missing preview media for '{self.mod_data.get('_sName')}'. Fetching full details.")
-                details_worker = ModDetailsLoader(self.mod_data)
-                details_worker.signals.result.connect(self._update_with_full_data)
-                QThreadPool.globalInstance().start(details_worker)
-                return # Stop here; the callback will re-trigger image loading.
-            self.image_label.setText("No Image")
-            return
-
-        # Use the 220px wide thumbnail from the API
-        image_url = f"{images[0].get('_sBaseUrl')}/{images[0].get('_sFile220')}"
-
-        self.worker = ImageLoader(image_url)
-        self.worker.signals.result.connect(self.on_image_loaded)
-        self.worker.signals.error.connect(self.on_image_load_failed)
-        # Use the global thread pool for efficiency
-        QThreadPool.globalInstance().start(self.worker)
-
-    def on_image_loaded(self, image):
-        if not image.isNull():
-            # Convert the thread-safe QImage to a QPixmap in the main thread
-            pixmap = QPixmap.fromImage(image)
-            self.image_label.setPixmap(pixmap.scaled(
-                self.image_label.size(),
-                Qt.KeepAspectRatio,
-                Qt.SmoothTransformation
-            ))
-        else:
-            self.image_label.setText("Load Failed")
-
-    def on_image_load_failed(self, error_info):
-        e, msg = error_info
-        print(msg)
-        self.image_label.setText("Load Failed")
-
-    def on_download_clicked(self):
-        # Pass the full mod_data to avoid a second API call
-        self.download_callback(item_data=self.mod_data)
-
-    def stop(self):
-        """Safely stops any running background tasks."""
-        # Disconnect signals to prevent the worker from calling slots on this widget
-        # after it has been scheduled for deletion.
-        if self.worker:
-            try:
-                self.worker.signals.result.disconnect(self.on_image_loaded)
-                self.worker.signals.error.disconnect(self.on_image_load_failed)
-            except (RuntimeError, TypeError):
-                # This can happen if the signal is already disconnected or the worker finished.
-                pass
-
-class ModTreeWidget(QTreeWidget):
-    """A custom QTreeWidget that forces all drops to be insertions, not parenting."""
+import ModCatalog
+import LibraryScanner
+from IdleParseScheduler import IdleParseScheduler
+from ModFolderWatcher import ModFolderWatcher
+from ModInfoWriter import mod_info_writer
+from RefreshScheduler import RefreshScheduler, RefreshStep
+from PakContentsDialog import PakContentsDialog
+from BrowseGrid import BrowseModsModel, BrowseGridView
+from DetailsPrefetcher import details_prefetcher
+from BrowseController import BrowseController
+from ModListModel import ModListModel, ModFilterProxyModel, ModRow, COL_UPDATE, COL_CONFIG
+from Profiler import profiled, traced, annotate
+import ManifestCache
+import ModFingerprint
+
+class ModTreeView(QTreeView):
+    """A QTreeView over the mod list model that forces all drops to be insertions, not parenting."""
     # Custom signal to be emitted after a successful drag-and-drop reorder.
     orderChanged = Signal()
 
+    def _source_row(self, index):
+        """Maps a view (proxy) index to its row in ModListModel, or None."""
+        if not index.isValid():
+            return None
+        return self.model().mapToSource(index).row()
+
     def dropEvent(self, event: QDropEvent):
-        if not self.selectedItems():
+        current = self.currentIndex()
+        dragged_row = self._source_row(current)
+        if dragged_row is None:
             return
 
-        # Get the item being dragged
-        dragged_item = self.selectedItems()[0]
-        # Get the item at the drop position
-        target_item = self.itemAt(event.position().toPoint())
-
-        if target_item:
-            # Calculate the index to insert at (above the target)
-            drop_index = self.indexOfTopLevelItem(target_item)
-            # Take the dragged item out of the tree
-            taken_item = self.takeTopLevelItem(self.indexOfTopLevelItem(dragged_item))
-            # Insert it at the new position
-            self.insertTopLevelItem(drop_index, taken_item)
-            # Ensure the newly moved item is selected
-            self.setCurrentItem(taken_item)
-            # Emit our custom signal now that the order has changed.
-            self.orderChanged.emit()
+        # Get the row at the drop position
+        target_row = self._source_row(self.indexAt(event.position().toPoint()))
+        event.accept()
+
+        if target_row is not None:
+            source_model = self.model().sourceModel()
+            # Insert above the target
+            if source_model.move_row(dragged_row, target_row):
+                # Ensure the moved mod stays selected
+                moved_row = target_row if target_row < dragged_row else target_row - 1
+                self.setCurrentIndex(self.model().mapFromSource(source_model.index(moved_row, current.column())))
+                # Emit our custom signal now that the order has changed.
+                self.orderChanged.emit()
 
     def mouseMoveEvent(self, event: QMouseEvent):
         """Change cursor to pointing hand when hovering over clickable icons."""
-        item = self.itemAt(event.position().toPoint())
-        if item:
-            column = self.columnAt(event.position().toPoint().x())
-            # Check for update icon (col 0) or config icon (col 6)
-            is_clickable_update = (column == 0 and item.text(0))
-            is_clickable_config = (column == 6 and item.text(6))
-
-            if is_clickable_update or is_clickable_config:
-                self.viewport().setCursor(Qt.PointingHandCursor)
-            else:
-                self.viewport().setCursor(Qt.ArrowCursor)
+        index = self.indexAt(event.position().toPoint())
+        # Check for update icon (col 0) or config icon (col 6)
+        if index.column() in (COL_UPDATE, COL_CONFIG) and index.data():
+            self.viewport().setCursor(Qt.PointingHandCursor)
         else:
             self.viewport().setCursor(Qt.ArrowCursor)
         super().mouseMoveEvent(event)
@@ -249,7 +95,9 @@ class CrossPatchWindow(QMainWindow):
     mod_processing_finished = Signal(list, dict, bool, bool) # (new_priority_list, conflicts, launch_success, is_launch_operation)
     # Signal for app update check
     update_check_finished = Signal(str, dict)
+    legacy_pak_data_migrated = Signal(int)  # number of mods migrated
 
+    @profiled("create_main_window")
     def __init__(self, instance_socket=None):
         super().__init__()
         self.instance_socket = instance_socket
@@ -258,8 +106,9 @@ class CrossPatchWindow(QMainWindow):
         self.cfg = Config.config
         self.profile_manager = ProfileManager(self.cfg)
         self.updatable_mods = {}
+        self.library_snapshot = None  # Latest LibraryScanner result, shared by refresh/tree/update check
+        self._library_changed = False
         self.active_download_manager = None # To hold a reference
-        self._resize_timer = None
         self.assets_path = Util.find_assets_dir()
         self._is_closing = False
 
@@ -294,23 +143,44 @@ class CrossPatchWindow(QMainWindow):
         self._create_mods_tab_ui()
         self._update_treeview()
 
-        # --- Build UI for other tabs and bottom bar ---
+        # --- Other tabs are built the first time they are shown ---
         self.browse_tab_frame = QWidget()
         self.notebook.addTab(self.browse_tab_frame, "Browse Mods")
-        self._create_browse_tab_ui()
-
         self.settings_tab_frame = QWidget()
         self.notebook.addTab(self.settings_tab_frame, "Settings")
-        self._create_settings_tab_ui()
+        self._pending_tabs = {
+            self.browse_tab_frame: self._create_browse_tab_ui,
+            self.settings_tab_frame: self._create_settings_tab_ui,
+        }
+        self.browse_current_page = 1
+        self.browse_mods_data = []
 
         self._create_bottom_bar()
 
+        # --- Background pak analysis while idle ---
+        self.idle_parser = IdleParseScheduler(self.cfg, self)
+        self.idle_parser.progress.connect(self._on_idle_parse_progress)
+        self.idle_parser.finished.connect(self._on_idle_parse_finished)
+
+        # --- Refreshes requested in bursts run once ---
+        self.refresh_scheduler = RefreshScheduler(self._run_refresh, self)
+        self.refresh_scheduler.started.connect(self._on_refresh_started)
+        self.refresh_scheduler.finished.connect(self._on_refresh_finished)
+
+        # --- Pick up mods added, removed or edited outside CrossPatch ---
+        self.mod_watcher = ModFolderWatcher(self)
+        self.mod_watcher.mods_changed.connect(self._on_mods_folder_changed)
+        self.mod_watcher.set_folder(self.cfg["mods_folder"], self._current_library_snapshot().folders)
+
         # --- Hotkeys ---
         search_shortcut = QShortcut(QKeySequence("Ctrl+F"), self)
         search_shortcut.activated.connect(self.on_search_hotkey)
 
         # --- Final Setup and Background Tasks ---
+        self.notebook.currentChanged.connect(self._ensure_tab_built)
         self.notebook.currentChanged.connect(self.on_tab_change)
+        # Fetch initial data when the Browse tab is first shown
+        self.notebook.currentChanged.connect(self._on_browse_tab_selected)
         self.protocol_url_received.connect(self.handle_protocol_url)
         self.mod_update_check_finished.connect(self.on_mod_update_check_finished)
         self.mod_processing_finished.connect(self._on_mod_processing_finished)
@@ -319,8 +189,31 @@ class CrossPatchWindow(QMainWindow):
             threading.Thread(target=self._socket_listener, daemon=True).start()
 
         threading.Thread(target=lambda: self.check_all_mod_updates(), daemon=True).start()
+        if not self.cfg.get("legacy_pak_data_migrated"):
+            # Legacy manifests are imported into the cache before anything is parsed.
+            self.idle_parser.pause("migration")
+            self.legacy_pak_data_migrated.connect(self._on_legacy_pak_data_migrated)
+            threading.Thread(target=self._migrate_legacy_pak_data, daemon=True, name="PakDataMigration").start()
+        self.idle_parser.schedule()
         self.set_dark_title_bar()
 
+    def _migrate_legacy_pak_data(self):
+        """Moves pak manifests out of info.json files written by older versions (worker thread)."""
+        migrated = 0
+        try:
+            migrated = Util.migrate_legacy_pak_data(self.cfg["mods_folder"])
+        finally:
+            self.legacy_pak_data_migrated.emit(migrated)
+
+    def _on_legacy_pak_data_migrated(self, migrated):
+        if migrated:
+            print(f"Migrated legacy pak data for {migrated} mod(s).")
+        # Recorded right away, so the migration runs once per install even if the app doesn't exit cleanly.
+        self.cfg["legacy_pak_data_migrated"] = True
+        Config.save_config(self.cfg)
+        self.idle_parser.resume("migration")
+
+    @profiled("_create_mods_tab_ui")
     def _create_mods_tab_ui(self):
         mods_layout = QVBoxLayout(self.mods_tab_frame)
 
@@ -331,17 +224,28 @@ class CrossPatchWindow(QMainWindow):
         search_layout.addWidget(QLabel("Search:"))
         self.search_entry = QLineEdit()
         self.search_entry.setPlaceholderText("Filter by name, author, etc.")
-        self.search_entry.textChanged.connect(self._update_treeview)
+        # Filter once typing pauses rather than on every keystroke.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._apply_search_filter)
+        self.search_entry.textChanged.connect(self._search_timer.start)
         search_layout.addWidget(self.search_entry)
         mods_layout.addWidget(self.search_frame)
         self.search_frame.hide()
 
         # Mods List (Treeview)
-        self.tree = ModTreeWidget()
-        self.tree.setColumnCount(7)
-        self.tree.setHeaderLabels(["", "", "Mod Name", "Version", "Author", "Type", "Config"])
-        self.tree.setSelectionMode(QTreeWidget.SingleSelection)
-        self.tree.setDragDropMode(QTreeWidget.InternalMove)
+        self.mod_model = ModListModel(self)
+        self.mod_model.enabledChanged.connect(self.on_mod_enabled_changed)
+        self.mod_proxy = ModFilterProxyModel(self)
+        self.mod_proxy.setSourceModel(self.mod_model)
+        self.tree = ModTreeView()
+        self.tree.setModel(self.mod_proxy)
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tree.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.tree.setDragDropMode(QAbstractItemView.InternalMove)
         self.tree.setDragEnabled(True)
         self.tree.setDropIndicatorShown(True)
         self.tree.setAllColumnsShowFocus(True)
@@ -362,12 +266,18 @@ class CrossPatchWindow(QMainWindow):
         self.tree.viewport().setMouseTracking(True) # For hover cursor changes
         self.tree.setContextMenuPolicy(Qt.CustomContextMenu)
         self.tree.customContextMenuRequested.connect(self.on_right_click)
-        self.tree.itemClicked.connect(self.on_item_clicked)
-        self.tree.itemChanged.connect(self.on_item_changed)
+        self.tree.clicked.connect(self.on_item_clicked)
         self.tree.mousePressEvent = self._tree_mouse_press_event
 
         mods_layout.addWidget(self.tree)
 
+    def _ensure_tab_built(self, index):
+        """Builds a secondary tab's contents the first time it is shown."""
+        builder = self._pending_tabs.pop(self.notebook.widget(index), None)
+        if builder is not None:
+            print(f"[DEBUG] Building '{self.notebook.tabText(index)}' tab on first use.")
+            builder()
+
     def _create_browse_tab_ui(self):
         browse_layout = QVBoxLayout(self.browse_tab_frame)
 
@@ -381,6 +291,8 @@ class CrossPatchWindow(QMainWindow):
         self.browse_search_entry = QLineEdit()
         self.browse_search_entry.setPlaceholderText("Search GameBanana...")
         self.browse_search_entry.returnPressed.connect(lambda: self.fetch_browse_mods(page=1))
+        # Search as you type, once typing pauses.
+        self.browse_search_entry.textChanged.connect(lambda text: self.browse_controller.search_changed(text))
         filter_bar.addWidget(self.browse_search_entry)
 
         self.browse_clear_search_btn = QPushButton("Clear")
@@ -391,18 +303,18 @@ class CrossPatchWindow(QMainWindow):
 
         browse_layout.addLayout(filter_bar)
 
-        # --- Mod Browser Card Layout ---
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-        
-        self.card_container = QWidget()
-        self.card_layout = QGridLayout(self.card_container)
-        self.card_layout.setSpacing(10)
-        self.card_layout.setAlignment(Qt.AlignTop | Qt.AlignLeft)
+        # --- Mod Browser Card Grid ---
+        # Status text ("Loading...", errors) is shown in place of the grid.
+        self.browse_status_label = QLabel()
+        self.browse_status_label.setAlignment(Qt.AlignCenter)
+        self.browse_status_label.hide()
+        browse_layout.addWidget(self.browse_status_label, 1)
 
-        self.scroll_area.setWidget(self.card_container)
-        browse_layout.addWidget(self.scroll_area)
+        self.browse_model = BrowseModsModel(self)
+        self.browse_grid = BrowseGridView()
+        self.browse_grid.setModel(self.browse_model)
+        self.browse_grid.card_delegate.downloadRequested.connect(lambda mod_data: self.add_mod_from_url(item_data=mod_data))
+        browse_layout.addWidget(self.browse_grid, 1)
 
         # --- Pagination and Download ---
         page_bar = QHBoxLayout()
@@ -424,11 +336,10 @@ class CrossPatchWindow(QMainWindow):
         browse_layout.addLayout(page_bar)
 
         # --- Data for browsing ---
-        self.browse_current_page = 1
-        self.browse_mods_data = []
-        # Fetch initial data when the tab is first shown
-        self.notebook.currentChanged.connect(self._on_browse_tab_selected)
-
+        self.browse_controller = BrowseController(self)
+        self.browse_controller.loading.connect(self._on_browse_page_loading)
+        self.browse_controller.page_ready.connect(self._on_browse_page_ready)
+        self.browse_controller.page_failed.connect(self._on_browse_page_failed)
 
     def _create_settings_tab_ui(self):
         settings_layout = QVBoxLayout(self.settings_tab_frame)
@@ -509,8 +420,18 @@ class CrossPatchWindow(QMainWindow):
         ignored_btn.clicked.connect(self.open_ignored_conflicts)
         other_layout.addWidget(ignored_btn)
 
+        stalls_btn = QPushButton("UI Stalls...")
+        stalls_btn.setToolTip("Times the interface froze this session, and where")
+        stalls_btn.clicked.connect(self.open_stalls_dialog)
+        other_layout.addWidget(stalls_btn)
+
         settings_layout.addWidget(other_frame)
 
+        # --- Recent operation timings ---
+        from PerformancePanel import PerformancePanel  # Local import
+        self.performance_panel = PerformancePanel()
+        settings_layout.addWidget(self.performance_panel)
+
         # --- Action Buttons ---
         action_frame = QFrame()
         action_frame.setFrameShape(QFrame.StyledPanel)
@@ -532,6 +453,10 @@ class CrossPatchWindow(QMainWindow):
             QMessageBox.warning(self, "Error", f"Could not open ignored conflicts dialog: {e}")
         
 
+    def open_stalls_dialog(self):
+        from StallsDialog import StallsDialog  # Local import
+        StallsDialog(self).exec()
+
     def _create_bottom_bar(self):
         # --- Main Action Buttons (Refresh, Save, Add) ---
         self.bottom_button_frame = QWidget()
@@ -585,28 +510,25 @@ class CrossPatchWindow(QMainWindow):
         
         status_bar.addWidget(status_widget, 1)
 
-    def event(self, event):
-        """Handles custom events posted to the main window."""
-        if event.type() == Util.ModListFetchEvent.EVENT_TYPE:
-            self._update_browse_cards(event.mods_data)
-            return True
-        return super().event(event)
-
-    def resizeEvent(self, event):
-        """Handle window resize to reflow mod cards with a debounce timer."""
-        super().resizeEvent(event)
-        if self._resize_timer:
-            self._resize_timer.stop()
-        
-        self._resize_timer = QTimer()
-        self._resize_timer.setSingleShot(True)
-        self._resize_timer.timeout.connect(self._reflow_browse_cards)
-        self._resize_timer.start(100) # 100ms delay
+        # Shown only while mods are being analyzed in the background
+        self.idle_parse_label = QLabel()
+        self.idle_parse_label.setVisible(False)
+        status_bar.addPermanentWidget(self.idle_parse_label)
+
+    def _on_idle_parse_progress(self, done, total, mod_name):
+        self.idle_parse_label.setText(f"Analyzing pak files {done + 1}/{total}: {mod_name}")
+        self.idle_parse_label.setVisible(True)
+
+    def _on_idle_parse_finished(self, parsed):
+        self.idle_parse_label.setVisible(False)
+
     # --- Event Handlers & Logic (High-Level) ---
 
     def closeEvent(self, event):
         """Saves window size and closes the application."""
         self._is_closing = True
+        self.idle_parser.stop()
+        self.mod_watcher.stop()
         print("Saving configuration before exiting...")
         self.cfg["window_geometry"] = self.saveGeometry().toHex().data().decode()
         self.profile_manager.save()
@@ -642,54 +564,59 @@ class CrossPatchWindow(QMainWindow):
 
     def on_drag_end(self):
         """Finalizes the drag operation, saving the new order."""
-        # The move is already visually done by QTreeWidget. We just need to save it.
-        new_priority = [self.tree.topLevelItem(i).data(0, Qt.UserRole) for i in range(self.tree.topLevelItemCount())]
+        # The move is already done in the model. We just need to save it.
+        # The model holds every mod, including those hidden by the search filter.
+        new_priority = self.mod_model.folders()
         if self.profile_manager.get_active_profile().get("mod_priority") != new_priority:
             self.profile_manager.set_mod_priority(new_priority)
             print("New mod order saved.")
 
-    def on_item_clicked(self, item, column):
-        """Handle clicks on specific columns, like the checkbox."""
-        if not item:
-            return
-
-        mod_folder_name = item.data(0, Qt.UserRole)
-        if not mod_folder_name:
+    def on_item_clicked(self, index):
+        """Handle clicks on specific columns, like the update and config icons."""
+        row = self._mod_row_at(index)
+        if not row:
             return
 
-        if column == 0: # 'Update' column
-            self.on_update_column_click(mod_folder_name)
-        elif column == 6 and item.text(6): # 'Config' column
+        if index.column() == COL_UPDATE: # 'Update' column
+            self.on_update_column_click(row.folder)
+        elif index.column() == COL_CONFIG and row.has_config: # 'Config' column
             self.configure_selected_mod()
 
+    def on_mod_enabled_changed(self, mod_folder_name, is_enabled):
+        """Handles the 'Enabled' checkbox of a mod being toggled."""
+        # We no longer save the state immediately. Instead, we just update the
+        # in-memory profile data. The change will be persisted only when the
+        # user clicks "Save".
+        active_profile = self.profile_manager.get_active_profile()
+        active_profile.setdefault("enabled_mods", {})[mod_folder_name] = is_enabled
 
-    def on_item_changed(self, item, column):
-        """Handles changes to an item, specifically the checkbox state."""
-        if column == 1: # 'Enabled' column
-            # If signals are blocked, it means the change is happening during a tree update,
-            # so we should not trigger another update.
-            if self.tree.signalsBlocked():
-                return
+    def _mod_row_at(self, index):
+        """The ModRow behind a view index, or None."""
+        if not index.isValid():
+            return None
+        return self.mod_model.row(self.mod_proxy.mapToSource(index).row())
 
-            mod_folder_name = item.data(0, Qt.UserRole)
-            is_enabled = item.checkState(1) == Qt.Checked
-            
-            # We no longer save the state immediately. Instead, we just update the
-            # in-memory profile data. The change will be persisted only when the
-            # user clicks "Save".
-            active_profile = self.profile_manager.get_active_profile()
-            active_profile.setdefault("enabled_mods", {})[mod_folder_name] = is_enabled
+    def _selected_mod(self):
+        """The ModRow of the current mod in the list, or None."""
+        return self._mod_row_at(self.tree.currentIndex())
+
+    def _apply_search_filter(self):
+        self.mod_proxy.set_filter_text(self.search_entry.text())
+        current = self.tree.currentIndex()
+        if current.isValid():
+            self.tree.scrollTo(current)
 
     def on_right_click(self, pos):
         """Handles right-clicks on the treeview to show the context menu."""
-        item = self.tree.itemAt(pos)
-        if not item:
+        index = self.tree.indexAt(pos)
+        row = self._mod_row_at(index)
+        if not row:
             return
 
         # Set the item under the cursor as the current item
-        self.tree.setCurrentItem(item)
+        self.tree.setCurrentIndex(index)
 
-        mod_folder_name = item.data(0, Qt.UserRole)
+        mod_folder_name = row.folder
 
         menu = QMenu()
         menu.addAction("Open containing folder", self.open_selected_mod_folder)
@@ -697,7 +624,7 @@ class CrossPatchWindow(QMainWindow):
         menu.addSeparator()
         
         # Add "Configure" option if applicable
-        if item.text(6) == "⚙️":
+        if row.has_config:
             menu.addAction("Configure mod...", self.configure_selected_mod)
 
         # Only show update option if mod has a page URL
@@ -717,91 +644,21 @@ class CrossPatchWindow(QMainWindow):
         mod_path = os.path.join(self.cfg["mods_folder"], mod_folder_name)
         mod_info = Util.read_mod_info(mod_path) or {}
 
-        pak_data = mod_info.get("pak_data")
-        if not pak_data:
+        pak_data = PakInspector.get_cached_manifest(mod_path)
+        if pak_data is None:
             try:
-                pak_data = PakInspector.generate_mod_pak_manifest(mod_path)
-                # persist to info.json if possible
-                try:
-                    info_path = os.path.join(mod_path, "info.json")
-                    if os.path.exists(info_path):
-                        mod_info["pak_data"] = pak_data
-                        with open(info_path, "w", encoding="utf-8") as f:
-                            json.dump(mod_info, f, indent=2)
-                except Exception as e:
-                    print(f"Warning: Could not write pak_data to info.json: {e}")
+                # Parse off the GUI thread behind a cancellable progress dialog.
+                # A successful result is cached by PakInspector.
+                pak_data = Util._parse_pak_with_progress(self, mod_path, mod_info.get('name', mod_folder_name))
             except Exception as e:
                 QMessageBox.warning(self, "Pak Inspector", f"Could not analyze pak files: {e}")
                 return
+            if pak_data is None:
+                QMessageBox.information(self, "Pak Inspector", "The pak analysis was cancelled or timed out, so the contents of this mod are unknown.")
+                return
 
-        dialog = QDialog(self)
-        dialog.setWindowTitle(f"Pak Contents - {mod_info.get('name', mod_folder_name)}")
-        layout = QVBoxLayout(dialog)
-
-        summary = QLabel(f"Files: {pak_data.get('total_files', 0)}  Total size: {pak_data.get('total_size', 0)} bytes")
-        layout.addWidget(summary)
-
-        tree = QTreeWidget()
-        headers = ["Name", "Size", "Compressed", "Offset", "Archive", "Source"]
-        tree.setColumnCount(len(headers))
-        tree.setHeaderLabels(headers)
-        header = tree.header()
-        header.setSectionResizeMode(0, QHeaderView.Interactive)
-        header.setStretchLastSection(False)
-        tree.setSortingEnabled(True)
-
-        # Icons for tree items
-        folder_icon = self.style().standardIcon(QStyle.SP_DirIcon)
-        file_icon = self.style().standardIcon(QStyle.SP_FileIcon)
-
-        # A dictionary to keep track of tree items to avoid creating duplicates
-        # The key will be the full path of the node as a tuple (e.g., ('Content', 'Characters'))
-        # The value will be the QTreeWidgetItem
-        nodes = {}
-        root_item = tree.invisibleRootItem()
-
-        if pak_data.get('files_index'):
-            for e in pak_data['files_index']:
-                path_parts = e.get('path', '').replace('\\', '/').split('/')
-                parent_item = root_item
-
-                # Traverse the path components, creating folder nodes as needed
-                for i in range(len(path_parts)):
-                    current_path_tuple = tuple(path_parts[:i+1])
-                    
-                    if current_path_tuple in nodes:
-                        parent_item = nodes[current_path_tuple]
-                    else:
-                        node_text = path_parts[i]
-                        is_file = (i == len(path_parts) - 1)
-                        
-                        # Create the new item with its name in the first column
-                        new_item = QTreeWidgetItem([node_text])
-                        new_item.setIcon(0, file_icon if is_file else folder_icon)
-                        
-                        # If this is the file itself, populate the other columns
-                        if is_file:
-                            new_item.setText(1, str(e.get('size', '')))
-                            new_item.setText(2, str(e.get('compressed_size', '')))
-                            new_item.setText(3, str(e.get('offset', '')))
-                            new_item.setText(4, e.get('archive', ''))
-                        
-                        parent_item.addChild(new_item)
-                        nodes[current_path_tuple] = new_item
-                        parent_item = new_item
-        else:
-            # Fallback for older pak_data format without a detailed index
-            tree.addTopLevelItem(QTreeWidgetItem(["Pak file index is not detailed enough to build a file tree."]))
-
-        for i in range(tree.columnCount()):
-            tree.resizeColumnToContents(i)
-        layout.addWidget(tree)
-
-        close_btn = QPushButton("Close")
-        close_btn.clicked.connect(dialog.accept)
-        layout.addWidget(close_btn)
-
-        dialog.resize(800, 600)
+        # The dialog builds its file tree off the GUI thread.
+        dialog = PakContentsDialog(self, mod_info.get('name', mod_folder_name), pak_data)
         dialog.exec()
 
     # --- Core Application Logic (Ported from Tkinter version) ---
@@ -811,149 +668,155 @@ class CrossPatchWindow(QMainWindow):
         Performs the non-UI, long-running parts of mod processing in a background thread.
         Returns data needed for subsequent UI updates.
         """
-        all_mods_on_disk = Util.list_mod_folders(self.cfg["mods_folder"])
+        # One scandir pass gives the folder list, info.json data, types and
+        # config presence; the tree and update check reuse the snapshot.
+        snapshot = LibraryScanner.scan_library(self.cfg["mods_folder"])
+        self.library_snapshot = snapshot
+        all_mods_on_disk = list(snapshot.folders)
         new_priority_list = Util.synchronize_priority_with_disk(current_priority_from_main_thread, all_mods_on_disk)
         self.profile_manager.set_mod_priority(new_priority_list) # This is a backend operation, safe in background
 
         # UE4SS mods are handled separately as they don't use the batch processor.
-        Util.clean_ue4ss_folders(self.cfg)
+        Util.clean_ue4ss_folders(self.cfg, snapshot)
         conflicts = self.detect_mod_conflicts()
         return new_priority_list, conflicts
 
-    def refresh(self):
+    def _on_mods_folder_changed(self, mods_folder, changed_folders, listing_changed):
+        """
+        Slot for ModFolderWatcher: re-scans only the mods that changed on disk
+        and updates the list, instead of a full refresh.
+        """
+        if self._is_closing or mods_folder != self.cfg["mods_folder"]:
+            return
+        old_snapshot = self._current_library_snapshot()
+        snapshot = LibraryScanner.update_snapshot(old_snapshot, changed_folders, rescan_listing=listing_changed)
+        self.library_snapshot = snapshot
+        added = [f for f in snapshot.folders if f not in old_snapshot]
+        removed = [f for f in old_snapshot.folders if f not in snapshot]
+        for folder in removed:
+            ManifestCache.manifest_cache.invalidate(os.path.join(mods_folder, folder))
+            ModFingerprint.forget(os.path.join(mods_folder, folder))
+        self.mod_watcher.set_folder(mods_folder, snapshot.folders)
+
+        if added or removed:
+            current_priority = self.profile_manager.get_active_profile().get("mod_priority", [])
+            self.profile_manager.set_mod_priority(Util.synchronize_priority_with_disk(current_priority, list(snapshot.folders)))
+        if not (added or removed or snapshot.changed):
+            return
+        print(f"Mods folder changed on disk: {len(added)} added, {len(removed)} removed, "
+              f"{len([f for f in changed_folders if f in old_snapshot and f in snapshot])} modified.")
+        self._update_treeview(preserve_selection=True)
+        self.idle_parser.schedule()
+
+    def refresh(self, steps=RefreshStep.ALL):
         """
         Refreshes the mod list from disk. This will find new mods and remove deleted ones.
-        It performs a background sync and then updates the UI.
+        Requests made in quick succession are merged into one background run
+        (see RefreshScheduler); `steps` limits what the run has to do.
         """
+        self.refresh_scheduler.request(steps)
+
+    def _on_refresh_started(self, generation, steps):
         self.status_label.setText("Refreshing mod list...")
         self.refresh_btn.setEnabled(False)
 
-        def refresh_worker():
-            try:
-                current_priority = self.profile_manager.get_active_profile().get("mod_priority", [])
-                new_priority_list, _ = self._perform_mod_processing_background_task(current_priority)
-                # Emit with dummy values for unused parameters
-                self.mod_processing_finished.emit(new_priority_list, {}, False, False)
-            except Exception as e:
-                print(f"Error during refresh worker: {e}")
-                # Re-enable button and reset status on the main thread
-                QTimer.singleShot(0, lambda: (self.refresh_btn.setEnabled(True), self.status_label.setText(f"CrossPatch {APP_VERSION}")))
-
-        threading.Thread(target=refresh_worker, daemon=True).start()
+    @traced("refresh", "refresh")
+    def _run_refresh(self, steps, generation):
+        """RefreshScheduler runner (worker thread). Returns the steps left for the GUI thread."""
+        is_stale = lambda: self.refresh_scheduler.is_stale(generation)
+        snapshot = None
+        if steps & RefreshStep.RESCAN:
+            current_priority = self.profile_manager.get_active_profile().get("mod_priority", [])
+            snapshot = LibraryScanner.scan_library(self.cfg["mods_folder"])
+            self.library_snapshot = snapshot
+            new_priority_list = Util.synchronize_priority_with_disk(current_priority, list(snapshot.folders))
+            if new_priority_list != current_priority:
+                self.profile_manager.set_mod_priority(new_priority_list)
+            # UE4SS mods are handled separately as they don't use the batch processor.
+            Util.clean_ue4ss_folders(self.cfg, snapshot)
+            if not snapshot.changed and new_priority_list == current_priority:
+                # Nothing on disk changed, so neither can the list or updates.
+                print("Refresh found no changes.")
+                steps &= ~(RefreshStep.UI | RefreshStep.UPDATES)
+        if is_stale():
+            return RefreshStep(0), None
+        # Conflicts are only shown when deploying, which detects them itself.
+        return steps & (RefreshStep.UI | RefreshStep.UPDATES), {"snapshot": snapshot}
+
+    def _on_refresh_finished(self, generation, steps, result):
+        if not self.refresh_scheduler.busy:
+            self.refresh_btn.setEnabled(True)
+            self.status_label.setText(f"CrossPatch {APP_VERSION}")
+        if self._is_closing or result is None:
+            return
+        if self.library_snapshot is not None:
+            self.mod_watcher.set_folder(self.cfg["mods_folder"], self.library_snapshot.folders)
+        if steps & RefreshStep.UI:
+            self._update_treeview(preserve_selection=False)
+        if steps & RefreshStep.UPDATES:
+            snapshot = result.get("snapshot")
+            threading.Thread(target=lambda: self.check_all_mod_updates(snapshot=snapshot), daemon=True).start()
+        # A refresh may have found new mods; analyze them once things are quiet.
+        self.idle_parser.schedule()
 
     def _tree_mouse_press_event(self, event):
         """Clears selection when clicking on an empty area of the tree."""
-        item = self.tree.itemAt(event.pos())
-        if not item:
+        if not self.tree.indexAt(event.pos()).isValid():
             self.tree.clearSelection()
         # Call the original event handler to maintain default behavior (like dragging)
-        QTreeWidget.mousePressEvent(self.tree, event)
+        QTreeView.mousePressEvent(self.tree, event)
 
+    @profiled("_update_treeview")
     def _update_treeview(self, preserve_selection=True):
-        # Block signals to prevent on_item_changed from firing recursively
-        self.tree.blockSignals(True)
-        try:
-            # --- Preserve Selection ---
-            selected_mod_folder = None
-            if preserve_selection:
-                current_item = self.tree.currentItem()
-                if current_item:
-                    selected_mod_folder = current_item.data(0, Qt.UserRole)
-
-            search_text = self.search_entry.text().lower()
-            active_profile = self.profile_manager.get_active_profile()
-            enabled_mods_map = active_profile.get("enabled_mods", {})
-            mod_priority = active_profile.get("mod_priority", [])
-            updatable_mod_names = {v['name'] for v in self.updatable_mods.values()}
-
-            # --- Sorting Logic ---
-            enabled_mods_ordered = []
-            disabled_mods_with_info = []
-
-            # Batch-read all mod info to minimize file I/O
-            all_mods_info = {
-                mod_folder_name: Util.read_mod_info(os.path.join(self.cfg["mods_folder"], mod_folder_name))
-                for mod_folder_name in mod_priority
-            }
-
-            # Preserve order for enabled mods, collect disabled mods
-            for mod_folder_name in mod_priority:
-                info = all_mods_info.get(mod_folder_name, {})
-                name = info.get("name", mod_folder_name)
-
-                # Filter based on search text
-                version = info.get("version", "1.0")
-                author = info.get("author", "Unknown")
-                mod_type = info.get("mod_type", "pak").upper()
-                if search_text and not any(search_text in s.lower() for s in [name, version, author, mod_type]):
-                    continue
-
-                if enabled_mods_map.get(mod_folder_name, False):
-                    enabled_mods_ordered.append(mod_folder_name)
-                else:
-                    disabled_mods_with_info.append((name, mod_folder_name))
-
-            # Always sort disabled mods alphabetically for consistent display
-            disabled_mods_with_info.sort(key=lambda x: x[0].lower())
-            # The final list of mod folders to display
-            display_order = enabled_mods_ordered + [mod_folder for name, mod_folder in disabled_mods_with_info]
-            
-            # --- Tree Update ---
-            self.tree.setColumnHidden(0, not self.updatable_mods)
-            # Disable widget updates to reduce repaint overhead during bulk population
-            try:
-                self.tree.setUpdatesEnabled(False)
-            except Exception:
-                pass
-            self.tree.clear()
-
-            for mod_folder_name in display_order:
-                info = all_mods_info.get(mod_folder_name, {})
-                name = info.get("name", mod_folder_name)
-                version = info.get("version", "1.0")
-                author = info.get("author", "Unknown")
-                mod_type = info.get("mod_type", "pak").upper()
-                # Check for file-based config OR json-based config
-                # Use a lightweight quick-check for file-based configuration so
-                # the UI can show the config icon without performing a full
-                # discovery scan (keeps browse rendering snappy).
-                has_config = "configuration" in info
-                if not has_config:
-                    try:
-                        mod_path = os.path.join(self.cfg["mods_folder"], mod_folder_name)
-                        if Util.has_file_based_configuration_quick(mod_path):
-                            has_config = True
-                    except Exception:
-                        pass
-                is_enabled = enabled_mods_map.get(mod_folder_name, False)
-
-                item = QTreeWidgetItem(["", "", name, version, author, mod_type, ""])
-                item.setData(0, Qt.UserRole, mod_folder_name)
-
-                item.setCheckState(1, Qt.Checked if is_enabled else Qt.Unchecked)
-
-                if name in updatable_mod_names:
-                    item.setText(0, "⬆️")
-                    font = item.font(2)
-                    font.setBold(True)
-                    item.setFont(2, font)
-                    item.setForeground(2, QColor("springgreen"))
-                
-                if has_config:
-                    item.setText(6, "⚙️")
-
-                self.tree.addTopLevelItem(item)
-
-                if mod_folder_name == selected_mod_folder:
-                    self.tree.setCurrentItem(item)
-
-            print("Treeview updated")
-            try:
-                self.tree.setUpdatesEnabled(True)
-            except Exception:
-                pass
-        finally:
-            self.tree.blockSignals(False)
+        """
+        Brings the mod list model up to date with the library. Only rows that
+        were added, removed, moved or changed are touched, so the current mod
+        stays selected; the search filter is applied by the proxy model.
+        """
+        active_profile = self.profile_manager.get_active_profile()
+        enabled_mods_map = active_profile.get("enabled_mods", {})
+        mod_priority = active_profile.get("mod_priority", [])
+        updatable_mod_names = {v['name'] for v in self.updatable_mods.values()}
+
+        # Use the last library scan; before the first scan has finished,
+        # build the snapshot from the catalog instead of reading every info.json.
+        snapshot = self._current_library_snapshot()
+        all_mods_info = {entry.folder: entry.info for entry in snapshot}
+        missing = [f for f in mod_priority if f not in snapshot]
+        if missing:
+            all_mods_info.update(ModCatalog.catalog.mod_infos(self.cfg["mods_folder"], missing))
+
+        # --- Sorting Logic ---
+        # Enabled mods keep their priority order; disabled mods are always
+        # sorted alphabetically for consistent display.
+        enabled_rows = []
+        disabled_rows = []
+        for mod_folder_name in mod_priority:
+            info = all_mods_info.get(mod_folder_name, {})
+            name = info.get("name", mod_folder_name)
+            # Check for file-based config OR json-based config. The scan
+            # already looked for config folders, so no per-row disk access.
+            entry = snapshot.get(mod_folder_name)
+            is_enabled = enabled_mods_map.get(mod_folder_name, False)
+            row = ModRow(
+                folder=mod_folder_name,
+                name=name,
+                version=info.get("version", "1.0"),
+                author=info.get("author", "Unknown"),
+                mod_type=info.get("mod_type", "pak").upper(),
+                has_config=entry.has_config if entry else "configuration" in info,
+                enabled=is_enabled,
+                updatable=name in updatable_mod_names,
+            )
+            (enabled_rows if is_enabled else disabled_rows).append(row)
+        disabled_rows.sort(key=lambda r: r.name.lower())
+
+        # --- Model Update ---
+        self.tree.setColumnHidden(0, not self.updatable_mods)
+        self.mod_model.apply_rows(enabled_rows + disabled_rows)
+        if not preserve_selection:
+            self.tree.selectionModel().clear()
+        print("Treeview updated")
 
     def save_and_apply_mods(self):
         """
@@ -962,10 +825,15 @@ class CrossPatchWindow(QMainWindow):
         """
         self.launch_btn.setEnabled(False)
         self.status_label.setText("Applying mods...")
+        # Background analysis would compete with the deploy for disk and CPU.
+        self.idle_parser.pause("deploy")
+        self.mod_watcher.pause("deploy")
+        self.refresh_scheduler.pause("deploy")
 
         # Capture current_priority from the UI thread before starting the worker.
         # This ensures we save the user's latest drag-and-drop changes.
-        current_priority = [self.tree.topLevelItem(i).data(0, Qt.UserRole) for i in range(self.tree.topLevelItemCount())]
+        # The model holds every mod, including those hidden by the search filter.
+        current_priority = self.mod_model.folders()
 
         # Before starting the worker, explicitly save the profile data which now
         # contains any pending checkbox changes.
@@ -991,6 +859,8 @@ class CrossPatchWindow(QMainWindow):
             print(f"Error during save and launch worker: {e}")
             QTimer.singleShot(0, lambda: QMessageBox.critical(self, "Error", f"An error occurred during mod processing or launch: {e}"))
             QTimer.singleShot(0, lambda: (self.launch_btn.setEnabled(True), self.status_label.setText(f"CrossPatch {APP_VERSION}")))
+            QTimer.singleShot(0, lambda: (self.idle_parser.resume("deploy"), self.mod_watcher.resume("deploy"),
+                                          self.refresh_scheduler.resume("deploy")))
 
     def _on_mod_processing_finished(self, new_priority_list, conflicts, launch_success, is_launch_operation):
         """
@@ -1021,13 +891,23 @@ class CrossPatchWindow(QMainWindow):
             self.status_label.setText(f"CrossPatch {APP_VERSION}")
             print("Mod processing and UI update finished.")
             
+            if self.library_snapshot is not None:
+                self.mod_watcher.set_folder(self.cfg["mods_folder"], self.library_snapshot.folders)
+
             if not is_launch_operation: # Only do this if it's not a launch
+                # A refresh may have found new mods; analyze them once things are quiet.
+                self.idle_parser.schedule()
                 return
 
             # This is the final step after all background work is done.
             # This will handle enabling all mods, including showing the batch processor dialog.
             enabled_mods_dict = self.profile_manager.get_active_profile().get("enabled_mods", {})
-            Util.enable_mods_from_priority(new_priority_list, enabled_mods_dict, self.cfg, self, self.profile_manager.get_active_profile())
+            try:
+                Util.enable_mods_from_priority(new_priority_list, enabled_mods_dict, self.cfg, self, self.profile_manager.get_active_profile())
+            finally:
+                self.idle_parser.resume("deploy")
+                self.mod_watcher.resume("deploy")
+                self.refresh_scheduler.resume("deploy")
             
             # Refresh the treeview one last time in case the conflict dialog caused changes.
             self._update_treeview(preserve_selection=False)
@@ -1046,14 +926,14 @@ class CrossPatchWindow(QMainWindow):
 
             # If item_data is from the browser, it might be incomplete.
             # We need to re-fetch it using the URL to guarantee we have the file list.
-            # We have item_data from the ModCard, but it might not be the *full* data.
-            # We need to ensure we have _aFiles.
+            # We have item_data from the Browse grid, but it might not be the *full* data.
+            # We need to ensure we have _aFiles. Usually the prefetcher already has it.
             mod_id = item_data.get('_idRow')
 
             if mod_type and mod_id:
                 try:
-                    # Directly fetch full item_data using the mod's type and ID
-                    item_data = Util.get_gb_item_data_by_id(mod_type, mod_id)
+                    # Full item_data by the mod's type and ID, from the prefetch cache if possible
+                    item_data = details_prefetcher.fetch(item_data)
                 except Exception as e:
                     QMessageBox.critical(self, "Download Error", f"Could not get mod details by ID.\n\n{e}")
                     return
@@ -1066,19 +946,11 @@ class CrossPatchWindow(QMainWindow):
             if not item_data.get('_aFiles'):
                 QMessageBox.information(self, "No Files Found", "Could not find any downloadable files for this mod.")
                 return
-            
-            # Pause background image loading while the modal dialog is open to prevent crashes.
-            QThreadPool.globalInstance().clear() # Stop queued tasks
-            QThreadPool.globalInstance().waitForDone(100) # Wait up to 100ms for active tasks
-            
-            try:
-                dialog = FileSelectDialog(self, item_data)
-                if dialog.exec():
-                    self.start_download_from_selection(dialog.get_selection(), item_data)
-            finally:
-                # Resume background loading by re-fetching the mods, which will re-queue image loading.
-                print("[DEBUG] Resuming background tasks after closing file dialog.")
-                self.fetch_browse_mods(page=self.browse_current_page)
+
+            # Thumbnails and details keep loading in their own pools while the dialog is open.
+            dialog = FileSelectDialog(self, item_data)
+            if dialog.exec():
+                self.start_download_from_selection(dialog.get_selection(), item_data)
         except Exception as e:
             QMessageBox.critical(self, "Download Error", f"An error occurred.\n\n{e}")
 
@@ -1089,12 +961,12 @@ class CrossPatchWindow(QMainWindow):
             self.active_download_manager.download_specific_file(selected_file, full_item_data)
 
     def edit_selected_mod_info(self):
-        selected = self.tree.currentItem()
+        selected = self._selected_mod()
         if not selected:
             return
 
-        folder_name = selected.data(0, Qt.UserRole)
-        display_name = selected.text(2)
+        folder_name = selected.folder
+        display_name = selected.name
         mod_folder = os.path.join(self.cfg["mods_folder"], folder_name)
         data = Util.read_mod_info(mod_folder) or {}
 
@@ -1103,8 +975,7 @@ class CrossPatchWindow(QMainWindow):
             new_data = dialog.get_data()
             original_mod_type = dialog.original_mod_type
             try:
-                with open(os.path.join(mod_folder, "info.json"), "w", encoding="utf-8") as f:
-                    json.dump(new_data, f, indent=2)
+                mod_info_writer.replace(mod_folder, new_data)
             except Exception as e:
                 QMessageBox.critical(self, "Save Error", f"Could not save info.json:\n{e}")
                 return
@@ -1117,20 +988,27 @@ class CrossPatchWindow(QMainWindow):
                 Util.remove_mod_from_game_folders(folder_name, self.cfg)
                 self.refresh()
             else:
-                selected.setText(2, new_data["name"])
-                selected.setText(3, new_data["version"])
-                selected.setText(4, new_data["author"])
-                selected.setText(5, new_mod_type.upper())
+                source_row = self.mod_model.row_of(folder_name)
+                if source_row is not None:
+                    rows = [self.mod_model.row(i) for i in range(self.mod_model.rowCount())]
+                    rows[source_row] = rows[source_row]._replace(
+                        name=new_data["name"],
+                        version=new_data["version"],
+                        author=new_data["author"],
+                        mod_type=new_mod_type.upper(),
+                        has_config="configuration" in new_data,
+                    )
+                    self.mod_model.apply_rows(rows)
         else:
             print("Edit mod info cancelled.")
 
     def configure_selected_mod(self):
         """Opens the configuration dialog for the selected mod."""
-        selected = self.tree.currentItem()
+        selected = self._selected_mod()
         if not selected:
             return
 
-        folder_name = selected.data(0, Qt.UserRole)
+        folder_name = selected.folder
         mod_path = os.path.join(self.cfg["mods_folder"], folder_name)
         
         # Discover the configuration from the file system
@@ -1142,7 +1020,7 @@ class CrossPatchWindow(QMainWindow):
         active_profile = self.profile_manager.get_active_profile()
         current_selections = active_profile.get("mod_configurations", {}).get(folder_name, {})
 
-        dialog = ModConfigDialog(self, selected.text(2), config_data, current_selections)
+        dialog = ModConfigDialog(self, selected.name, config_data, current_selections)
         if dialog.exec():
             new_selections = dialog.get_selections()
             self.profile_manager.set_mod_configuration(folder_name, new_selections)
@@ -1180,19 +1058,30 @@ class CrossPatchWindow(QMainWindow):
         except Exception as e:
             QMessageBox.critical(self, "Update Error", f"Could not get mod details or start update.\n\n{e}")
 
-    def check_all_mod_updates(self, manual_check=False):
+    def _current_library_snapshot(self):
+        """The latest scan of the mods folder, or one built from the catalog if there is none yet."""
+        snapshot = self.library_snapshot
+        if snapshot is None or snapshot.mods_folder != self.cfg["mods_folder"]:
+            snapshot = LibraryScanner.cached_snapshot(self.cfg["mods_folder"])
+        return snapshot
+
+    @profiled("check_all_mod_updates")
+    def check_all_mod_updates(self, manual_check=False, snapshot=None):
         print("Checking all mods for updates...")
         updates = {}
-        mod_folders = Util.list_mod_folders(self.cfg["mods_folder"])
-
-        for mod_folder_name in mod_folders:
-            mod_info = Util.read_mod_info(os.path.join(self.cfg["mods_folder"], mod_folder_name))
-            mod_name = mod_info.get("name", mod_folder_name)
-            mod_version = mod_info.get("version", "1.0")
-            mod_page = mod_info.get("mod_page")
-
-            if not mod_page or not mod_page.startswith("https://gamebanana.com"):
+        if snapshot is None:
+            snapshot = LibraryScanner.scan_library(self.cfg["mods_folder"])
+            self.library_snapshot = snapshot
+            # The scan may have picked up edits made outside CrossPatch.
+            self._library_changed = snapshot.changed
+
+        for entry in snapshot:
+            mod_page = entry.info.get("mod_page") or ""
+            if not mod_page.startswith("https://gamebanana.com"):
                 continue
+            mod_folder_name = entry.folder
+            mod_name = entry.info.get("name") or mod_folder_name
+            mod_version = entry.info.get("version") or "1.0"
 
             try:
                 gb_version = Util.get_gb_mod_version(mod_page)
@@ -1218,10 +1107,15 @@ class CrossPatchWindow(QMainWindow):
         # Only update the UI if the set of updates actually changed. This avoids
         # an unnecessary second Treeview refresh during startup when nothing
         # meaningful changed since the initial rendering.
+        library_changed, self._library_changed = self._library_changed, False
+        if self.library_snapshot is not None and not self._is_closing:
+            self.mod_watcher.set_folder(self.cfg["mods_folder"], self.library_snapshot.folders)
         if updates != self.updatable_mods:
             self.updatable_mods = updates
             self._update_treeview(preserve_selection=True)
         else:
+            if library_changed:
+                self._update_treeview(preserve_selection=True)
             # If this was a manual check, still notify the user even if nothing changed.
             if manual_check:
                 if updates:
@@ -1241,11 +1135,11 @@ class CrossPatchWindow(QMainWindow):
         Util.show_update_prompt_pyside(self, remote_version, remote_info)
 
     def check_mod_updates(self):
-        selected = self.tree.currentItem()
+        selected = self._selected_mod()
         if not selected: return
 
-        mod_folder = selected.data(0, Qt.UserRole)
-        display_name = selected.text(2)
+        mod_folder = selected.folder
+        display_name = selected.name
         mod_info = Util.read_mod_info(os.path.join(self.cfg["mods_folder"], mod_folder))
 
         mod_page = mod_info.get("mod_page")
@@ -1272,11 +1166,11 @@ class CrossPatchWindow(QMainWindow):
             QMessageBox.critical(self, "Update Check Error", f"Failed to check for updates: {str(e)}")
 
     def delete_mod(self):
-        selected = self.tree.currentItem()
+        selected = self._selected_mod()
         if not selected: return
 
-        mod_id = selected.data(0, Qt.UserRole)
-        reply = QMessageBox.question(self, "Confirm Delete", f"Are you sure you want to delete '{selected.text(2)}'?",
+        mod_id = selected.folder
+        reply = QMessageBox.question(self, "Confirm Delete", f"Are you sure you want to delete '{selected.name}'?",
                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
 
         if reply == QMessageBox.Yes:
@@ -1288,28 +1182,31 @@ class CrossPatchWindow(QMainWindow):
             self.save_and_apply_mods() # Use save_and_apply to ensure changes are persisted and applied
 
     def open_selected_mod_folder(self):
-        selected = self.tree.currentItem()
+        selected = self._selected_mod()
         if not selected: return
 
-        folder = os.path.join(self.cfg["mods_folder"], selected.data(0, Qt.UserRole))
+        folder = os.path.join(self.cfg["mods_folder"], selected.folder)
         if os.path.isdir(folder):
             QDesktopServices.openUrl(QUrl.fromLocalFile(folder))
         else:
             QMessageBox.warning(self, "Folder Not Found",
                                 f"The folder for this mod could not be found at the expected location:\n\n{folder}")
 
+    @traced("detect_mod_conflicts", "conflicts")
     def detect_mod_conflicts(self):
         mods_folder = self.cfg["mods_folder"]
         active_profile = self.profile_manager.get_active_profile()
         enabled_mods_dict = active_profile.get("enabled_mods", {})
         enabled_mods = [mod for mod in active_profile.get("mod_priority", []) if enabled_mods_dict.get(mod, False)]
+        annotate(items=len(enabled_mods))
+        enabled_infos = ModCatalog.catalog.mod_infos(mods_folder, enabled_mods)
         file_map = {}
         conflicts = {}
         conflict_blacklist = {"info.json", "config.ini", "readme.txt", "readme.md", "changelog.txt"}
 
         for mod in enabled_mods:
             mod_path = os.path.join(mods_folder, mod)
-            mod_info = Util.read_mod_info(mod_path)
+            mod_info = enabled_infos.get(mod, {})
             if mod_info.get("mod_type", "pak").startswith("ue4ss"):
                 continue
 
@@ -1474,61 +1371,41 @@ class CrossPatchWindow(QMainWindow):
         if self.notebook.tabText(index) == "Browse Mods" and not self.browse_mods_data:
             self.fetch_browse_mods()
 
-    def fetch_browse_mods(self, page=1):
-        """Fetches and displays mods from GameBanana in a background thread."""
+    def fetch_browse_mods(self, page=1, refresh=False):
+        """Shows a page of mods from GameBanana; fetching happens in the background."""
         print(f"[DEBUG] fetch_browse_mods called with page={page}")
-        # Clear existing cards and show loading message
-        self._clear_card_layout()
-        loading_label = QLabel("<h2>Loading...</h2>")
-        loading_label.setAlignment(Qt.AlignCenter)
-        self.card_layout.addWidget(loading_label, 0, 0, 1, 4)
+        if self.browse_tab_frame in self._pending_tabs:
+            return  # Not opened yet; its first visit fetches.
+        search_query = self.browse_search_entry.text().strip()
+        self.browse_controller.show_page(page, search_query, refresh=refresh)
 
+    def _set_browse_page(self, page):
         self.browse_current_page = page
         self.browse_page_label.setText(f"Page {self.browse_current_page}")
         self.browse_prev_btn.setEnabled(page > 1)
-        
-        search_query = self.browse_search_entry.text().strip()
-        sort_param = "Featured" # Hardcoded to always use Featured
-
-        print(f"[DEBUG] Starting worker thread with sort='{sort_param}', page={self.browse_current_page}, search='{search_query}'")
 
-        threading.Thread(
-            target=self._fetch_browse_mods_worker,
-            args=(sort_param, self.browse_current_page, search_query),
-            daemon=True
-        ).start()
+    def _on_browse_page_loading(self, page, search_query):
+        # Clear existing cards and show loading message
+        self._set_browse_page(page)
+        self.browse_model.set_mods([])
+        self._show_browse_status("Loading...")
 
-    def _fetch_browse_mods_worker(self, sort, page, search):
-        try:
-            # Game ID for "Sonic Racing Crossworlds"
-            game_id = 21640
-            mods, metadata = [], {}
+    def _on_browse_page_ready(self, page, search_query, mods, metadata):
+        self._set_browse_page(page)
+        self._update_browse_cards((mods, metadata))
 
-            # Search overrides all other filters and uses the Subfeed endpoint.
-            if search:
-                mods, metadata = Util.get_gb_mod_list(game_id, 'default', page, search, None)
-            else:
-                mods, metadata = Util.fetch_specialized_lists(game_id, sort, page)
+    def _on_browse_page_failed(self, page, search_query, error_message):
+        self._set_browse_page(page)
+        self._update_browse_cards(([error_message], {}))
 
-            QApplication.instance().postEvent(self, Util.ModListFetchEvent((mods, metadata)))
-        except Exception as e:
-            error_message = f"Failed to fetch mods: {e}"
-            print(error_message)
-            QApplication.instance().postEvent(self, Util.ModListFetchEvent(([error_message], {})))
-
-    def _clear_card_layout(self):
-        """Removes all widgets from the card layout, ensuring threads are stopped."""
-        while self.card_layout.count():
-            child = self.card_layout.takeAt(0)
-            if child.widget():
-                # Explicitly stop any background tasks before deleting
-                if hasattr(child.widget(), 'stop'):
-                    child.widget().stop()
-                child.widget().deleteLater()
+    def _show_browse_status(self, message):
+        """Shows a status message in place of the card grid; None shows the grid."""
+        self.browse_status_label.setText(f"<h2>{message}</h2>" if message else "")
+        self.browse_status_label.setVisible(bool(message))
+        self.browse_grid.setVisible(not message)
 
     def _update_browse_cards(self, mods):
         mods, metadata = mods
-        self._clear_card_layout()
         print(f"[DEBUG] _update_browse_cards received: {mods}")
         self.browse_mods_data = []
 
@@ -1538,46 +1415,15 @@ class CrossPatchWindow(QMainWindow):
         if not mods or (isinstance(mods, list) and len(mods) > 0 and isinstance(mods[0], str)):
             error_message = mods[0] if mods else "No mods found."
             print(f"[DEBUG] No mods found or error received. Displaying: '{error_message}'")
-            error_label = QLabel(f"<h2>{error_message}</h2>")
-            error_label.setAlignment(Qt.AlignCenter)
-            self.card_layout.addWidget(error_label, 0, 0, 1, 4)
+            self.browse_model.set_mods([])
+            self._show_browse_status(error_message)
             return
 
-        print(f"[DEBUG] Populating browse tree with {len(mods)} mods.")
+        print(f"[DEBUG] Populating browse grid with {len(mods)} mods.")
         self.browse_mods_data = mods
-        
-        # Determine number of columns based on window width
-        cols = max(1, self.scroll_area.width() // 230)
-        for i, mod_data in enumerate(mods):
-            row, col = divmod(i, cols)
-            card = ModCard(mod_data, self.add_mod_from_url)
-            self.card_layout.addWidget(card, row, col)
-
-    def _reflow_browse_cards(self):
-        """Rearranges existing mod cards to fit the new window size without fetching new data."""
-        # Only reflow if the browse tab is visible and has cards.
-        if self.notebook.tabText(self.notebook.currentIndex()) != "Browse Mods" or self.card_layout.count() == 0:
-            return
-
-        # Check if the first item is a label (e.g., "Loading...", "No mods found.")
-        first_item = self.card_layout.itemAt(0).widget()
-        if isinstance(first_item, QLabel):
-            return # Don't try to reflow a status message
-
-        print("[DEBUG] Reflowing mod cards due to resize.")
-
-        # Collect all existing card widgets
-        cards = []
-        while self.card_layout.count():
-            child = self.card_layout.takeAt(0)
-            if child.widget():
-                cards.append(child.widget())
-
-        # Recalculate columns and re-add the widgets
-        cols = max(1, self.scroll_area.width() // 230)
-        for i, card in enumerate(cards):
-            row, col = divmod(i, cols)
-            self.card_layout.addWidget(card, row, col)
+        self.browse_model.set_mods(mods)
+        self.browse_grid.scrollToTop()
+        self._show_browse_status(None)
 
     def browse_prev_page(self):
         if self.browse_current_page > 1:
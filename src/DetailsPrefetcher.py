@@ -0,0 +1,158 @@
+"""
+Background prefetch of full GameBanana item details for Browse cards.
+
+Browse results are minimal records; downloading needs the full item (files,
+description, preview media). The prefetcher loads it for cards that are
+visible or hovered, a few at a time, and keeps the results for a few
+minutes, so by the time Download is clicked the file selection dialog can
+usually open without waiting on the network:
+
+    details_prefetcher.prefetch(mod_data, PRIORITY_HOVER)
+    ...
+    full = details_prefetcher.fetch(mod_data)  # cached, in flight, or fetched now
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Optional
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, Signal
+
+import Util
+
+DETAILS_TTL = 5 * 60  # seconds
+MAX_CACHED = 256
+MAX_CONCURRENT = 3
+FETCH_WAIT_TIMEOUT = 15  # seconds to wait for a fetch already in flight
+
+PRIORITY_VISIBLE = 0
+PRIORITY_HOVER = 10
+
+
+def item_key(item_data: Dict) -> Optional[str]:
+    """Stable cache key of a GameBanana record, or None if it can't be identified."""
+    model, item_id = item_data.get('_sModelName'), item_data.get('_idRow')
+    if model and item_id:
+        return f"{model}/{item_id}"
+    return item_data.get('_sProfileUrl') or None
+
+
+def fetch_item_details(item_data: Dict) -> Dict:
+    """Fetches the full item data, by type and ID when the record has them, else by its page URL."""
+    model, item_id = item_data.get('_sModelName'), item_data.get('_idRow')
+    if model and item_id:
+        return Util.get_gb_item_data_by_id(model, item_id)
+    if item_data.get('_sProfileUrl'):
+        return Util.get_gb_item_data_from_url(f"https://gamebanana.com/{item_data['_sProfileUrl']}")
+    raise ValueError("Mod data is incomplete: cannot identify mod.")
+
+
+class _DetailsTask(QRunnable):
+    def __init__(self, prefetcher, key: str, item_data: Dict, priority: int):
+        super().__init__()
+        self.setAutoDelete(False)  # The prefetcher holds it until it reports back.
+        self.prefetcher = prefetcher
+        self.key = key
+        self.item_data = item_data
+        self.priority = priority
+        self.done = threading.Event()
+
+    def run(self):
+        try:
+            data = fetch_item_details(self.item_data)
+            self.prefetcher._store(self.key, data)
+            self.prefetcher._task_done.emit(self.key, data, "")
+        except Exception as e:
+            self.prefetcher._task_done.emit(self.key, None, f"Failed to load details for {self.item_data.get('_sName')}: {e}")
+        finally:
+            self.done.set()
+
+
+class DetailsPrefetcher(QObject):
+    """Bounded-concurrency loader and short-lived cache of item details. Use the shared `details_prefetcher`."""
+    loaded = Signal(str, object)  # (item key, full item data)
+    failed = Signal(str, str)  # (item key, message)
+    _task_done = Signal(str, object, str)
+
+    def __init__(self, parent=None, ttl: float = DETAILS_TTL):
+        super().__init__(parent)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (expires at, data)
+        self._tasks: Dict[str, _DetailsTask] = {}
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(MAX_CONCURRENT)
+        self._task_done.connect(self._on_task_done)
+
+    def _store(self, key: str, data: Dict) -> None:
+        with self._lock:
+            self._cache.pop(key, None)
+            self._cache[key] = (time.monotonic() + self.ttl, data)
+            while len(self._cache) > MAX_CACHED:
+                self._cache.popitem(last=False)
+
+    def get(self, item_data: Dict) -> Optional[Dict]:
+        """The cached full details of an item, if fetched within the TTL."""
+        key = item_key(item_data)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached is None:
+                return None
+            if cached[0] < time.monotonic():
+                del self._cache[key]
+                return None
+            return cached[1]
+
+    def prefetch(self, item_data: Dict, priority: int = PRIORITY_VISIBLE) -> None:
+        """Queues loading the item's details unless they are cached or already on their way."""
+        key = item_key(item_data)
+        if key is None or self.get(item_data) is not None:
+            return
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = _DetailsTask(self, key, item_data, priority)
+            self._pool.start(task, priority)
+        elif priority > task.priority and self._pool.tryTake(task):
+            task.priority = priority
+            self._pool.start(task, priority)
+
+    def cancel_pending(self) -> None:
+        """Drops queued prefetches that haven't started, e.g. when the page changes."""
+        for key, task in list(self._tasks.items()):
+            if self._pool.tryTake(task):
+                del self._tasks[key]
+
+    def fetch(self, item_data: Dict) -> Dict:
+        """
+        The item's full details: from the cache, from a prefetch already in
+        flight, or fetched now. Raises like Util.get_gb_item_data_by_id.
+        """
+        cached = self.get(item_data)
+        if cached is not None:
+            return cached
+        key = item_key(item_data)
+        task = self._tasks.get(key)
+        if task is not None and not self._pool.tryTake(task):
+            # Already running: waiting for it beats a second request.
+            if task.done.wait(FETCH_WAIT_TIMEOUT):
+                cached = self.get(item_data)
+                if cached is not None:
+                    return cached
+        elif task is not None:
+            del self._tasks[key]
+        data = fetch_item_details(item_data)
+        if key is not None:
+            self._store(key, data)
+        return data
+
+    def _on_task_done(self, key, data, error):
+        self._tasks.pop(key, None)
+        if data is not None:
+            self.loaded.emit(key, data)
+        else:
+            print(error)
+            self.failed.emit(key, error)
+
+
+details_prefetcher = DetailsPrefetcher()
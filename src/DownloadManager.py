@@ -3,8 +3,6 @@ import shutil
 import zipfile
 import time
 import threading
-import requests
-import json
 
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar, QMessageBox
 from PySide6.QtCore import Signal, QObject, Qt, QTimer
@@ -12,19 +10,15 @@ from PySide6.QtCore import Signal, QObject, Qt, QTimer
 import Util
 from Constants import APP_VERSION, BROWSER_USER_AGENT
 import PakInspector
+from ModInfoWriter import mod_info_writer
+from LazyImport import lazy_module, module_available
+from Profiler import operation
 
-# --- Handle optional archive dependencies ---
-try:
-    import py7zr
-    PY7ZR_SUPPORT = True
-except ImportError:
-    PY7ZR_SUPPORT = False
+requests = lazy_module("requests")  # Imported on first download
 
-try:
-    import rarfile
-    RARFILE_SUPPORT = True
-except ImportError:
-    RARFILE_SUPPORT = False
+# --- Handle optional archive dependencies (imported when an archive needs them) ---
+PY7ZR_SUPPORT = module_available("py7zr")
+RARFILE_SUPPORT = module_available("rarfile")
 
 class DownloadSignals(QObject):
     """Defines signals for communicating from the worker thread to the GUI."""
@@ -83,12 +77,22 @@ class DownloadManager:
         self.signals.progress_text.connect(self.progress_dialog.update_progress_text)
         self.signals.label_text.connect(self.progress_dialog.update_label)
         self.progress_dialog.show()
+        # Don't let background pak analysis compete with the download and extraction.
+        if hasattr(self.parent, 'idle_parser'):
+            self.parent.idle_parser.pause("download")
+        if hasattr(self.parent, 'mod_watcher'):
+            # Extraction events are reported once, after the download finishes.
+            self.parent.mod_watcher.pause("download")
         
         threading.Thread(target=thread_target, args=thread_args, daemon=True).start()
 
     def _on_finish(self):
         if hasattr(self, 'progress_dialog') and self.progress_dialog:
             self.progress_dialog.accept()
+        if hasattr(self.parent, 'idle_parser'):
+            self.parent.idle_parser.resume("download")
+        if hasattr(self.parent, 'mod_watcher'):
+            self.parent.mod_watcher.resume("download")
         # Schedule the on_complete callback to run after the dialog has had a chance to close,
         # preventing the UI from freezing before the window disappears.
         if hasattr(self, 'on_complete') and self.on_complete:
@@ -96,11 +100,15 @@ class DownloadManager:
         # Also refresh the browse tab if it exists on the parent, to reflect any changes.
         if hasattr(self.parent, 'fetch_browse_mods'):
             print("[DEBUG] Download finished. Triggering browse tab refresh.")
-            QTimer.singleShot(100, lambda: self.parent.fetch_browse_mods(page=self.parent.browse_current_page))
+            QTimer.singleShot(100, lambda: self.parent.fetch_browse_mods(page=self.parent.browse_current_page, refresh=True))
 
     def _on_error(self, error_message):
         if hasattr(self, 'progress_dialog') and self.progress_dialog:
             self.progress_dialog.reject()
+        if hasattr(self.parent, 'idle_parser'):
+            self.parent.idle_parser.resume("download")
+        if hasattr(self.parent, 'mod_watcher'):
+            self.parent.mod_watcher.resume("download")
         QMessageBox.critical(self.parent, "Download Failed", error_message)
         if hasattr(self, 'on_complete') and self.on_complete: # Refresh UI even on failure
             QTimer.singleShot(100, self.on_complete)
@@ -177,7 +185,9 @@ class DownloadManager:
         try:
             api_item_type = item_type.capitalize()
             api_url = f"https://gamebanana.com/apiv11/{api_item_type}/{item_id}?_csvProperties=_sName,_aFiles"
-            response = requests.get(api_url, headers={'User-Agent': BROWSER_USER_AGENT})
+            with operation("gb_api", "network", detail=api_url) as op:
+                response = requests.get(api_url, headers={'User-Agent': BROWSER_USER_AGENT})
+                op.bytes = len(response.content)
             response.raise_for_status()
             item_data = response.json()
             item_name = item_data.get('_sName', f"mod_{item_id}").replace(" ", "")
@@ -195,20 +205,22 @@ class DownloadManager:
             extract_path = os.path.join(self.mods_folder, item_name)
             Util.extract_archive(temp_archive_path, extract_path, self.signals.label_text, finished_signal=self.signals.finished)
 
-            self._update_mod_info_with_version(extract_path, item_version)
-            self._update_mod_info_with_page(extract_path, page_url)
-
-            # Also create a rich info.json using the same helper so we include pak metadata
-            try:
-                # Find the specific file entry from the item data that matches the download URL
-                file_info = next((f for f in item_data.get('_aFiles', []) if f.get('_sDownloadUrl') == download_url), None)
-                # If not found, take the first file entry as a best-effort
-                if file_info is None:
-                    file_info = item_data.get('_aFiles', [None])[0]
-                # Create/update info.json with pak_data and other metadata
-                self._create_and_update_mod_info(extract_path, item_data, file_info or {}, page_url)
-            except Exception as e:
-                print(f"Warning: failed to create detailed info.json for {extract_path}: {e}")
+            # All info.json updates below are merged into a single write.
+            with mod_info_writer.batch(extract_path):
+                self._update_mod_info_with_version(extract_path, item_version)
+                self._update_mod_info_with_page(extract_path, page_url)
+
+                # Also create a rich info.json using the same helper so we include pak metadata
+                try:
+                    # Find the specific file entry from the item data that matches the download URL
+                    file_info = next((f for f in item_data.get('_aFiles', []) if f.get('_sDownloadUrl') == download_url), None)
+                    # If not found, take the first file entry as a best-effort
+                    if file_info is None:
+                        file_info = item_data.get('_aFiles', [None])[0]
+                    # Create/update info.json with metadata and warm the pak manifest cache
+                    self._create_and_update_mod_info(extract_path, item_data, file_info or {}, page_url)
+                except Exception as e:
+                    print(f"Warning: failed to create detailed info.json for {extract_path}: {e}")
 
             os.remove(temp_archive_path)
 
@@ -221,7 +233,8 @@ class DownloadManager:
                 self.signals.finished.emit()
 
     def _download_file_with_progress(self, url, destination_path):
-        with requests.get(url, stream=True, headers={'User-Agent': BROWSER_USER_AGENT}) as r:
+        with operation("download", "network", detail=url) as op, \
+                requests.get(url, stream=True, headers={'User-Agent': BROWSER_USER_AGENT}) as r:
             r.raise_for_status()
             total_size = int(r.headers.get('content-length', 0))
             bytes_downloaded = 0
@@ -230,39 +243,39 @@ class DownloadManager:
                 for chunk in r.iter_content(chunk_size=1024 * 1024):
                     f.write(chunk)
                     bytes_downloaded += len(chunk)
+                    op.bytes = bytes_downloaded
                     if total_size > 0:
                         progress = (bytes_downloaded / total_size) * 100
                         self.signals.progress.emit(int(progress))
                         self.signals.progress_text.emit(f"{bytes_downloaded/1024/1024:.2f} MB / {total_size/1024/1024:.2f} MB")
 
     def _create_and_update_mod_info(self, mod_path, full_item_data, file_info, page_url):
-        """Creates or overwrites the info.json file with comprehensive data after download."""
+        """Fills in info.json with the downloaded item's details, keeping any other fields the mod ships."""
         if not os.path.isdir(mod_path): return
         try:
-            info_path = os.path.join(mod_path, "info.json")
-            
-            # Build the info dict from scratch using the rich data we have.
+            # Only these fields are set; everything else in info.json (e.g. "configuration") is kept.
+            current_info = Util.read_mod_info(mod_path)
             new_info = {
                 "name": full_item_data.get('_sName', os.path.basename(mod_path)),
-                "version": file_info.get('_sVersion') or full_item_data.get('_sVersion') or "1.0",
                 "author": full_item_data.get('_aSubmitter', {}).get('_sName', 'Unknown'),
-                "mod_page": page_url or "",
-                "mod_type": Util.read_mod_info(mod_path).get('mod_type', 'pak'), # Preserve auto-detected type
-                "replaced_files": Util.generate_mod_file_list(mod_path) # Generate file manifest
+                "mod_type": current_info.get('mod_type', 'pak'), # Preserve auto-detected type
             }
-
-            # If the parser exe is available, augment info.json with pak_data
+            # Don't blank out a version or page that is already known (or queued in the same batch).
+            version = file_info.get('_sVersion') or full_item_data.get('_sVersion')
+            if version or not current_info.get("version"):
+                new_info["version"] = version or "1.0"
+            if page_url:
+                new_info["mod_page"] = page_url
+
+            # Warm the central manifest cache so the first enable doesn't have to parse.
             try:
-                pak_data = PakInspector.generate_mod_pak_manifest(mod_path)
-                if pak_data:
-                    new_info['pak_data'] = pak_data
+                PakInspector.generate_mod_pak_manifest(mod_path)
             except Exception as e:
                 # Non-fatal: log warning and proceed without pak data
                 print(f"Warning: PakInspector failed for {os.path.basename(mod_path)}: {e}")
 
-            with open(info_path, "w", encoding="utf-8") as f:
-                json.dump(new_info, f, indent=2)
-            print(f"Generated info.json with {len(new_info['replaced_files'])} files for {new_info['name']}.")
+            mod_info_writer.update(mod_path, **new_info)
+            print(f"Updated info.json for {new_info['name']}.")
         except Exception as e:
             print(f"Could not update info.json for {os.path.basename(mod_path)}: {e}")
 
@@ -271,11 +284,7 @@ class DownloadManager:
         if not os.path.isdir(mod_path) or not version:
             return
         try:
-            info_path = os.path.join(mod_path, "info.json")
-            mod_info = Util.read_mod_info(mod_path)  # Handles non-existent files
-            mod_info['version'] = version
-            with open(info_path, "w", encoding="utf-8") as f:
-                json.dump(mod_info, f, indent=2)
+            mod_info_writer.update(mod_path, version=version)
         except Exception as e:
             print(f"Could not update version for {os.path.basename(mod_path)}: {e}")
 
@@ -284,10 +293,6 @@ class DownloadManager:
         if not os.path.isdir(mod_path) or not page_url:
             return
         try:
-            info_path = os.path.join(mod_path, "info.json")
-            mod_info = Util.read_mod_info(mod_path)  # Handles non-existent files
-            mod_info['mod_page'] = page_url
-            with open(info_path, "w", encoding="utf-8") as f:
-                json.dump(mod_info, f, indent=2)
+            mod_info_writer.update(mod_path, mod_page=page_url)
         except Exception as e:
-            print(f"Could not update mod page for {os.path.basename(mod_path)}: {e}")
\ No newline at end of file
+            print(f"Could not update mod page for {os.path.basename(mod_path)}: {e}")
@@ -1,7 +1,6 @@
 import sys
 import datetime
 import threading
-import requests
 from PySide6.QtWidgets import (
     QApplication, QDialog, QVBoxLayout, QLabel, QTextBrowser,
     QTreeWidget, QTreeWidgetItem, QPushButton, QSplitter, QDialogButtonBox, QHeaderView, QMessageBox,
@@ -9,6 +8,9 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QPixmap, QImage, QFont
 from PySide6.QtCore import Qt, Signal, QObject
+from LazyImport import lazy_module
+
+requests = lazy_module("requests")  # Imported on first image load
 
 class ImageLoader(QObject):
     """Worker object to load an image in a separate thread."""
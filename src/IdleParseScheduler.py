@@ -0,0 +1,131 @@
+"""
+Background pre-parsing of pak mods whose manifest is not cached yet.
+
+After startup, a refresh or a download the scheduler waits for the app to go
+quiet, then analyzes the missing manifests one mod at a time with a
+low-priority parser process. Deploys and downloads pause it; a parse that is
+running at that moment is cancelled and retried once the scheduler resumes.
+"""
+
+import os
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+import LibraryScanner
+import PakInspector
+
+IDLE_DELAY_MS = 5000
+
+
+class IdleParseScheduler(QObject):
+    """Parses unanalysed pak mods while CrossPatch is otherwise idle."""
+    progress = Signal(int, int, str)  # (done, total, mod_name)
+    finished = Signal(int)  # number of mods parsed in this run
+
+    def __init__(self, cfg, parent=None, idle_delay_ms=IDLE_DELAY_MS):
+        super().__init__(parent)
+        self.cfg = cfg
+        self.idle_delay_ms = idle_delay_ms
+        self._pause_reasons = set()
+        self._failed = set()  # mods whose parse failed this session; not retried
+        self._lock = threading.Lock()
+        self._running = False
+        self._rescan = False
+        self._cancel_event = threading.Event()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._start)
+
+    @property
+    def paused(self):
+        return bool(self._pause_reasons)
+
+    def schedule(self, delay_ms=None):
+        """(Re)starts the idle countdown. Call after startup, refreshes and downloads."""
+        if self.paused:
+            return
+        self._timer.start(self.idle_delay_ms if delay_ms is None else delay_ms)
+
+    def pause(self, reason):
+        """Stops background parsing until every pause reason has been resumed."""
+        self._pause_reasons.add(reason)
+        self._timer.stop()
+        self._cancel_event.set()
+
+    def resume(self, reason):
+        if reason not in self._pause_reasons:
+            return
+        self._pause_reasons.discard(reason)
+        if not self._pause_reasons:
+            self.schedule()
+
+    def stop(self):
+        """Cancels any running parse for good (e.g. on shutdown)."""
+        self.pause("shutdown")
+
+    def _start(self):
+        if self.paused:
+            return
+        with self._lock:
+            if self._running:
+                if self._cancel_event.is_set():
+                    # The previous run is still winding down after a pause.
+                    QTimer.singleShot(500, self._start)
+                else:
+                    self._rescan = True
+                return
+            self._running = True
+            self._rescan = False
+            self._cancel_event = threading.Event()
+            cancel_event = self._cancel_event
+        threading.Thread(target=self._worker, args=(cancel_event,), daemon=True, name="IdleParse").start()
+
+    def _find_unparsed(self):
+        mods_folder = self.cfg.get("mods_folder")
+        if not mods_folder or not os.path.isdir(mods_folder):
+            return []
+        snapshot = LibraryScanner.scan_library(mods_folder)
+        pending = []
+        for mod_name in sorted(snapshot.folders):
+            mod_path = os.path.join(mods_folder, mod_name)
+            if mod_path in self._failed:
+                continue
+            if snapshot.get(mod_name).mod_type != "pak":
+                continue
+            if PakInspector.get_cached_manifest(mod_path, include_index=False) is None:
+                pending.append((mod_path, mod_name))
+        return pending
+
+    def _worker(self, cancel_event):
+        parsed = 0
+        try:
+            while True:
+                pending = self._find_unparsed()
+                total = len(pending)
+                for done, (mod_path, mod_name) in enumerate(pending):
+                    if cancel_event.is_set():
+                        break
+                    self.progress.emit(done, total, mod_name)
+                    PakInspector.generate_mod_pak_manifest(mod_path, cancel_event=cancel_event, low_priority=True)
+                    if cancel_event.is_set():
+                        break  # Paused mid-parse; the mod is picked up again on resume.
+                    if PakInspector.get_cached_manifest(mod_path, include_index=False) is None:
+                        self._failed.add(mod_path)
+                    else:
+                        parsed += 1
+
+                # Mods may have appeared while we were busy; look again before exiting.
+                with self._lock:
+                    if cancel_event.is_set() or not self._rescan:
+                        self._running = False
+                        break
+                    self._rescan = False
+        except Exception as e:
+            print(f"Background pak analysis failed: {e}")
+            with self._lock:
+                self._running = False
+        if parsed:
+            print(f"Background pak analysis finished: {parsed} mod(s) analyzed.")
+        self.finished.emit(parsed)
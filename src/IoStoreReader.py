@@ -0,0 +1,261 @@
+"""
+Lightweight reader for Unreal Engine IoStore table-of-contents (.utoc) files.
+
+Only the TOC is read (memory-mapped); the .ucas payload is never opened. This
+lets CrossPatch list the assets of an IoStore mod without spinning up the
+CUE4Parse based CrossPatchParser tool.
+"""
+
+import mmap
+import os
+import struct
+from typing import Dict, List, Tuple
+
+TOC_MAGIC = b"-==--==--==--==-"
+
+# EIoStoreTocVersion
+TOC_VERSION_DIRECTORY_INDEX = 2
+TOC_VERSION_PARTITION_SIZE = 3
+TOC_VERSION_PERFECT_HASH = 4
+TOC_VERSION_PERFECT_HASH_WITH_OVERFLOW = 5
+
+# EIoContainerFlags
+CONTAINER_FLAG_COMPRESSED = 1 << 0
+CONTAINER_FLAG_ENCRYPTED = 1 << 1
+CONTAINER_FLAG_SIGNED = 1 << 2
+CONTAINER_FLAG_INDEXED = 1 << 3
+
+# FIoStoreTocHeader, 144 bytes
+_TOC_HEADER = struct.Struct("<16sBBH9IQ16sBBHIQII40s")
+_INVALID_INDEX = 0xFFFFFFFF
+_CHUNK_ID_SIZE = 12
+_OFFSET_AND_LENGTH_SIZE = 10
+_SHA_HASH_SIZE = 20
+
+
+class IoStoreError(ValueError):
+    """Raised when a .utoc file cannot be indexed by this reader."""
+
+
+class IoStoreToc:
+    """The parts of a .utoc file CrossPatch cares about."""
+
+    def __init__(self, utoc_path: str, version: int, container_flags: int, mount_point: str,
+                 entries: List[Tuple[str, int, int, int]]):
+        self.utoc_path = utoc_path
+        self.version = version
+        self.container_flags = container_flags
+        self.mount_point = mount_point
+        # (asset path, uncompressed size, compressed size, offset in container)
+        self.entries = entries
+
+    @property
+    def total_size(self) -> int:
+        return sum(e[1] for e in self.entries)
+
+
+class _Cursor:
+    """Sequential little-endian reader over a memoryview."""
+
+    def __init__(self, view, pos=0):
+        self.view = view
+        self.pos = pos
+
+    def take(self, size: int):
+        end = self.pos + size
+        if size < 0 or end > len(self.view):
+            raise IoStoreError("Unexpected end of TOC data")
+        chunk = self.view[self.pos:end]
+        self.pos = end
+        return chunk
+
+    def skip(self, size: int):
+        self.take(size)
+
+    def u32(self) -> int:
+        return int.from_bytes(self.take(4), "little")
+
+    def i32(self) -> int:
+        return int.from_bytes(self.take(4), "little", signed=True)
+
+    def fstring(self) -> str:
+        length = self.i32()
+        if length == 0:
+            return ""
+        if length > 0:
+            raw = bytes(self.take(length))
+            return raw.rstrip(b"\x00").decode("utf-8", errors="replace")
+        raw = bytes(self.take(-length * 2))
+        return raw.decode("utf-16-le", errors="replace").rstrip("\x00")
+
+    def u32_triplets(self, count: int, width: int):
+        """Reads `count` records of `width` uint32 values each."""
+        if count < 0:
+            raise IoStoreError("Negative array length in directory index")
+        raw = self.take(count * width * 4)
+        values = struct.unpack(f"<{count * width}I", raw)
+        return [values[i:i + width] for i in range(0, len(values), width)]
+
+
+def _normalize_mount_point(mount_point: str) -> str:
+    """Mirrors CUE4Parse: '../../../UNION/Content/' becomes 'UNION/Content/'."""
+    mount_point = mount_point.replace("\\", "/")
+    if mount_point.startswith("../../.."):
+        mount_point = mount_point[len("../../.."):]
+    mount_point = mount_point.lstrip("/")
+    if mount_point and not mount_point.endswith("/"):
+        mount_point += "/"
+    return mount_point
+
+
+def _read_directory_index(view) -> Tuple[str, List[Tuple[str, int]]]:
+    """Decodes an FIoDirectoryIndexResource into (mount point, [(path, toc index)])."""
+    cur = _Cursor(view)
+    mount_point = _normalize_mount_point(cur.fstring())
+    directories = cur.u32_triplets(cur.i32(), 4)  # name, first child, next sibling, first file
+    files = cur.u32_triplets(cur.i32(), 3)        # name, next file, user data (toc index)
+    string_count = cur.i32()
+    if string_count < 0:
+        raise IoStoreError("Negative string table length in directory index")
+    strings = [cur.fstring() for _ in range(string_count)]
+
+    def name_of(index):
+        if index == _INVALID_INDEX or index >= len(strings):
+            return None
+        return strings[index]
+
+    result = []
+    if not directories:
+        return mount_point, result
+
+    # Iterative walk; each stack entry is (directory index, path prefix).
+    stack = [(0, "")]
+    visited = set()
+    while stack:
+        dir_index, prefix = stack.pop()
+        if dir_index in visited or dir_index >= len(directories):
+            continue
+        visited.add(dir_index)
+        _, first_child, _, first_file = directories[dir_index]
+
+        file_index = first_file
+        while file_index != _INVALID_INDEX and file_index < len(files):
+            name_index, next_file, toc_index = files[file_index]
+            name = name_of(name_index)
+            if name is not None:
+                result.append((prefix + name, toc_index))
+            file_index = next_file
+
+        child = first_child
+        while child != _INVALID_INDEX and child < len(directories):
+            child_name = name_of(directories[child][0])
+            child_prefix = prefix + child_name + "/" if child_name else prefix
+            stack.append((child, child_prefix))
+            child = directories[child][2]
+
+    return mount_point, result
+
+
+def read_utoc(utoc_path: str) -> IoStoreToc:
+    """
+    Reads the header, chunk offsets and directory index of a .utoc file.
+
+    Raises:
+        IoStoreError: If the file is not a .utoc, has no directory index, or its
+            index is encrypted (those containers need the full parser).
+    """
+    with open(utoc_path, "rb") as f:
+        if os.fstat(f.fileno()).st_size < _TOC_HEADER.size:
+            raise IoStoreError(f"{os.path.basename(utoc_path)} is too small to be a .utoc file")
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return _parse_toc(utoc_path, view)
+            finally:
+                view.release()
+
+
+def _parse_toc(utoc_path: str, view) -> IoStoreToc:
+    (magic, version, _, _, header_size, entry_count, block_count, block_entry_size,
+     method_count, method_length, block_size, dir_index_size, _, _, _,
+     container_flags, _, _, hash_seed_count, _, no_hash_count, _, _) = _TOC_HEADER.unpack_from(view, 0)
+
+    if magic != TOC_MAGIC:
+        raise IoStoreError(f"{os.path.basename(utoc_path)} is not an IoStore TOC")
+    if version < TOC_VERSION_DIRECTORY_INDEX or not container_flags & CONTAINER_FLAG_INDEXED or dir_index_size == 0:
+        raise IoStoreError(f"{os.path.basename(utoc_path)} has no directory index")
+    if container_flags & CONTAINER_FLAG_ENCRYPTED:
+        raise IoStoreError(f"{os.path.basename(utoc_path)} has an encrypted directory index")
+
+    cur = _Cursor(view, header_size)
+    cur.skip(entry_count * _CHUNK_ID_SIZE)
+    offsets_view = cur.take(entry_count * _OFFSET_AND_LENGTH_SIZE)
+    if version >= TOC_VERSION_PERFECT_HASH:
+        cur.skip(hash_seed_count * 4)
+    if version >= TOC_VERSION_PERFECT_HASH_WITH_OVERFLOW:
+        cur.skip(no_hash_count * 4)
+    blocks_view = cur.take(block_count * block_entry_size)
+    cur.skip(method_count * method_length)
+    if container_flags & CONTAINER_FLAG_SIGNED:
+        hash_size = cur.i32()
+        cur.skip(hash_size * 2 + block_count * _SHA_HASH_SIZE)
+    mount_point, indexed_files = _read_directory_index(cur.take(dir_index_size))
+
+    # Prefix sums over the compressed block sizes let us total the compressed
+    # size of any chunk in O(1).
+    compressed_prefix = [0] * (block_count + 1)
+    running = 0
+    for i in range(block_count):
+        base = i * block_entry_size
+        running += int.from_bytes(blocks_view[base + 5:base + 8], "little")
+        compressed_prefix[i + 1] = running
+
+    entries = []
+    for rel_path, toc_index in indexed_files:
+        if toc_index >= entry_count:
+            continue
+        base = toc_index * _OFFSET_AND_LENGTH_SIZE
+        offset = int.from_bytes(offsets_view[base:base + 5], "big")
+        length = int.from_bytes(offsets_view[base + 5:base + 10], "big")
+        compressed_size = length
+        if block_size and block_count:
+            first_block = offset // block_size
+            last_block = min((offset + max(length, 1) - 1) // block_size + 1, block_count)
+            if first_block < last_block:
+                compressed_size = compressed_prefix[last_block] - compressed_prefix[first_block]
+        entries.append((mount_point + rel_path, length, compressed_size, offset))
+
+    return IoStoreToc(utoc_path, version, container_flags, mount_point, entries)
+
+
+def pair_containers(paths: List[str]) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """
+    Pairs .utoc/.ucas files from a list of archive paths.
+
+    Returns:
+        A tuple ([(utoc_path, ucas_path), ...], [standalone_pak_path, ...]). A
+        .pak sharing its base name with a .utoc is the container's companion
+        stub and is not reported as standalone.
+    """
+    utocs: Dict[str, str] = {}
+    ucases: Dict[str, str] = {}
+    paks: List[str] = []
+    for path in paths:
+        key, ext = os.path.splitext(path)
+        ext = ext.lower()
+        if ext == ".utoc":
+            utocs[key] = path
+        elif ext == ".ucas":
+            ucases[key] = path
+        elif ext == ".pak":
+            paks.append(path)
+
+    containers = [(utoc, ucases[key]) for key, utoc in sorted(utocs.items()) if key in ucases]
+    standalone_paks = [p for p in paks if os.path.splitext(p)[0] not in utocs]
+    return containers, standalone_paks
+
+
+def find_iostore_containers(mod_path: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+    """Walks a mod folder and pairs its IoStore containers (see pair_containers)."""
+    paths = [os.path.join(root, name) for root, _, files in os.walk(mod_path) for name in files]
+    return pair_containers(paths)
@@ -0,0 +1,57 @@
+"""
+Deferred imports for heavy modules that most sessions never touch.
+
+`requests` alone adds over 100 ms to startup, yet the Installed Mods tab
+doesn't need the network. A lazy module stands in for the real one and
+imports it on first attribute access, so call sites stay unchanged:
+
+    requests = lazy_module("requests")
+    ...
+    requests.get(url)  # imported here, the first time
+
+Optional modules are probed with `module_available`, which looks the module
+up without importing it.
+"""
+
+import importlib
+import importlib.util
+import threading
+import types
+
+
+class _LazyModule(types.ModuleType):
+    """Placeholder that imports the named module when one of its attributes is first used."""
+
+    def __init__(self, name: str):
+        super().__init__(name)
+        self.__dict__["_lazy_lock"] = threading.Lock()
+        self.__dict__["_lazy_module"] = None
+
+    def _load(self):
+        module = self.__dict__["_lazy_module"]
+        if module is None:
+            with self.__dict__["_lazy_lock"]:
+                module = self.__dict__["_lazy_module"]
+                if module is None:
+                    module = importlib.import_module(self.__name__)
+                    self.__dict__["_lazy_module"] = module
+        return module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+
+def lazy_module(name: str) -> types.ModuleType:
+    """A stand-in for module `name` that imports it on first use."""
+    return _LazyModule(name)
+
+
+def module_available(name: str) -> bool:
+    """True if module `name` can be imported, without importing it."""
+    try:
+        return importlib.util.find_spec(name) is not None
+    except (ImportError, ValueError):
+        return False
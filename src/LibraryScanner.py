@@ -0,0 +1,217 @@
+"""
+Single-pass scanner for the mods folder.
+
+`scan_library()` walks the mods folder with os.scandir once and collects
+everything the refresh, tree and update-check paths need about each mod: its
+info.json data (reused from the catalog when the file's mtime is unchanged),
+its detected type and whether it ships file-based configuration. The result
+is an immutable LibrarySnapshot that all of those paths share, instead of
+each one listing and stat-ing the same directories again.
+"""
+
+import json
+import os
+import time
+from types import MappingProxyType
+from typing import Dict, Iterator, Mapping, NamedTuple, Optional, Tuple
+
+import ModCatalog
+from Profiler import profiled
+
+
+class ModEntry(NamedTuple):
+    """What a scan found out about one mod folder. Treat `info` as read-only."""
+    folder: str
+    path: str
+    info: Mapping
+    info_mtime_ns: Optional[int]  # None when the mod has no info.json
+    detected_type: str            # from the folder layout (LogicMods/Scripts)
+    has_config: bool
+
+    @property
+    def mod_type(self) -> str:
+        return self.info.get("mod_type", self.detected_type)
+
+
+class LibrarySnapshot:
+    """Immutable view of a mods folder at one point in time."""
+
+    __slots__ = ("mods_folder", "scanned_at", "changed", "_entries")
+
+    def __init__(self, mods_folder: str, entries: Dict[str, ModEntry], changed: bool = False):
+        object.__setattr__(self, "mods_folder", mods_folder)
+        object.__setattr__(self, "scanned_at", time.time())
+        # True if the scan found anything the catalog did not know about yet.
+        object.__setattr__(self, "changed", changed)
+        object.__setattr__(self, "_entries", MappingProxyType(dict(entries)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("LibrarySnapshot is immutable")
+
+    def __contains__(self, folder) -> bool:
+        return folder in self._entries
+
+    def __iter__(self) -> Iterator[ModEntry]:
+        return iter(self._entries.values())
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def folders(self) -> Tuple[str, ...]:
+        return tuple(self._entries)
+
+    def get(self, folder: str) -> Optional[ModEntry]:
+        return self._entries.get(folder)
+
+    def info(self, folder: str) -> Mapping:
+        entry = self._entries.get(folder)
+        return entry.info if entry else MappingProxyType({})
+
+
+def _detect_type(names: Dict[str, bool]) -> str:
+    if names.get("LogicMods"):
+        return "ue4ss-logic"
+    if names.get("Scripts"):
+        return "ue4ss-script"
+    return "pak"
+
+
+def _has_config(category_paths) -> bool:
+    """
+    Same rule as Util.has_file_based_configuration_quick: a category folder
+    with at least two option folders containing a desc.ini.
+    """
+    for category_path in category_paths:
+        valid_options = 0
+        try:
+            with os.scandir(category_path) as options:
+                for option in options:
+                    if option.is_dir() and os.path.exists(os.path.join(option.path, "desc.ini")):
+                        valid_options += 1
+                        if valid_options >= 2:
+                            return True
+        except OSError:
+            continue
+    return False
+
+
+def _read_info(info_path: str) -> Optional[Dict]:
+    try:
+        with open(info_path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else None
+    except Exception:
+        return None
+
+
+def scan_mod(mod_path: str, known: Optional[Dict[str, Tuple[Optional[int], Dict]]] = None) -> ModEntry:
+    """Scans a single mod folder. `known` maps folder -> (info mtime, info) to skip re-reading."""
+    folder = os.path.basename(os.path.abspath(mod_path))
+    names = {}
+    subdirs = []
+    info_mtime_ns = None
+    try:
+        with os.scandir(mod_path) as children:
+            for child in children:
+                is_dir = child.is_dir()
+                names[child.name] = is_dir
+                if is_dir:
+                    subdirs.append(child.path)
+                elif child.name.lower() == "info.json":
+                    info_mtime_ns = child.stat().st_mtime_ns
+    except OSError:
+        pass
+
+    detected_type = _detect_type(names)
+    info = None
+    cached = (known or {}).get(folder)
+    if info_mtime_ns is not None:
+        if cached and cached[0] == info_mtime_ns:
+            info = cached[1]
+        else:
+            info_path = os.path.join(mod_path, "info.json")
+            info = _read_info(info_path)
+            if info is not None:
+                # Legacy manifests are left to Util.migrate_legacy_pak_data.
+                info.pop("pak_data", None)
+    if info is None:
+        # No (readable) info.json: same defaults as Util.read_mod_info.
+        info_mtime_ns = None
+        info = {"name": folder, "version": "1.0", "author": "Unknown", "mod_type": detected_type}
+
+    has_config = "configuration" in info or _has_config(subdirs)
+    return ModEntry(folder, mod_path, MappingProxyType(info), info_mtime_ns, detected_type, has_config)
+
+
+@profiled("scan_library")
+def scan_library(mods_folder: str, catalog: Optional["ModCatalog.ModCatalog"] = None) -> LibrarySnapshot:
+    """
+    Scans the mods folder and updates the catalog from the result.
+
+    info.json files whose mtime matches the catalog are not opened again.
+    """
+    catalog = catalog or ModCatalog.catalog
+    known = catalog.known_infos(mods_folder)
+    entries = {}
+    try:
+        with os.scandir(mods_folder) as it:
+            for entry in it:
+                if entry.is_dir():
+                    entries[entry.name] = scan_mod(entry.path, known)
+    except OSError:
+        pass
+
+    changed = catalog.apply_entries(mods_folder, entries.values())
+    return LibrarySnapshot(mods_folder, entries, changed)
+
+
+def update_snapshot(snapshot: LibrarySnapshot, folders, rescan_listing: bool = False,
+                    catalog: Optional["ModCatalog.ModCatalog"] = None) -> LibrarySnapshot:
+    """
+    Re-scans only the given mod folders of `snapshot` and returns the updated
+    snapshot. With rescan_listing=True the mods folder itself is listed again
+    to pick up mods that were added or removed.
+    """
+    catalog = catalog or ModCatalog.catalog
+    mods_folder = snapshot.mods_folder
+    known = {entry.folder: (entry.info_mtime_ns, entry.info) for entry in snapshot}
+    to_scan = set(folders)
+    removed = set()
+    if rescan_listing:
+        on_disk = set()
+        try:
+            with os.scandir(mods_folder) as it:
+                on_disk = {entry.name for entry in it if entry.is_dir()}
+        except OSError:
+            pass
+        to_scan |= on_disk - set(known)
+        removed = set(known) - on_disk
+
+    entries = {entry.folder: entry for entry in snapshot}
+    scanned = []
+    for folder in to_scan:
+        mod_path = os.path.join(mods_folder, folder)
+        if not os.path.isdir(mod_path):
+            removed.add(folder)
+            continue
+        entries[folder] = scan_mod(mod_path, known)
+        scanned.append(entries[folder])
+    for folder in removed:
+        entries.pop(folder, None)
+
+    changed = catalog.apply_entries(mods_folder, scanned, removed)
+    return LibrarySnapshot(mods_folder, entries, changed)
+
+
+def cached_snapshot(mods_folder: str, catalog: Optional["ModCatalog.ModCatalog"] = None) -> LibrarySnapshot:
+    """
+    A snapshot built from the catalog alone (one query, no disk access), for
+    the first paint before a real scan has run.
+    """
+    catalog = catalog or ModCatalog.catalog
+    entries = {}
+    for folder, (info_mtime_ns, info, detected_type, has_config) in catalog.known_entries(mods_folder).items():
+        entries[folder] = ModEntry(folder, os.path.join(mods_folder, folder), MappingProxyType(info),
+                                   info_mtime_ns, detected_type, has_config)
+    return LibrarySnapshot(mods_folder, entries)
@@ -1,19 +1,26 @@
+import time
+STARTED_AT = time.perf_counter()  # Time-to-first-paint is measured from here
+
 import threading
 import socket
 import sys
 import os
 
-from PySide6.QtWidgets import QApplication
+from PySide6.QtWidgets import QApplication, QMessageBox
 from CrossPatch import CrossPatchWindow
 import Util
-import Config # This will now set up config paths on import
-import PakInspector
+from RuntimeProbe import RuntimeProbe
+from StartupMetrics import FirstPaintTimer
+import Profiler
+from StallMonitor import stall_monitor
 import webbrowser
-import subprocess
 import platform
 
 SINGLE_INSTANCE_PORT = 38471 # A random, hopefully unused port
 if __name__ == "__main__":
+    # Profiler has already read --profile; keep it from being taken for a protocol URL.
+    sys.argv = [arg for arg in sys.argv if arg != Profiler.PROFILE_FLAG]
+
     # Try to bind to a port to enforce a single instance
     try:
         sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
@@ -35,8 +42,6 @@ if __name__ == "__main__":
         sys.exit(0)
 
     # This is the primary instance.
-    Config.register_url_protocol()
-
     app = QApplication(sys.argv)
     # Apply a dark theme
     try:
@@ -46,34 +51,12 @@ if __name__ == "__main__":
         print("qdarktheme not found. Using default system theme.")
 
     # --- Ensure .NET 8 runtime is available for the pak parser ---
-    def _has_dotnet_8():
-        """Return True if a .NET runtime 8.x is present (checked via `dotnet --list-runtimes`)."""
-        try:
-            proc = subprocess.run(["dotnet", "--list-runtimes"], capture_output=True, text=True, check=True, timeout=5)
-            out = proc.stdout + proc.stderr
-            # Look for Microsoft.NETCore.App 8.* or similar runtime entries
-            for line in out.splitlines():
-                if "Microsoft.NETCore.App" in line or "Microsoft.AspNetCore.App" in line:
-                    # line format: Name Version [path]
-                    parts = line.strip().split()
-                    if len(parts) >= 2:
-                        ver = parts[1]
-                        if ver.startswith("8.") or ver.startswith("8"):
-                            return True
-            return False
-        except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
-            return False
-
-    # If we have a self-contained parser executable for this platform, the
-    # .NET runtime is not required. Only prompt for dotnet if no native parser
-    # is present.
-    if not _has_dotnet_8() and not getattr(PakInspector, 'self_contained_parser_available', lambda: False)():
-        # Prompt the user to install .NET 8 before proceeding. We show this
-        # dialog before creating the main window so the user must choose.
-        from PySide6.QtWidgets import QMessageBox
-
+    def _on_runtime_probe_finished(available):
+        """Prompts to install .NET 8 and exits when the parser has no runtime to run on."""
+        if available:
+            return
         reply = QMessageBox.question(
-            None,
+            window,
             "Missing .NET Runtime",
             "CrossPatch requires the .NET 8 runtime to analyze pak files.\n\nWould you like to open the .NET 8 download page now?\n\n(If you choose No, the application will exit.)",
             QMessageBox.Yes | QMessageBox.No,
@@ -95,7 +78,12 @@ if __name__ == "__main__":
                 pass
             webbrowser.open(runtime_url)
         print(".NET 8 runtime not detected; exiting.")
-        sys.exit(1)
+        app.exit(1)
+
+    def _register_url_protocol(_elapsed_ms=None):
+        """Writes the crosspatch:// registry keys; nothing on screen depends on it."""
+        import Config
+        Config.register_url_protocol()
 
     window = CrossPatchWindow(instance_socket=sock)
 
@@ -110,5 +98,15 @@ if __name__ == "__main__":
     else:
         print("Auto-updater is disabled via CROSSPATCH_DISABLE_UPDATES environment variable.")
 
+    first_paint_timer = FirstPaintTimer(window, STARTED_AT)
+    first_paint_timer.finished.connect(_register_url_protocol)
     window.show()
+    # Records every time the event loop freezes (see Settings > UI Stalls).
+    stall_monitor.start()
+
+    # The runtime check (cached across runs) happens while the mod list is already on screen.
+    runtime_probe = RuntimeProbe()
+    runtime_probe.finished.connect(_on_runtime_probe_finished)
+    runtime_probe.start()
+
     sys.exit(app.exec())
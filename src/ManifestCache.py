@@ -0,0 +1,226 @@
+"""
+Central cache of pak manifests, kept in CONFIG_DIR instead of each mod's info.json.
+
+Manifests are stored per mod and split into groups of archives (one group per
+IoStore container, or a single group for everything the external parser has to
+handle). Each group is keyed by the fingerprints of its archives, so only the
+groups whose archives changed need to be parsed again. Looking a mod up needs
+only a stat of its archives and an in-memory dict lookup; the mod's info.json
+is never read.
+
+The manifests themselves are stored in the binary columnar format of
+PakManifestFile, one file per mod, next to a small JSON index.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+import PakManifestFile
+from Config import CONFIG_DIR
+
+CACHE_DIR = os.path.join(CONFIG_DIR, "manifest_cache")
+INDEX_PATH = os.path.join(CACHE_DIR, "index.json")
+ARCHIVE_EXTENSIONS = ('.pak', '.utoc', '.ucas')
+MAX_OPEN_FILES = 32  # Manifest files kept memory-mapped at once
+
+# Opt-in content sampling for file systems with unreliable mtimes.
+USE_FAST_HASH = os.environ.get("CROSSPATCH_MANIFEST_HASH") == "1"
+_HASH_SAMPLE_BYTES = 64 * 1024
+
+
+def fast_hash(path: str) -> str:
+    """Hashes the size plus the first and last 64 KB of a file."""
+    h = hashlib.blake2b(digest_size=16)
+    size = os.path.getsize(path)
+    h.update(size.to_bytes(8, "little"))
+    with open(path, "rb") as f:
+        h.update(f.read(_HASH_SAMPLE_BYTES))
+        if size > _HASH_SAMPLE_BYTES:
+            f.seek(max(size - _HASH_SAMPLE_BYTES, _HASH_SAMPLE_BYTES))
+            h.update(f.read(_HASH_SAMPLE_BYTES))
+    return h.hexdigest()
+
+
+def archive_fingerprints(mod_path: str, with_hash: Optional[bool] = None) -> Dict[str, list]:
+    """
+    Returns {relative archive path: [size, mtime_ns, fast hash or None]} for
+    every .pak/.utoc/.ucas in a mod folder. Paths use '/' separators.
+    """
+    if with_hash is None:
+        with_hash = USE_FAST_HASH
+    fingerprints = {}
+    for root, _, files in os.walk(mod_path):
+        for name in files:
+            if not name.lower().endswith(ARCHIVE_EXTENSIONS):
+                continue
+            full = os.path.join(root, name)
+            try:
+                st = os.stat(full)
+            except OSError:
+                continue
+            rel = os.path.relpath(full, mod_path).replace("\\", "/")
+            fingerprints[rel] = [st.st_size, st.st_mtime_ns, fast_hash(full) if with_hash else None]
+    return fingerprints
+
+
+def _mod_key(mod_path: str) -> str:
+    return os.path.normcase(os.path.abspath(mod_path))
+
+
+def _atomic_write_json(path: str, data) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f)
+    os.replace(tmp_path, path)
+
+
+def assemble_manifest(parts: Dict[str, Dict]) -> Dict:
+    """
+    Joins per-group partial manifests into the usual pak_data dict. The
+    files_index key is left out when the parts were loaded without it.
+    """
+    pak_files: List[Dict] = []
+    files_index: List[Dict] = []
+    for key in sorted(parts):
+        pak_files.extend(parts[key].get("pak_files", []))
+        files_index.extend(parts[key].get("files_index", []))
+    manifest = {
+        "pak_files": pak_files,
+        "total_files": sum(int(p.get("file_count") or 0) for p in pak_files),
+        "total_size": sum(int(p.get("total_size") or 0) for p in pak_files),
+    }
+    if not parts or any("files_index" in part for part in parts.values()):
+        manifest["files_index"] = files_index
+    return manifest
+
+
+class ManifestCache:
+    """
+    Thread-safe store of per-group pak manifests.
+
+    index.json maps each mod to the fingerprints of its archive groups and to
+    the manifest file holding its parts. The MAX_OPEN_FILES most recently
+    used manifest files stay memory-mapped; columns are decoded on demand.
+    """
+
+    def __init__(self, cache_dir: str = CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.index_path = os.path.join(cache_dir, "index.json")
+        self._lock = threading.RLock()
+        self._index = None
+        self._files: "OrderedDict[str, PakManifestFile.ManifestFile]" = OrderedDict()  # mod_key -> open file, LRU order
+
+    def _load_index(self) -> Dict:
+        if self._index is None:
+            try:
+                with open(self.index_path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._index = data if isinstance(data, dict) else {}
+            except Exception:
+                self._index = {}
+        return self._index
+
+    def _parts_file(self, key: str) -> str:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=12).hexdigest()
+        return f"{digest}{PakManifestFile.FILE_EXTENSION}"
+
+    def _open_file(self, key: str, entry: Dict) -> Optional[PakManifestFile.ManifestFile]:
+        manifest_file = self._files.get(key)
+        if manifest_file is not None:
+            self._files.move_to_end(key)
+        else:
+            if not entry.get("file", "").endswith(PakManifestFile.FILE_EXTENSION):
+                return None  # Written by an older CrossPatch; re-parse.
+            try:
+                manifest_file = PakManifestFile.ManifestFile(os.path.join(self.cache_dir, entry["file"]))
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable manifest cache file {entry['file']}: {e}")
+                return None
+            self._files[key] = manifest_file
+            while len(self._files) > MAX_OPEN_FILES:
+                _, evicted = self._files.popitem(last=False)
+                evicted.close()
+        return manifest_file
+
+    def _close_file(self, key: str) -> None:
+        manifest_file = self._files.pop(key, None)
+        if manifest_file is not None:
+            manifest_file.close()
+
+    def lookup(self, mod_path: str, groups: Dict[str, Dict[str, list]], include_index: bool = True) -> Dict[str, Dict]:
+        """
+        Returns the cached partial manifests for every group in `groups`
+        ({group_key: {rel_path: fingerprint}}) whose fingerprints still match.
+        Stale or unknown groups are simply absent from the result. Pass
+        include_index=False to skip decoding the per-asset files_index.
+        """
+        key = _mod_key(mod_path)
+        with self._lock:
+            entry = self._load_index().get(key)
+            if not entry:
+                return {}
+            stored_groups = entry.get("groups", {})
+            valid = [g for g, archives in groups.items() if stored_groups.get(g) == archives]
+            if not valid:
+                return {}
+            manifest_file = self._open_file(key, entry)
+            if manifest_file is None:
+                return {}
+            try:
+                return manifest_file.parts(valid, include_index=include_index)
+            except (OSError, ValueError) as e:
+                print(f"Ignoring unreadable manifest cache file {entry['file']}: {e}")
+                self._close_file(key)
+                return {}
+
+    def has_group(self, mod_path: str, group: str, archives: Dict[str, list]) -> bool:
+        """True if `group` is cached for the mod with exactly these archive fingerprints."""
+        with self._lock:
+            entry = self._load_index().get(_mod_key(mod_path))
+            return bool(entry) and entry.get("groups", {}).get(group) == archives
+
+    def store(self, mod_path: str, groups: Dict[str, Dict[str, list]], parts: Dict[str, Dict]) -> None:
+        """Replaces a mod's cached groups. Groups not listed in `groups` are dropped."""
+        key = _mod_key(mod_path)
+        with self._lock:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            index = self._load_index()
+            old_entry = index.get(key) or {}
+            entry = {"file": self._parts_file(key)}
+            kept_parts = {g: parts[g] for g in groups if g in parts}
+            entry["groups"] = {g: groups[g] for g in kept_parts}
+            self._close_file(key)
+            PakManifestFile.write_manifest(os.path.join(self.cache_dir, entry["file"]), kept_parts)
+            if old_entry.get("file") and old_entry["file"] != entry["file"]:
+                try:
+                    os.remove(os.path.join(self.cache_dir, old_entry["file"]))
+                except OSError:
+                    pass
+            index[key] = entry
+            _atomic_write_json(self.index_path, index)
+
+    def invalidate(self, mod_path: str) -> None:
+        """Forgets everything cached for a mod."""
+        key = _mod_key(mod_path)
+        with self._lock:
+            index = self._load_index()
+            entry = index.pop(key, None)
+            self._close_file(key)
+            if entry is None:
+                return
+            try:
+                os.remove(os.path.join(self.cache_dir, entry["file"]))
+            except OSError:
+                pass
+            try:
+                _atomic_write_json(self.index_path, index)
+            except OSError:
+                pass
+
+
+# Shared instance used by PakInspector and the UI.
+manifest_cache = ManifestCache()
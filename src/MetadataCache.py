@@ -0,0 +1,134 @@
+"""
+Thread-safe, bounded cache for parsed metadata files such as info.json.
+
+Keys are spread over several independently locked stripes, so workers reading
+different mods don't contend on a single lock. Each stripe is an LRU of its
+share of `max_entries`. Concurrent misses for the same key share a single
+load ("single flight"), and cached values are frozen (read-only mappings and
+tuples) so no caller can change an entry other threads are reading; use
+`thaw()` to get a mutable copy.
+"""
+
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Any, Callable, Hashable, Tuple
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_STRIPES = 16
+
+
+def freeze(value):
+    """Recursively converts dicts to read-only mappings and lists to tuples."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return MappingProxyType({k: freeze(v) for k, v in value.items()})
+    if isinstance(value, (list, tuple)):
+        return tuple(freeze(v) for v in value)
+    return value
+
+
+def thaw(value):
+    """Mutable (JSON-serializable) deep copy of a frozen value."""
+    if isinstance(value, (dict, MappingProxyType)):
+        return {k: thaw(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [thaw(v) for v in value]
+    return value
+
+
+class _Flight:
+    __slots__ = ("version", "done", "value", "error")
+
+    def __init__(self, version):
+        self.version = version
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class _Stripe:
+    __slots__ = ("lock", "entries", "flights")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.entries: "OrderedDict[Hashable, Tuple[Any, Any]]" = OrderedDict()  # key -> (version, value)
+        self.flights = {}
+
+
+class MetadataCache:
+    """
+    Caches `loader(key) -> (version, value)` results, validated by a version
+    (e.g. an mtime) that the caller supplies on each lookup.
+    """
+
+    def __init__(self, loader: Callable[[Hashable], Tuple[Any, Any]],
+                 max_entries: int = DEFAULT_MAX_ENTRIES, stripes: int = DEFAULT_STRIPES):
+        self._loader = loader
+        self._stripes = [_Stripe() for _ in range(stripes)]
+        self._stripe_capacity = max(1, max_entries // stripes)
+
+    def _stripe(self, key) -> _Stripe:
+        return self._stripes[hash(key) % len(self._stripes)]
+
+    def get(self, key, version):
+        """
+        The frozen value for `key` if it was cached at `version`; otherwise it
+        is loaded (once, however many threads ask for it at the same time).
+        """
+        stripe = self._stripe(key)
+        with stripe.lock:
+            cached = stripe.entries.get(key)
+            if cached is not None and cached[0] == version:
+                stripe.entries.move_to_end(key)
+                return cached[1]
+            flight = stripe.flights.get(key)
+            leader = flight is None or flight.version != version
+            if leader:
+                flight = _Flight(version)
+                stripe.flights[key] = flight
+
+        if not leader:
+            flight.done.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            loaded_version, value = self._loader(key)
+            flight.value = freeze(value)
+            self._store(stripe, key, loaded_version, flight.value)
+        except BaseException as e:
+            flight.error = e
+            raise
+        finally:
+            with stripe.lock:
+                if stripe.flights.get(key) is flight:
+                    del stripe.flights[key]
+            flight.done.set()
+        return flight.value
+
+    def put(self, key, version, value):
+        """Stores a value that was just written, so the next read needn't load it. Returns the frozen value."""
+        frozen = freeze(value)
+        self._store(self._stripe(key), key, version, frozen)
+        return frozen
+
+    def _store(self, stripe: _Stripe, key, version, frozen):
+        with stripe.lock:
+            stripe.entries[key] = (version, frozen)
+            stripe.entries.move_to_end(key)
+            while len(stripe.entries) > self._stripe_capacity:
+                stripe.entries.popitem(last=False)
+
+    def invalidate(self, key):
+        stripe = self._stripe(key)
+        with stripe.lock:
+            stripe.entries.pop(key, None)
+
+    def clear(self):
+        for stripe in self._stripes:
+            with stripe.lock:
+                stripe.entries.clear()
+
+    def __len__(self):
+        return sum(len(stripe.entries) for stripe in self._stripes)
@@ -0,0 +1,390 @@
+"""
+SQLite catalog of installed mods, kept in CONFIG_DIR.
+
+The catalog mirrors each mod's info.json (validated by mtime), the archives it
+ships, the assets listed in its pak manifest, its GameBanana id and the
+directory nodes of its Merkle fingerprint (see ModFingerprint) and its
+discovered file-based configuration (see ConfigDiscovery). Hot paths
+such as the mod list, update checks and conflict checks query it instead of
+opening every info.json. It is kept up to date from LibraryScanner snapshots,
+which re-read only the info.json files whose mtime changed.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from Config import CONFIG_DIR
+
+CATALOG_PATH = os.path.join(CONFIG_DIR, "catalog.sqlite3")
+SCHEMA_VERSION = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS mods (
+    mod_key TEXT PRIMARY KEY,       -- normalised absolute mod path
+    parent TEXT NOT NULL,           -- normalised absolute mods folder
+    folder TEXT NOT NULL,
+    info_mtime_ns INTEGER,          -- NULL when the mod has no info.json
+    name TEXT,
+    version TEXT,
+    author TEXT,
+    mod_type TEXT,
+    mod_page TEXT,
+    detected_type TEXT NOT NULL DEFAULT 'pak',
+    has_config INTEGER NOT NULL DEFAULT 0,
+    info_json TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS mods_by_parent ON mods(parent, folder);
+
+CREATE TABLE IF NOT EXISTS archives (
+    mod_key TEXT NOT NULL,
+    rel_path TEXT NOT NULL,
+    size INTEGER,
+    mtime_ns INTEGER,
+    PRIMARY KEY (mod_key, rel_path)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS assets (
+    mod_key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    pak_name TEXT NOT NULL,
+    PRIMARY KEY (mod_key, path, pak_name)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS assets_by_path ON assets(path);
+
+CREATE TABLE IF NOT EXISTS gamebanana (
+    mod_key TEXT PRIMARY KEY,
+    item_type TEXT NOT NULL,
+    item_id INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS gamebanana_by_item ON gamebanana(item_type, item_id);
+
+CREATE TABLE IF NOT EXISTS dir_nodes (
+    mod_key TEXT NOT NULL,
+    rel_path TEXT NOT NULL,         -- "" for the mod folder itself
+    mtime_ns INTEGER NOT NULL,
+    files_digest BLOB NOT NULL,
+    subdirs TEXT NOT NULL,          -- JSON list of child directory names
+    PRIMARY KEY (mod_key, rel_path)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS fingerprints (
+    mod_key TEXT NOT NULL,
+    purpose TEXT NOT NULL,          -- e.g. "deploy"; each consumer keeps its own
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (mod_key, purpose)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS configurations (
+    mod_key TEXT PRIMARY KEY,
+    stats TEXT NOT NULL,            -- JSON [rel_path, size, mtime_ns] of what discovery looked at
+    config_json TEXT                -- NULL when the mod has no file-based configuration
+);
+"""
+
+_TABLES = ("mods", "archives", "assets", "gamebanana", "dir_nodes", "fingerprints", "configurations")
+
+
+def _key(path: str) -> str:
+    return os.path.normcase(os.path.abspath(path))
+
+
+def _info_mtime_ns(mod_path: str) -> Optional[int]:
+    try:
+        return os.stat(os.path.join(mod_path, "info.json")).st_mtime_ns
+    except OSError:
+        return None
+
+
+class ModCatalog:
+    """
+    Thread-safe access to the catalog database.
+
+    One connection is shared by all threads and serialised with a lock; every
+    query is small, so contention is not an issue.
+    """
+
+    def __init__(self, db_path: str = CATALOG_PATH):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._conn = None
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+                # The catalog is only a cache of what is on disk; rebuild it.
+                with conn:
+                    for table in _TABLES:
+                        conn.execute(f"DROP TABLE IF EXISTS {table}")
+                    conn.executescript(_SCHEMA)
+                    conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+            self._conn = conn
+        return self._conn
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # --- Keeping the catalog in sync ---
+
+    def _upsert_mod(self, conn, entry) -> None:
+        import Util  # Local import, Util imports this module indirectly
+        mod_key = _key(entry.path)
+        info = dict(entry.info)
+        mod_page = info.get("mod_page") or ""
+        conn.execute(
+            "INSERT OR REPLACE INTO mods (mod_key, parent, folder, info_mtime_ns, name, version, author, mod_type, "
+            "mod_page, detected_type, has_config, info_json) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (mod_key, _key(os.path.dirname(os.path.abspath(entry.path))), entry.folder, entry.info_mtime_ns,
+             info.get("name"), info.get("version"), info.get("author"), entry.mod_type, mod_page,
+             entry.detected_type, int(entry.has_config), json.dumps(info)))
+        conn.execute("DELETE FROM gamebanana WHERE mod_key = ?", (mod_key,))
+        if mod_page.startswith("https://gamebanana.com"):
+            item_type, item_id = Util.get_gb_item_details_from_url(mod_page)
+            if item_type and item_id:
+                conn.execute("INSERT INTO gamebanana (mod_key, item_type, item_id) VALUES (?, ?, ?)",
+                             (mod_key, item_type, int(item_id)))
+
+    def _delete_mods(self, conn, mod_keys: Iterable[str]) -> None:
+        rows = [(k,) for k in mod_keys]
+        for table in _TABLES:
+            conn.executemany(f"DELETE FROM {table} WHERE mod_key = ?", rows)
+
+    def known_entries(self, mods_folder: str) -> Dict[str, Tuple[Optional[int], Dict, str, bool]]:
+        """{folder: (info mtime, info, detected type, has config)} for a mods folder, in one query."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT folder, info_mtime_ns, info_json, detected_type, has_config FROM mods WHERE parent = ?",
+                (_key(mods_folder),)).fetchall()
+        return {folder: (mtime_ns, json.loads(info_json), detected_type, bool(has_config))
+                for folder, mtime_ns, info_json, detected_type, has_config in rows}
+
+    def known_infos(self, mods_folder: str) -> Dict[str, Tuple[Optional[int], Dict]]:
+        """{folder: (info mtime, info)}; lets a scan skip unchanged info.json files."""
+        return {folder: (known[0], known[1]) for folder, known in self.known_entries(mods_folder).items()}
+
+    def apply_entries(self, mods_folder: str, entries, removed: Optional[Iterable[str]] = None) -> bool:
+        """
+        Stores ModEntry scan results for `mods_folder`.
+
+        With removed=None the entries are a full scan and mods the scan did not
+        see are removed; otherwise only the listed folders are removed (an
+        incremental update of a few mods).
+
+        Returns:
+            True if anything in the catalog changed.
+        """
+        entries = list(entries)
+        parent = _key(mods_folder)
+        with self._lock:
+            conn = self._connection()
+            stored = {folder: (mtime_ns, detected_type, bool(has_config)) for folder, mtime_ns, detected_type, has_config
+                      in conn.execute("SELECT folder, info_mtime_ns, detected_type, has_config FROM mods WHERE parent = ?",
+                                      (parent,))}
+            changed = [e for e in entries if stored.get(e.folder) != (e.info_mtime_ns, e.detected_type, e.has_config)]
+            if removed is None:
+                seen = {e.folder for e in entries}
+                removed = [folder for folder in stored if folder not in seen]
+            removed = [_key(os.path.join(mods_folder, folder)) for folder in removed if folder in stored]
+            if not changed and not removed:
+                return False
+            with conn:
+                for entry in changed:
+                    self._upsert_mod(conn, entry)
+                self._delete_mods(conn, removed)
+        return True
+
+    def sync(self, mods_folder: str) -> bool:
+        """
+        Brings the catalog in line with the mods folder (see
+        LibraryScanner.scan_library). Returns True if anything changed.
+        """
+        import LibraryScanner  # Local import, LibraryScanner imports this module
+        return LibraryScanner.scan_library(mods_folder, self).changed
+
+    def refresh_mod(self, mod_path: str, info: Optional[Dict] = None, info_mtime_ns: Optional[int] = None) -> None:
+        """
+        Re-scans one mod, e.g. right after CrossPatch wrote its info.json. Pass
+        the data just written (and the file's mtime) to skip reading it back.
+        """
+        import LibraryScanner  # Local import, LibraryScanner imports this module
+        known = None
+        if info is not None and info_mtime_ns is not None:
+            known = {os.path.basename(os.path.abspath(mod_path)): (info_mtime_ns, info)}
+        entry = LibraryScanner.scan_mod(mod_path, known)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                self._upsert_mod(conn, entry)
+
+    def record_manifest(self, mod_path: str, fingerprints: Dict[str, list], manifest: Dict) -> None:
+        """Stores a mod's archives and the assets of its pak manifest."""
+        mod_key = _key(mod_path)
+        archives = sorted((rel, fp[0], fp[1]) for rel, fp in fingerprints.items())
+        with self._lock:
+            conn = self._connection()
+            stored = conn.execute("SELECT rel_path, size, mtime_ns FROM archives WHERE mod_key = ? ORDER BY rel_path",
+                                  (mod_key,)).fetchall()
+            if stored == archives:
+                return
+            assets = set()
+            for pak in manifest.get("pak_files", []):
+                pak_name = pak.get("file_name") or os.path.basename(pak.get("file_path", ""))
+                assets.update((mod_key, path, pak_name) for path in pak.get("files", []))
+            with conn:
+                conn.execute("DELETE FROM archives WHERE mod_key = ?", (mod_key,))
+                conn.execute("DELETE FROM assets WHERE mod_key = ?", (mod_key,))
+                conn.executemany("INSERT INTO archives (mod_key, rel_path, size, mtime_ns) VALUES (?, ?, ?, ?)",
+                                 [(mod_key,) + a for a in archives])
+                conn.executemany("INSERT INTO assets (mod_key, path, pak_name) VALUES (?, ?, ?)", assets)
+
+    def dir_nodes(self, mod_path: str) -> Dict[str, Tuple[int, bytes, Tuple[str, ...]]]:
+        """{relative dir: (mtime_ns, files digest, subdir names)} stored for a mod."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT rel_path, mtime_ns, files_digest, subdirs FROM dir_nodes WHERE mod_key = ?",
+                (_key(mod_path),)).fetchall()
+        return {rel: (mtime_ns, bytes(digest), tuple(json.loads(subdirs))) for rel, mtime_ns, digest, subdirs in rows}
+
+    def store_dir_nodes(self, mod_path: str, nodes: Dict[str, Tuple[int, bytes, Tuple[str, ...]]]) -> None:
+        """Replaces the stored directory nodes of a mod."""
+        mod_key = _key(mod_path)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM dir_nodes WHERE mod_key = ?", (mod_key,))
+                conn.executemany(
+                    "INSERT INTO dir_nodes (mod_key, rel_path, mtime_ns, files_digest, subdirs) VALUES (?, ?, ?, ?, ?)",
+                    [(mod_key, rel, mtime_ns, digest, json.dumps(list(subdirs)))
+                     for rel, (mtime_ns, digest, subdirs) in nodes.items()])
+
+    def stored_fingerprint(self, mod_path: str, purpose: str) -> Optional[str]:
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT fingerprint FROM fingerprints WHERE mod_key = ? AND purpose = ?",
+                (_key(mod_path), purpose)).fetchone()
+        return row[0] if row else None
+
+    def store_fingerprint(self, mod_path: str, purpose: str, fingerprint: str) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO fingerprints (mod_key, purpose, fingerprint) VALUES (?, ?, ?)",
+                             (_key(mod_path), purpose, fingerprint))
+
+    def delete_fingerprints(self, mod_path: str) -> None:
+        """Drops a mod's directory nodes and remembered fingerprints."""
+        mod_key = _key(mod_path)
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("DELETE FROM dir_nodes WHERE mod_key = ?", (mod_key,))
+                conn.execute("DELETE FROM fingerprints WHERE mod_key = ?", (mod_key,))
+
+    def stored_configuration(self, mod_path: str) -> Optional[Tuple[List, Optional[Dict]]]:
+        """(stats, configuration) stored by ConfigDiscovery for a mod, or None."""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT stats, config_json FROM configurations WHERE mod_key = ?", (_key(mod_path),)).fetchone()
+        if row is None:
+            return None
+        return [tuple(s) for s in json.loads(row[0])], (json.loads(row[1]) if row[1] is not None else None)
+
+    def store_configuration(self, mod_path: str, stats: List, config: Optional[Dict]) -> None:
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.execute("INSERT OR REPLACE INTO configurations (mod_key, stats, config_json) VALUES (?, ?, ?)",
+                             (_key(mod_path), json.dumps(stats), json.dumps(config) if config is not None else None))
+
+    # --- Queries ---
+
+    def mod_infos(self, mods_folder: str, folders: Optional[Iterable[str]] = None) -> Dict[str, Dict]:
+        """
+        Returns {folder: info dict} for the mods in a mods folder with a
+        single query. Each row is checked against its info.json's mtime;
+        mods whose info.json changed since (e.g. edited by hand) and
+        requested folders the catalog doesn't know yet are read from disk
+        once and stored.
+        """
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT folder, info_mtime_ns, info_json FROM mods WHERE parent = ?", (_key(mods_folder),)).fetchall()
+        stored = {folder: (mtime_ns, info_json) for folder, mtime_ns, info_json in rows}
+        folders = list(folders) if folders is not None else list(stored)
+        infos = {}
+        stale = []
+        for folder in folders:
+            known = stored.get(folder)
+            if known is not None and _info_mtime_ns(os.path.join(mods_folder, folder)) == known[0]:
+                infos[folder] = json.loads(known[1])
+            else:
+                stale.append(folder)
+        infos.update(self._rescan(mods_folder, stale))
+        return {f: infos[f] for f in folders if f in infos}
+
+    def _rescan(self, mods_folder: str, folders: Iterable[str]) -> Dict[str, Dict]:
+        import LibraryScanner  # Local import, LibraryScanner imports this module
+        loaded = {}
+        for folder in folders:
+            mod_path = os.path.join(mods_folder, folder)
+            if not os.path.isdir(mod_path):
+                continue
+            entry = LibraryScanner.scan_mod(mod_path)
+            loaded[folder] = dict(entry.info)
+            with self._lock:
+                conn = self._connection()
+                with conn:
+                    self._upsert_mod(conn, entry)
+        return loaded
+
+    def get_info(self, mod_path: str) -> Dict:
+        """Single-mod variant of mod_infos()."""
+        mod_path = os.path.abspath(mod_path)
+        folder = os.path.basename(mod_path)
+        return self.mod_infos(os.path.dirname(mod_path), [folder]).get(folder) or {}
+
+    def gamebanana_mods(self, mods_folder: str) -> List[Dict]:
+        """Mods with a GameBanana page: folder, name, version, mod_page, item_type, item_id."""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT m.folder, m.name, m.version, m.mod_page, g.item_type, g.item_id "
+                "FROM mods m JOIN gamebanana g ON g.mod_key = m.mod_key "
+                "WHERE m.parent = ? ORDER BY m.folder", (_key(mods_folder),)).fetchall()
+        keys = ("folder", "name", "version", "mod_page", "item_type", "item_id")
+        return [dict(zip(keys, row)) for row in rows]
+
+    def mods_with_type(self, mods_folder: str, folders: Iterable[str], mod_type: str = "pak") -> List[Dict]:
+        """
+        Of the given folders (e.g. the enabled mods), those of `mod_type`
+        with their name, version and page, in the order given.
+        """
+        folders = list(folders)
+        infos = self.mod_infos(mods_folder, folders)
+        return [{"folder": f, "name": infos[f].get("name", f), "version": infos[f].get("version", "1.0"),
+                 "mod_page": infos[f].get("mod_page", "")}
+                for f in folders if f in infos and infos[f].get("mod_type", "pak") == mod_type]
+
+    def mods_shipping(self, asset_path: str, mods_folder: Optional[str] = None) -> List[Dict]:
+        """Analyzed mods whose pak manifest lists `asset_path`: folder and pak name."""
+        query = ("SELECT m.folder, a.pak_name FROM assets a JOIN mods m ON m.mod_key = a.mod_key "
+                 "WHERE a.path = ?")
+        params = [asset_path]
+        if mods_folder is not None:
+            query += " AND m.parent = ?"
+            params.append(_key(mods_folder))
+        with self._lock:
+            rows = self._connection().execute(query + " ORDER BY m.folder", params).fetchall()
+        return [{"folder": folder, "pak_name": pak_name} for folder, pak_name in rows]
+
+
+# Shared instance used throughout the app.
+catalog = ModCatalog()
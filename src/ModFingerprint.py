@@ -0,0 +1,149 @@
+"""
+Merkle fingerprints of mod folders.
+
+A mod's fingerprint is the hash of its folder, where each directory hashes the
+(name, size, mtime_ns) of its files plus the names and hashes of its
+subdirectories. The per-directory results are kept (in memory and in the
+catalog), so recomputing a fingerprint stats every directory once but only
+lists the directories whose own mtime changed; an unchanged mod costs one
+stat per directory.
+
+A directory's mtime changes when entries are added, removed or renamed in it,
+which covers extracting, deleting or replacing files. A file rewritten in
+place leaves its directory's mtime alone; pass strict=True to re-list every
+directory when that matters.
+
+Consumers remember the fingerprint they last acted on under their own
+`purpose` and ask `has_changed()` later:
+
+    if ModFingerprint.has_changed(mod_path, purpose):
+        ...
+        ModFingerprint.remember(mod_path, purpose)
+
+A consumer whose output also depends on other inputs can fold them into the
+value it remembers; PakBatchProcessor remembers the fingerprint together with
+a mod's priority folder and selected options under "deploy", and skips
+copying mods whose deployed copy is still current.
+"""
+
+import hashlib
+import os
+import struct
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+import ModCatalog
+
+# Directories modified this recently are re-listed on the next run: another
+# change within the same mtime tick would otherwise go unnoticed.
+_RACY_WINDOW_NS = 2_000_000_000
+_FILE_STAT = struct.Struct("<QQ")
+
+# rel_path -> (mtime_ns, files digest, subdir names); "" is the mod folder
+Nodes = Dict[str, Tuple[int, bytes, Tuple[str, ...]]]
+
+_nodes: Dict[str, Nodes] = {}
+_nodes_lock = threading.Lock()
+
+
+def _mod_key(mod_path: str) -> str:
+    return os.path.normcase(os.path.abspath(mod_path))
+
+
+def _list_dir(path: str) -> Tuple[bytes, Tuple[str, ...]]:
+    """Hashes the files of one directory and returns its subdirectory names."""
+    files = []
+    subdirs = []
+    with os.scandir(path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    st = entry.stat()
+                    files.append((entry.name, st.st_size, st.st_mtime_ns))
+            except OSError:
+                continue
+    h = hashlib.blake2b(digest_size=16)
+    for name, size, mtime_ns in sorted(files):
+        h.update(name.encode("utf-8", "surrogateescape") + b"\0")
+        h.update(_FILE_STAT.pack(size, mtime_ns))
+    return h.digest(), tuple(sorted(subdirs))
+
+
+def _load_nodes(mod_path: str) -> Nodes:
+    key = _mod_key(mod_path)
+    with _nodes_lock:
+        nodes = _nodes.get(key)
+    if nodes is None:
+        nodes = ModCatalog.catalog.dir_nodes(mod_path)
+        with _nodes_lock:
+            _nodes.setdefault(key, nodes)
+    return nodes
+
+
+def compute(mod_path: str, strict: bool = False) -> Optional[str]:
+    """
+    Current fingerprint of a mod folder (hex string), or None if the folder
+    does not exist.
+    """
+    old_nodes = _load_nodes(mod_path)
+    reusable = {} if strict else old_nodes
+    new_nodes: Nodes = {}
+    now_ns = time.time_ns()
+
+    def dir_hash(rel: str) -> bytes:
+        path = os.path.join(mod_path, rel) if rel else mod_path
+        mtime_ns = os.stat(path).st_mtime_ns
+        node = reusable.get(rel)
+        if node is None or node[0] != mtime_ns:
+            files_digest, subdirs = _list_dir(path)
+            # A racy node is stored with an impossible mtime so it is re-listed next time.
+            node = (mtime_ns if now_ns - mtime_ns > _RACY_WINDOW_NS else -1, files_digest, subdirs)
+        new_nodes[rel] = node
+        h = hashlib.blake2b(node[1], digest_size=16)
+        for name in node[2]:
+            try:
+                child = dir_hash(os.path.join(rel, name) if rel else name)
+            except OSError:
+                continue  # Removed while we were looking.
+            h.update(name.encode("utf-8", "surrogateescape") + b"\0" + child)
+        return h.digest()
+
+    try:
+        fingerprint = dir_hash("").hex()
+    except OSError:
+        return None
+
+    if new_nodes != old_nodes:
+        with _nodes_lock:
+            _nodes[_mod_key(mod_path)] = new_nodes
+        ModCatalog.catalog.store_dir_nodes(mod_path, new_nodes)
+    return fingerprint
+
+
+def stored(mod_path: str, purpose: str) -> Optional[str]:
+    """The fingerprint last remembered for `purpose`, or None."""
+    return ModCatalog.catalog.stored_fingerprint(mod_path, purpose)
+
+
+def remember(mod_path: str, purpose: str, fingerprint: Optional[str] = None) -> Optional[str]:
+    """Stores the mod's (current) fingerprint for `purpose` and returns it."""
+    fingerprint = fingerprint or compute(mod_path)
+    if fingerprint is not None:
+        ModCatalog.catalog.store_fingerprint(mod_path, purpose, fingerprint)
+    return fingerprint
+
+
+def has_changed(mod_path: str, purpose: str, strict: bool = False) -> bool:
+    """True if the mod differs from the fingerprint remembered for `purpose` (or none was)."""
+    current = compute(mod_path, strict)
+    return current is None or current != stored(mod_path, purpose)
+
+
+def forget(mod_path: str) -> None:
+    """Drops everything kept about a mod, in memory and in the catalog, e.g. after it was deleted."""
+    with _nodes_lock:
+        _nodes.pop(_mod_key(mod_path), None)
+    ModCatalog.catalog.delete_fingerprints(mod_path)
@@ -0,0 +1,148 @@
+"""
+Watches the mods folder so changes made outside CrossPatch show up without a
+manual refresh.
+
+The mods folder itself is watched for mods being added or removed, and every
+mod folder (plus its info.json) for edits. Events are collected and only
+reported once the folder has been quiet for a short moment, so extracting a
+large archive results in a single `mods_changed` emission. Deploys and
+downloads pause the watcher; what happened in the meantime is reported when
+it resumes.
+"""
+
+import os
+
+from PySide6.QtCore import QFileSystemWatcher, QObject, QTimer, Signal
+
+DEBOUNCE_MS = 400
+
+
+class ModFolderWatcher(QObject):
+    """Turns file system events in the mods folder into per-mod change batches."""
+    mods_changed = Signal(str, list, bool)  # (mods_folder, changed mod folders, folder listing changed)
+
+    def __init__(self, parent=None, debounce_ms=DEBOUNCE_MS):
+        super().__init__(parent)
+        self.mods_folder = None
+        self._pause_reasons = set()
+        self._dirty = set()
+        self._listing_changed = False
+
+        self._watcher = QFileSystemWatcher(self)
+        self._watcher.directoryChanged.connect(self._on_directory_changed)
+        self._watcher.fileChanged.connect(self._on_file_changed)
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._flush)
+
+    @property
+    def paused(self):
+        return bool(self._pause_reasons)
+
+    def set_folder(self, mods_folder, mod_folders=()):
+        """
+        Watches `mods_folder` and exactly the given mod folders. Calling it
+        again for the same folder only adds and removes the differing watches.
+        """
+        if mods_folder != self.mods_folder:
+            self._clear_watches()
+            self._dirty.clear()
+            self._listing_changed = False
+            self._timer.stop()
+            self.mods_folder = mods_folder
+        if not mods_folder or not os.path.isdir(mods_folder):
+            return
+        if mods_folder not in self._watcher.directories():
+            self._watcher.addPath(mods_folder)
+        watched = {self._mod_folder_of(p) for p in self._watcher.directories()} - {None}
+        wanted = set(mod_folders)
+        self.unwatch_mods(watched - wanted)
+        self.watch_mods(wanted - watched)
+
+    def watch_mods(self, mod_folders):
+        paths = []
+        for folder in mod_folders:
+            mod_path = os.path.join(self.mods_folder, folder)
+            paths.append(mod_path)
+            info_path = os.path.join(mod_path, "info.json")
+            if os.path.isfile(info_path):
+                paths.append(info_path)
+        if paths:
+            self._watcher.addPaths(paths)
+
+    def unwatch_mods(self, mod_folders):
+        watched = set(self._watcher.directories()) | set(self._watcher.files())
+        paths = []
+        for folder in mod_folders:
+            mod_path = os.path.join(self.mods_folder, folder)
+            paths.extend(p for p in (mod_path, os.path.join(mod_path, "info.json")) if p in watched)
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def pause(self, reason):
+        """Holds back change notifications until every pause reason has been resumed."""
+        self._pause_reasons.add(reason)
+        self._timer.stop()
+
+    def resume(self, reason):
+        if reason not in self._pause_reasons:
+            return
+        self._pause_reasons.discard(reason)
+        if not self._pause_reasons and (self._dirty or self._listing_changed):
+            self._timer.start()
+
+    def stop(self):
+        self.pause("shutdown")
+        self._clear_watches()
+
+    def _clear_watches(self):
+        paths = self._watcher.directories() + self._watcher.files()
+        if paths:
+            self._watcher.removePaths(paths)
+
+    def _mod_folder_of(self, path):
+        """The mod folder name `path` belongs to, or None if it is outside the mods folder."""
+        if not self.mods_folder:
+            return None
+        rel = os.path.relpath(path, self.mods_folder)
+        if rel == os.curdir or rel.startswith(os.pardir):
+            return None
+        return rel.split(os.sep, 1)[0]
+
+    def _on_directory_changed(self, path):
+        if self.mods_folder and os.path.normcase(os.path.abspath(path)) == os.path.normcase(os.path.abspath(self.mods_folder)):
+            self._listing_changed = True
+        else:
+            folder = self._mod_folder_of(path)
+            if folder is None:
+                return
+            self._dirty.add(folder)
+            # info.json may have just been created; watch it for later edits.
+            info_path = os.path.join(self.mods_folder, folder, "info.json")
+            if os.path.isfile(info_path) and info_path not in self._watcher.files():
+                self._watcher.addPath(info_path)
+        self._touch()
+
+    def _on_file_changed(self, path):
+        folder = self._mod_folder_of(path)
+        if folder is None:
+            return
+        self._dirty.add(folder)
+        # Files replaced by rename (e.g. an atomic save) drop out of the watch list.
+        if os.path.isfile(path) and path not in self._watcher.files():
+            self._watcher.addPath(path)
+        self._touch()
+
+    def _touch(self):
+        if not self.paused:
+            self._timer.start()  # Restarting the timer is what debounces a burst of events.
+
+    def _flush(self):
+        if self.paused or not self.mods_folder:
+            return
+        dirty, self._dirty = sorted(self._dirty), set()
+        listing_changed, self._listing_changed = self._listing_changed, False
+        if dirty or listing_changed:
+            self.mods_changed.emit(self.mods_folder, dirty, listing_changed)
@@ -0,0 +1,145 @@
+"""
+Single writer for mod info.json files.
+
+Field updates are queued per mod and merged, then written in one go: the new
+content goes to a temp file that replaces info.json atomically, and the
+read_mod_info cache and the catalog are updated in the same step. Several
+updates made inside a `batch()` (e.g. version, page and metadata after a
+download) therefore cost one write, and threads writing the same mod can no
+longer interleave and truncate the file.
+"""
+
+import json
+import os
+import threading
+from contextlib import contextmanager
+from typing import Dict, Optional
+
+import MetadataCache
+
+INFO_FILE = "info.json"
+
+
+def write_json_atomic(path: str, data: Dict) -> None:
+    """Writes `data` to a temp file next to `path`, then replaces `path` with it."""
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+class _Pending:
+    __slots__ = ("base", "updates", "removed", "batch_depth")
+
+    def __init__(self):
+        self.base: Optional[Dict] = None  # full replacement, if one was queued
+        self.updates: Dict = {}
+        self.removed = set()
+        self.batch_depth = 0
+
+
+class ModInfoWriter:
+    """Coalesces and serializes info.json writes. Use the shared `mod_info_writer`."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._pending: Dict[str, _Pending] = {}
+        self._write_locks: Dict[str, threading.Lock] = {}
+
+    @staticmethod
+    def _key(mod_path: str) -> str:
+        return os.path.normcase(os.path.abspath(mod_path))
+
+    def _entry(self, mod_path: str) -> _Pending:
+        return self._pending.setdefault(self._key(mod_path), _Pending())
+
+    def update(self, mod_path: str, **fields) -> None:
+        """Sets fields of a mod's info.json (written now, or when the enclosing batch ends)."""
+        with self._lock:
+            entry = self._entry(mod_path)
+            entry.updates.update(fields)
+            entry.removed.difference_update(fields)
+            in_batch = entry.batch_depth > 0
+        if not in_batch:
+            self.flush(mod_path)
+
+    def remove(self, mod_path: str, *fields) -> None:
+        """Removes fields from a mod's info.json."""
+        with self._lock:
+            entry = self._entry(mod_path)
+            for field in fields:
+                entry.updates.pop(field, None)
+            entry.removed.update(fields)
+            in_batch = entry.batch_depth > 0
+        if not in_batch:
+            self.flush(mod_path)
+
+    def replace(self, mod_path: str, info: Dict) -> None:
+        """Replaces a mod's info.json content; field updates queued earlier are dropped."""
+        with self._lock:
+            entry = self._entry(mod_path)
+            entry.base = MetadataCache.thaw(info)
+            entry.updates.clear()
+            entry.removed.clear()
+            in_batch = entry.batch_depth > 0
+        if not in_batch:
+            self.flush(mod_path)
+
+    @contextmanager
+    def batch(self, mod_path: str):
+        """Merges every update made to `mod_path` inside the block into a single write."""
+        with self._lock:
+            self._entry(mod_path).batch_depth += 1
+        try:
+            yield self
+        finally:
+            with self._lock:
+                entry = self._entry(mod_path)
+                entry.batch_depth -= 1
+                done = entry.batch_depth == 0
+            if done:
+                self.flush(mod_path)
+
+    def flush(self, mod_path: str) -> Optional[Dict]:
+        """
+        Writes the pending changes of one mod. Returns the data written, or
+        None if nothing was pending or the mod folder no longer exists.
+        """
+        import Util  # Local import, Util imports this module
+        import ModCatalog  # Local import
+
+        key = self._key(mod_path)
+        with self._lock:
+            write_lock = self._write_locks.setdefault(key, threading.Lock())
+        with write_lock:
+            with self._lock:
+                entry = self._pending.get(key)
+                if entry is None or entry.batch_depth > 0:
+                    return None
+                del self._pending[key]
+            if entry.base is None and not entry.updates and not entry.removed:
+                return None
+            if not os.path.isdir(mod_path):
+                return None
+
+            data = dict(entry.base) if entry.base is not None else MetadataCache.thaw(Util.read_mod_info(mod_path))
+            data.update(entry.updates)
+            for field in entry.removed:
+                data.pop(field, None)
+
+            info_path = os.path.join(mod_path, INFO_FILE)
+            write_json_atomic(info_path, data)
+            st = os.stat(info_path)
+            Util._MOD_INFO_CACHE.put(info_path, st.st_mtime, data)
+            ModCatalog.catalog.refresh_mod(mod_path, data, st.st_mtime_ns)
+            return data
+
+
+mod_info_writer = ModInfoWriter()
@@ -0,0 +1,219 @@
+"""
+Model behind the Installed Mods list.
+
+ModListModel holds one ModRow per mod in display order. `apply_rows()` diffs a
+freshly computed row list against the current one and emits only the
+corresponding row removals, insertions, moves and dataChanged signals, so
+views keep their selection and scroll position and unchanged rows cost
+nothing. ModFilterProxyModel filters on each row's precomputed lowercase
+search key, so a keystroke is a substring test per row and never touches
+the mods' metadata.
+"""
+
+from typing import List, NamedTuple, Optional
+
+from PySide6.QtCore import QAbstractTableModel, QModelIndex, QSortFilterProxyModel, Qt, Signal
+from PySide6.QtGui import QColor, QFont
+
+COLUMNS = ["", "", "Mod Name", "Version", "Author", "Type", "Config"]
+COL_UPDATE, COL_ENABLED, COL_NAME, COL_VERSION, COL_AUTHOR, COL_TYPE, COL_CONFIG = range(len(COLUMNS))
+
+FOLDER_ROLE = Qt.UserRole  # same role the QTreeWidget items used for the folder name
+
+
+class ModRow(NamedTuple):
+    folder: str
+    name: str
+    version: str
+    author: str
+    mod_type: str  # upper case, as displayed
+    has_config: bool
+    enabled: bool
+    updatable: bool
+
+    @property
+    def search_key(self) -> str:
+        # NUL can't be typed into the search box, so matches never span fields.
+        return "\0".join((self.name, self.version, self.author, self.mod_type)).lower()
+
+
+class ModListModel(QAbstractTableModel):
+    """Flat, reorderable list of mods with an 'enabled' checkbox column."""
+    enabledChanged = Signal(str, bool)  # (mod folder, enabled)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rows: List[ModRow] = []
+        self._search_keys: List[str] = []
+        self._bold = QFont()
+        self._bold.setBold(True)
+        self._update_color = QColor("springgreen")
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = self._rows[index.row()]
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == COL_UPDATE:
+                return "⬆️" if row.updatable else ""
+            if column == COL_NAME:
+                return row.name
+            if column == COL_VERSION:
+                return row.version
+            if column == COL_AUTHOR:
+                return row.author
+            if column == COL_TYPE:
+                return row.mod_type
+            if column == COL_CONFIG:
+                return "⚙️" if row.has_config else ""
+            return ""
+        if role == Qt.CheckStateRole and column == COL_ENABLED:
+            return Qt.Checked if row.enabled else Qt.Unchecked
+        if role == FOLDER_ROLE:
+            return row.folder
+        if column == COL_NAME and row.updatable:
+            if role == Qt.FontRole:
+                return self._bold
+            if role == Qt.ForegroundRole:
+                return self._update_color
+        return None
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.CheckStateRole or index.column() != COL_ENABLED:
+            return False
+        enabled = Qt.CheckState(value) == Qt.Checked
+        row = self._rows[index.row()]
+        if row.enabled == enabled:
+            return True
+        self._rows[index.row()] = row._replace(enabled=enabled)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        self.enabledChanged.emit(row.folder, enabled)
+        return True
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled
+        if index.column() == COL_ENABLED:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    # --- Access ---
+
+    def row(self, source_row: int) -> ModRow:
+        return self._rows[source_row]
+
+    def search_key(self, source_row: int) -> str:
+        return self._search_keys[source_row]
+
+    def folders(self) -> List[str]:
+        """Mod folders in display order (including rows hidden by a filter)."""
+        return [row.folder for row in self._rows]
+
+    def row_of(self, folder: str) -> Optional[int]:
+        for i, row in enumerate(self._rows):
+            if row.folder == folder:
+                return i
+        return None
+
+    # --- Updates ---
+
+    def move_row(self, source: int, destination: int) -> bool:
+        """Moves row `source` so that it ends up above the row now at `destination`."""
+        if source == destination or source + 1 == destination:
+            return False
+        if not self.beginMoveRows(QModelIndex(), source, source, QModelIndex(), destination):
+            return False
+        row = self._rows.pop(source)
+        key = self._search_keys.pop(source)
+        insert_at = destination - 1 if destination > source else destination
+        self._rows.insert(insert_at, row)
+        self._search_keys.insert(insert_at, key)
+        self.endMoveRows()
+        return True
+
+    def apply_rows(self, rows: List[ModRow]) -> None:
+        """Makes the model match `rows`, emitting only row-level changes."""
+        new_folders = [r.folder for r in rows]
+        new_set = set(new_folders)
+
+        # 1. Removals, bottom-up so earlier indexes stay valid.
+        for i in range(len(self._rows) - 1, -1, -1):
+            if self._rows[i].folder not in new_set:
+                self.beginRemoveRows(QModelIndex(), i, i)
+                del self._rows[i]
+                del self._search_keys[i]
+                self.endRemoveRows()
+
+        # 2. Insertions at their target position (existing rows keep their relative order).
+        old_set = {r.folder for r in self._rows}
+        for i, row in enumerate(rows):
+            if row.folder not in old_set:
+                at = min(i, len(self._rows))
+                self.beginInsertRows(QModelIndex(), at, at)
+                self._rows.insert(at, row)
+                self._search_keys.insert(at, row.search_key)
+                self.endInsertRows()
+
+        # 3. Reorder if needed; persistent indexes (selection, current row) follow their mods.
+        if [r.folder for r in self._rows] != new_folders:
+            self.layoutAboutToBeChanged.emit()
+            old_positions = {r.folder: i for i, r in enumerate(self._rows)}
+            persistent = self.persistentIndexList()
+            self._rows = [self._rows[old_positions[f]] for f in new_folders]
+            self._search_keys = [r.search_key for r in self._rows]
+            new_positions = {f: i for i, f in enumerate(new_folders)}
+            old_folders = list(old_positions)
+            self.changePersistentIndexList(
+                persistent,
+                [self.index(new_positions[old_folders[p.row()]], p.column()) for p in persistent])
+            self.layoutChanged.emit()
+
+        # 4. Changed content.
+        last_column = len(COLUMNS) - 1
+        for i, row in enumerate(rows):
+            if self._rows[i] != row:
+                self._rows[i] = row
+                self._search_keys[i] = row.search_key
+                self.dataChanged.emit(self.index(i, 0), self.index(i, last_column))
+
+
+class ModFilterProxyModel(QSortFilterProxyModel):
+    """Filters ModListModel rows by a case-insensitive substring of name, version, author or type."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+
+    @property
+    def filter_text(self) -> str:
+        return self._needle
+
+    def set_filter_text(self, text: str) -> None:
+        needle = text.lower()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self.invalidateFilter()
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        if not self._needle:
+            return True
+        return self._needle in self.sourceModel().search_key(source_row)
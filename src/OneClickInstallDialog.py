@@ -1,6 +1,5 @@
 import sys
 import threading
-import requests
 import platform
 import ctypes
 
@@ -10,6 +9,9 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtGui import QPixmap, QImage, QFont
 from PySide6.QtCore import Qt, Signal, QObject
+from LazyImport import lazy_module
+
+requests = lazy_module("requests")  # Imported on first image load
 
 class ImageLoader(QObject):
     """Worker object to load an image in a separate thread."""
@@ -1,109 +1,189 @@
-from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar
+from PySide6.QtWidgets import QDialog, QVBoxLayout, QHBoxLayout, QLabel, QProgressBar, QPushButton
 from PySide6.QtCore import Qt, Signal, QObject
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
 import threading
-import queue
-import time
 import PakInspector
 
+# Returned by workers for mods that were dropped by a cancel before they started.
+_SKIPPED = object()
+
+
+def default_worker_count() -> int:
+    """Number of parses to run at once. Leaves one core free for the UI."""
+    return max(1, min(8, (os.cpu_count() or 2) - 1))
+
+
 class ParseSignals(QObject):
     """Signals for communicating parse progress to the UI."""
     progress = Signal(int)
     progress_text = Signal(str)
+    mod_finished = Signal(str, bool)  # (mod_path, succeeded)
     finished = Signal()
     error = Signal(str)
 
 class ParseProgressDialog(QDialog):
     """Dialog to show pak parsing progress."""
+    cancel_requested = Signal()
+
     def __init__(self, parent, total_mods):
         super().__init__(parent)
         self.setWindowTitle("Processing Mods")
         self.setMinimumWidth(400)
         self.setModal(True)
         layout = QVBoxLayout(self)
-        
+
         self.status_label = QLabel("Starting...")
         layout.addWidget(self.status_label)
-        
+
         self.progress_bar = QProgressBar()
         self.progress_bar.setMaximum(total_mods)
         layout.addWidget(self.progress_bar)
-        
+
+        button_layout = QHBoxLayout()
+        button_layout.addStretch()
+        self.cancel_btn = QPushButton("Cancel")
+        self.cancel_btn.clicked.connect(self._on_cancel)
+        button_layout.addWidget(self.cancel_btn)
+        layout.addLayout(button_layout)
+
         self.setWindowFlags(self.windowFlags() & ~Qt.WindowCloseButtonHint)
-    
+
     def update_progress(self, value):
         self.progress_bar.setValue(value)
-    
+
     def update_text(self, text):
         self.status_label.setText(text)
 
+    def _on_cancel(self):
+        self.cancel_btn.setEnabled(False)
+        self.status_label.setText("Cancelling... (finished mods are kept)")
+        self.cancel_requested.emit()
+
 class BatchParser:
-    """Handles parsing multiple pak files in batches with progress reporting."""
-    def __init__(self, parent, mods_to_parse):
+    """
+    Analyzes the pak files of many mods at once on a bounded worker pool.
+
+    Every finished mod is cached by PakInspector as soon as it completes, so
+    cancelling a run keeps the work that was already done. Use `start()` from
+    the GUI thread (shows a modal progress dialog) or `run()` from a worker
+    thread that reports progress its own way.
+    """
+    def __init__(self, parent, mods_to_parse, max_workers=None):
         self.parent = parent
-        self.mods_to_parse = mods_to_parse
+        self.mods_to_parse = list(mods_to_parse)  # [(mod_path, mod_name), ...]
+        self.max_workers = max_workers or default_worker_count()
         self.signals = ParseSignals()
         self.progress_dialog = None
         self.results = {}
         self.error = None
-        self._parse_queue = queue.Queue()
-        self._batch_size = 5  # Process 5 mods at a time
-        
+        self._cancel_event = threading.Event()
+        self._lock = threading.Lock()
+
+    def cancel(self):
+        """Drops queued parses and kills the ones that are running."""
+        self._cancel_event.set()
+
+    @property
+    def cancelled(self):
+        return self._cancel_event.is_set()
+
     def start(self):
         """Start the parsing process in a background thread with UI feedback."""
         total_mods = len(self.mods_to_parse)
         self.progress_dialog = ParseProgressDialog(self.parent, total_mods)
-        
+
         # Connect signals
         self.signals.progress.connect(self.progress_dialog.update_progress)
         self.signals.progress_text.connect(self.progress_dialog.update_text)
         self.signals.finished.connect(self._on_complete)
         self.signals.error.connect(self._on_error)
-        
+        self.progress_dialog.cancel_requested.connect(self.cancel)
+
         # Start worker thread
         threading.Thread(target=self._parse_worker, daemon=True).start()
-        
+
         # Show dialog
         self.progress_dialog.exec()
-        
+
         if self.error:
             raise Exception(self.error)
         return self.results
-    
+
+    def run(self, progress_callback=None):
+        """
+        Parses all mods, blocking until done or cancelled.
+
+        Args:
+            progress_callback: Optional callable(done, total, mod_name) invoked
+                from worker threads after each mod completes.
+
+        Returns:
+            Dict mapping mod_path to its pak_data, or None if its contents
+            are unknown (parse failed, timed out or was cancelled).
+        """
+        total = len(self.mods_to_parse)
+        if not total:
+            return self.results
+
+        done = 0
+        workers = min(self.max_workers, total)
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="PakParse") as pool:
+            futures = {}
+            for mod_path, mod_name in self.mods_to_parse:
+                if self.cancelled:
+                    break
+                futures[pool.submit(self._parse_one, mod_path, mod_name)] = (mod_path, mod_name)
+
+            for future in as_completed(futures):
+                mod_path, mod_name = futures[future]
+                if future.cancelled():
+                    continue
+                pak_data = future.result()
+                if pak_data is _SKIPPED:
+                    continue
+                with self._lock:
+                    self.results[mod_path] = pak_data
+                    done += 1
+                    current = done
+                self.signals.mod_finished.emit(mod_path, pak_data is not None)
+                if progress_callback:
+                    progress_callback(current, total, mod_name)
+                if self.cancelled:
+                    # Drop everything still queued; running parses see the cancel event.
+                    for pending in futures:
+                        pending.cancel()
+        return self.results
+
+    def _parse_one(self, mod_path, mod_name):
+        if self.cancelled:
+            return _SKIPPED
+        try:
+            return PakInspector.generate_mod_pak_manifest(mod_path, cancel_event=self._cancel_event)
+        except Exception as e:
+            print(f"Error parsing {mod_name}: {e}")
+            return None
+
     def _parse_worker(self):
-        """Worker thread that processes mods in batches."""
+        """Worker thread that drives `run()` and forwards progress to the dialog."""
         try:
-            mods_processed = 0
-            current_batch = []
-            
-            for mod_path, mod_name in self.mods_to_parse:
-                current_batch.append((mod_path, mod_name))
-                
-                if len(current_batch) >= self._batch_size or mod_path == self.mods_to_parse[-1][0]:
-                    # Process current batch
-                    for batch_mod_path, batch_mod_name in current_batch:
-                        try:
-                            self.signals.progress_text.emit(f"Parsing {batch_mod_name}...")
-                            self.results[batch_mod_path] = PakInspector.get_pak_data(batch_mod_path)
-                            mods_processed += 1
-                            self.signals.progress.emit(mods_processed)
-                        except Exception as e:
-                            print(f"Error parsing {batch_mod_name}: {e}")
-                            self.results[batch_mod_path] = None
-                    
-                    # Short delay between batches to let the UI breathe
-                    time.sleep(0.1)
-                    current_batch = []
-            
+            def report(done, total, mod_name):
+                self.signals.progress.emit(done)
+                self.signals.progress_text.emit(f"Parsed {mod_name} ({done}/{total})")
+
+            self.signals.progress_text.emit(
+                f"Parsing {len(self.mods_to_parse)} mods using {min(self.max_workers, max(1, len(self.mods_to_parse)))} workers...")
+            self.run(report)
             self.signals.finished.emit()
-            
+
         except Exception as e:
             self.signals.error.emit(str(e))
-    
+
     def _on_complete(self):
         if self.progress_dialog:
             self.progress_dialog.accept()
-    
+
     def _on_error(self, error_message):
         self.error = error_message
         if self.progress_dialog:
-            self.progress_dialog.accept()
\ No newline at end of file
+            self.progress_dialog.accept()
@@ -1,14 +1,20 @@
 """Module for batch processing pak files with progress reporting."""
 
 from typing import List, Dict, Tuple, Optional
+import hashlib
+import json
 import os 
 import shutil
 import re
 import threading 
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar
 from PySide6.QtCore import Qt, Signal, QObject
-import PakInspector
+from PakBatchParser import BatchParser
 from ConflictDialog import ConflictDialog
+from Profiler import traced, annotate, operation
+import ModFingerprint
+
+DEPLOY_PURPOSE = "deploy"  # ModFingerprint purpose of the last successful copy of each mod
 
 class BatchProcessSignals(QObject):
     """Signals for batch processing operations."""
@@ -51,11 +57,14 @@ class PakBatchProcessor:
         self.cfg = cfg
         self.profile_data = profile_data
         self._cancel_flag = False
+        self._batch_parser = None
         self.signals = BatchProcessSignals()
 
     def cancel(self):
         """Cancel the current batch operation."""
         self._cancel_flag = True
+        if self._batch_parser:
+            self._batch_parser.cancel()
 
     def process_mods_batch(self, parent_window, mod_list: List[Dict]) -> None:
         """
@@ -68,15 +77,25 @@ class PakBatchProcessor:
         """
         dialog = BatchProgressDialog(parent_window, "Processing Mods")
 
+        @traced("process_mods_batch", "deploy")
         def worker():
             try:
                 total_mods = len(mod_list)
+                annotate(items=total_mods)
                 results = {"successful": [], "failed": []}
                 all_conflicts = {}
                 pak_dst = self._get_pak_dst()
 
+                # --- Analyze pak contents of every enabled mod up front, in parallel ---
+                # Conflict detection below needs the manifests, and parsing them one
+                # by one inside the enable loop is by far the slowest part of a deploy.
+                self._analyze_enabled_mods(mod_list)
+
+                # --- Mods unchanged since their last deploy keep their deployed copy ---
+                deploy_keys, up_to_date = self._deployment_state(mod_list, pak_dst)
+
                 # --- Absolute Cleanup: Remove all managed pak mod folders before processing ---
-                self._clean_all_managed_folders(pak_dst)
+                self._clean_all_managed_folders(pak_dst, keep=set(up_to_date.values()))
 
                 for i, mod in enumerate(mod_list):
                     if self._cancel_flag:
@@ -99,12 +118,23 @@ class PakBatchProcessor:
                                 for file, providers in mod_conflicts.items():
                                     all_conflicts.setdefault(file, set()).update(providers)
 
-                            self._enable_mod(mod_name, priority, pak_dst)
+                            if mod_name not in up_to_date:
+                                self._enable_mod(mod_name, priority, pak_dst)
+                                if deploy_keys.get(mod_name):
+                                    ModFingerprint.remember(os.path.join(self.cfg["mods_folder"], mod_name),
+                                                            DEPLOY_PURPOSE, deploy_keys[mod_name])
                         results["successful"].append(mod_name)
 
                     except Exception as e:
+                        if is_enabled:
+                            # Don't leave a partial copy behind for the next deploy to keep.
+                            self._remove_mod_folders(pak_dst, mod_name)
                         results["failed"].append({"name": mod_name, "error": str(e)})
 
+                if results["failed"]:
+                    annotate(error=f"{len(results['failed'])} of {total_mods} mods failed: "
+                                   + ", ".join(f["name"] for f in results["failed"]))
+
                 # After processing, if there are any conflicts, show the dialog
                 if all_conflicts:
                     self.signals.conflicts_found.emit({k: list(v) for k, v in all_conflicts.items()})
@@ -113,6 +143,7 @@ class PakBatchProcessor:
                 self.signals.finished.emit(results)
 
             except Exception as e:
+                annotate(error=f"{type(e).__name__}: {e}")
                 self.signals.error.emit(str(e))
 
         # Connect signals
@@ -134,6 +165,25 @@ class PakBatchProcessor:
         # Show dialog and wait
         dialog.exec()
 
+    def _analyze_enabled_mods(self, mod_list: List[Dict]) -> None:
+        """Generates pak manifests for all enabled mods using the shared BatchParser pool."""
+        mods_folder = self.cfg["mods_folder"]
+        to_parse = [(os.path.join(mods_folder, m["name"]), m["name"]) for m in mod_list if m.get("enabled")]
+        if not to_parse:
+            return
+
+        def report(done, total, mod_name):
+            self.signals.progress.emit(int((done / total) * 100))
+            self.signals.progress_text.emit(f"Analyzing pak files ({done}/{total}): {mod_name}")
+
+        self.signals.progress_text.emit(f"Analyzing pak files for {len(to_parse)} mods...")
+        self._batch_parser = BatchParser(None, to_parse)
+        try:
+            with operation("analyze_enabled_mods", "parse", items=len(to_parse)):
+                self._batch_parser.run(report)
+        finally:
+            self._batch_parser = None
+
     def _get_pak_dst(self) -> str:
         """Get the destination path for pak files."""
         return os.path.join(
@@ -144,24 +194,53 @@ class PakBatchProcessor:
             "~mods"
         )
 
+    def _target_folder(self, mod_name: str, priority: int) -> str:
+        """Name of a mod's folder in the game's ~mods directory, e.g. '003.MyMod'."""
+        return f"{str(priority).zfill(3)}.{mod_name}"
+
+    def _deployment_state(self, mod_list: List[Dict], pak_dst: str) -> Tuple[Dict[str, str], Dict[str, str]]:
+        """
+        Works out which enabled mods can keep their deployed copy.
+
+        A mod's deploy key combines its folder fingerprint (see ModFingerprint)
+        with its target folder and selected configuration options; when it
+        matches the key remembered after the last successful copy and that
+        copy is still there, the mod doesn't need to be copied again.
+
+        Returns:
+            ({mod name: deploy key}, {mod name: target folder} of up-to-date mods)
+        """
+        deploy_keys = {}
+        up_to_date = {}
+        mod_configurations = self.profile_data.get("mod_configurations", {})
+        for mod in mod_list:
+            if not mod.get("enabled"):
+                continue
+            mod_name = mod["name"]
+            source_path = os.path.join(self.cfg["mods_folder"], mod_name)
+            # Strict: a pak replaced in place leaves its directory's mtime alone.
+            fingerprint = ModFingerprint.compute(source_path, strict=True)
+            if fingerprint is None:
+                continue
+            target_folder = self._target_folder(mod_name, mod.get("priority", 0))
+            state = json.dumps([fingerprint, target_folder, mod_configurations.get(mod_name, {})], sort_keys=True)
+            deploy_keys[mod_name] = hashlib.blake2b(state.encode("utf-8"), digest_size=16).hexdigest()
+            if (deploy_keys[mod_name] == ModFingerprint.stored(source_path, DEPLOY_PURPOSE)
+                    and os.path.isdir(os.path.join(pak_dst, target_folder))):
+                up_to_date[mod_name] = target_folder
+        if up_to_date:
+            print(f"Keeping the deployed copy of {len(up_to_date)} unchanged mod(s).")
+        return deploy_keys, up_to_date
+
     def _enable_mod(self, mod_name: str, priority: int, pak_dst: str) -> None:
         """Enable a mod by copying its pak files to the destination."""
         # First, ensure any old versions of this mod's folder are removed to guarantee a clean install.
         self._remove_mod_folders(pak_dst, mod_name)
 
-        # --- Generate pak_data manifest if it doesn't exist ---
-        # This ensures that conflict detection has the data it needs without
-        # having to manually view the contents first.
+        # The pak_data manifest was already generated by _analyze_enabled_mods.
         source_path = os.path.join(self.cfg["mods_folder"], mod_name)
-        try:
-            # This function is smart: it reads from info.json if data exists,
-            # otherwise it generates and saves it.
-            PakInspector.generate_mod_pak_manifest(source_path)
-        except Exception as e:
-            print(f"Warning: Could not generate pak manifest for {mod_name}: {e}")
-        
-        priority_prefix = str(priority).zfill(3)
-        target_folder = f"{priority_prefix}.{mod_name}"
+
+        target_folder = self._target_folder(mod_name, priority)
         target_path = os.path.join(pak_dst, target_folder)
 
         # Failsafe: Clean target directory if it exists to prevent orphaned files
@@ -247,10 +326,10 @@ class PakBatchProcessor:
                 if os.path.isdir(folder_path):
                     shutil.rmtree(folder_path, ignore_errors=True)
 
-    def _clean_all_managed_folders(self, pak_dst: str) -> None:
+    def _clean_all_managed_folders(self, pak_dst: str, keep=frozenset()) -> None:
         """
-        Removes all CrossPatch-managed mod folders from the game's mod directory.
-        This is the primary cleanup mechanism.
+        Removes all CrossPatch-managed mod folders from the game's mod directory,
+        except the folder names in `keep`. This is the primary cleanup mechanism.
         """
         self.signals.progress_text.emit("Cleaning game's mod directory...")
         if not os.path.isdir(pak_dst):
@@ -259,21 +338,23 @@ class PakBatchProcessor:
         managed_folder_pattern = re.compile(r"^\d{3,}\..+")
         for item in os.listdir(pak_dst):
             item_path = os.path.join(pak_dst, item)
-            if os.path.isdir(item_path) and managed_folder_pattern.match(item):
+            if item not in keep and os.path.isdir(item_path) and managed_folder_pattern.match(item):
                 shutil.rmtree(item_path, ignore_errors=True)
 
+    @traced("check_conflicts_for_mod", "conflicts")
     def _check_conflicts_for_mod(self, mod_name_to_check: str, all_mods_list: List[Dict]) -> Dict:
         """
         Checks a single mod for conflicts against all other enabled mods in the list.
         This is a simplified version of Util.check_mod_conflicts, adapted for the batch processor.
         """
         import Util  # Local import
+        import ModCatalog
         conflicts = {}
         mods_folder = self.cfg["mods_folder"]
 
         # Get info for the mod we are checking
         mod_path_to_check = os.path.join(mods_folder, mod_name_to_check)
-        mod_info_to_check = Util.read_mod_info(mod_path_to_check)
+        mod_info_to_check = ModCatalog.catalog.get_info(mod_path_to_check)
 
         # Get active paks for the mod being checked
         active_paks = Util.get_active_pak_files(mod_path_to_check, mod_info_to_check, self.profile_data)
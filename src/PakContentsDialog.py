@@ -0,0 +1,425 @@
+"""
+Viewer for the files inside a mod's pak/IoStore archives.
+
+The folder tree is built from the manifest's files_index on a worker thread:
+one plain node per folder and file, with folder sizes and file counts summed
+on the way. PakTreeModel exposes those nodes lazily, so Qt only asks for the
+rows of folders the user expands, and the view only paints the visible ones;
+a mod with 150k assets opens as fast as one with ten.
+
+The search box matches against an index of all lowercase paths joined into a
+single string, so finding the next match is one `str.find` rather than a walk
+over the tree. Enter jumps to the next match.
+"""
+
+import bisect
+import threading
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QAbstractItemModel, QModelIndex, QObject, Qt, QTimer, Signal
+from PySide6.QtWidgets import (
+    QDialog, QHBoxLayout, QHeaderView, QLabel, QLineEdit, QPushButton, QStyle,
+    QTreeView, QVBoxLayout
+)
+
+COLUMNS = ["Name", "Size", "Compressed", "Files", "Offset", "Archive"]
+COL_NAME, COL_SIZE, COL_COMPRESSED, COL_FILES, COL_OFFSET, COL_ARCHIVE = range(len(COLUMNS))
+
+
+def format_size(num_bytes: int) -> str:
+    size = float(num_bytes)
+    for unit in ("B", "KB", "MB", "GB"):
+        if size < 1024 or unit == "GB":
+            return f"{int(size)} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+
+
+class PakNode:
+    """A folder (entry is None) or file in the pak tree."""
+    __slots__ = ("name", "parent", "row", "children", "size", "compressed", "files", "entry", "fetched", "order")
+
+    def __init__(self, name: str, parent: Optional["PakNode"], entry: Optional[Dict] = None):
+        self.name = name
+        self.parent = parent
+        self.row = 0
+        self.children = {} if entry is None else None  # name -> node while building, then a sorted list
+        self.size = 0
+        self.compressed = 0
+        self.files = 0
+        self.entry = entry
+        self.fetched = False
+        self.order = None  # (column, Qt.SortOrder) the children are sorted by; None is by name
+
+    @property
+    def is_folder(self) -> bool:
+        return self.entry is None
+
+    def path(self) -> str:
+        parts = []
+        node = self
+        while node.parent is not None:
+            parts.append(node.name)
+            node = node.parent
+        return "/".join(reversed(parts))
+
+
+class PakTree:
+    """The folder tree of a files_index plus a path index for searching."""
+
+    def __init__(self, files_index: List[Dict]):
+        self.root = PakNode("", None)
+        nodes: List[PakNode] = []  # files and folders, in path index order
+        paths: List[str] = []
+        for entry in files_index:
+            parts = [p for p in entry.get("path", "").replace("\\", "/").split("/") if p]
+            if not parts:
+                continue
+            size = int(entry.get("size") or 0)
+            compressed = int(entry.get("compressed_size") or 0)
+
+            # Walk down the folders, creating them as needed.
+            folder = self.root
+            ancestors = [folder]
+            for depth, part in enumerate(parts[:-1]):
+                child = folder.children.get(part)
+                if child is None:
+                    child = folder.children[part] = PakNode(part, folder)
+                    nodes.append(child)
+                    paths.append("/".join(parts[:depth + 1]).lower())
+                elif not child.is_folder:
+                    break  # A file and a folder with the same path; keep the file.
+                folder = child
+                ancestors.append(folder)
+            else:
+                if parts[-1] in folder.children:
+                    continue  # Same file in several archives; the first one wins.
+                node = folder.children[parts[-1]] = PakNode(parts[-1], folder, entry)
+                node.size, node.compressed, node.files = size, compressed, 1
+                nodes.append(node)
+                paths.append("/".join(parts).lower())
+                for ancestor in ancestors:
+                    ancestor.size += size
+                    ancestor.compressed += compressed
+                    ancestor.files += 1
+
+        self._finish(self.root)
+        self._nodes = nodes
+        # One string holding every path, one per line; _starts[i] is where line i begins.
+        self._blob = "\n".join(paths)
+        self._starts = []
+        offset = 0
+        for path in paths:
+            self._starts.append(offset)
+            offset += len(path) + 1
+
+    @staticmethod
+    def _finish(root: PakNode) -> None:
+        """Turns every folder's child dict into a list: folders first, then by name."""
+        stack = [root]
+        while stack:
+            folder = stack.pop()
+            children = sorted(folder.children.values(), key=lambda n: (not n.is_folder, n.name.lower()))
+            for row, child in enumerate(children):
+                child.row = row
+                if child.is_folder:
+                    stack.append(child)
+            folder.children = children
+
+    def find(self, needle: str, after: int = -1) -> int:
+        """
+        Position (in index order) of the first path containing `needle` after
+        position `after`, wrapping around; -1 if there is none.
+        """
+        needle = needle.lower()
+        if not needle or "\n" in needle:
+            return -1
+        start = self._starts[after + 1] if after + 1 < len(self._starts) else len(self._blob)
+        hit = self._blob.find(needle, start)
+        if hit < 0:
+            hit = self._blob.find(needle)
+            if hit < 0:
+                return -1
+        return bisect.bisect_right(self._starts, hit) - 1
+
+    def count(self, needle: str) -> int:
+        """Number of paths containing `needle`."""
+        needle = needle.lower()
+        if not needle or "\n" in needle:
+            return 0
+        count = 0
+        hit = self._blob.find(needle)
+        while hit >= 0:
+            count += 1
+            line_end = self._blob.find("\n", hit + len(needle))
+            if line_end < 0:
+                break
+            hit = self._blob.find(needle, line_end + 1)
+        return count
+
+    def node_at(self, position: int) -> PakNode:
+        return self._nodes[position]
+
+
+class PakTreeModel(QAbstractItemModel):
+    """Lazy item model over a PakTree; a folder's rows appear when it is first expanded."""
+
+    def __init__(self, tree: PakTree, folder_icon, file_icon, parent=None):
+        super().__init__(parent)
+        self._tree = tree
+        self._folder_icon = folder_icon
+        self._file_icon = file_icon
+        self._tree.root.fetched = True
+        self._order = None
+
+    def _node(self, index) -> PakNode:
+        return index.internalPointer() if index.isValid() else self._tree.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self._node(parent)
+        if not node.is_folder or not node.fetched or not 0 <= row < len(node.children):
+            return QModelIndex()
+        return self.createIndex(row, column, node.children[row])
+
+    def parent(self, index=QModelIndex()):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self._tree.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        node = self._node(parent)
+        return len(node.children) if node.is_folder and node.fetched else 0
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self._node(parent)
+        return node.is_folder and bool(node.children)
+
+    def canFetchMore(self, parent):
+        node = self._node(parent)
+        return node.is_folder and not node.fetched and bool(node.children)
+
+    def fetchMore(self, parent):
+        node = self._node(parent)
+        if not self.canFetchMore(parent):
+            return
+        if node.order != self._order:
+            self._sort_children(node)
+        self.beginInsertRows(parent, 0, len(node.children) - 1)
+        node.fetched = True
+        self.endInsertRows()
+
+    @staticmethod
+    def _sort_value(node: PakNode, column: int):
+        if column == COL_SIZE:
+            return node.size
+        if column == COL_COMPRESSED:
+            return node.compressed
+        if column == COL_FILES:
+            return node.files
+        if column == COL_OFFSET:
+            try:
+                return int(node.entry.get("offset") or 0) if node.entry else 0
+            except (TypeError, ValueError):
+                return 0
+        if column == COL_ARCHIVE:
+            return (node.entry.get("archive") or "").lower() if node.entry else ""
+        return node.name.lower()
+
+    def _sort_children(self, folder: PakNode) -> None:
+        """Sorts one folder's children by the current order; folders always come first."""
+        column, order = self._order or (COL_NAME, Qt.AscendingOrder)
+        descending = order == Qt.DescendingOrder
+        folder.children.sort(
+            key=lambda n: (n.is_folder if descending else not n.is_folder, self._sort_value(n, column)),
+            reverse=descending)
+        for row, child in enumerate(folder.children):
+            child.row = row
+        folder.order = self._order
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Re-sorts the expanded folders now; the others are sorted when first expanded."""
+        new_order = None if (column, order) == (COL_NAME, Qt.AscendingOrder) else (column, order)
+        if new_order == self._order:
+            return
+        self.layoutAboutToBeChanged.emit()
+        self._order = new_order
+        persistent = self.persistentIndexList()
+        stack = [self._tree.root]
+        while stack:
+            folder = stack.pop()
+            self._sort_children(folder)
+            stack.extend(child for child in folder.children if child.is_folder and child.fetched)
+        self.changePersistentIndexList(
+            persistent,
+            [self.createIndex(p.internalPointer().row, p.column(), p.internalPointer()) for p in persistent])
+        self.layoutChanged.emit()
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return COLUMNS[section]
+        if orientation == Qt.Horizontal and role == Qt.TextAlignmentRole and section in (COL_SIZE, COL_COMPRESSED, COL_FILES, COL_OFFSET):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+        if role == Qt.DisplayRole:
+            if column == COL_NAME:
+                return node.name
+            if column == COL_SIZE:
+                return format_size(node.size)
+            if column == COL_COMPRESSED:
+                return format_size(node.compressed) if node.compressed else ""
+            if column == COL_FILES:
+                return f"{node.files:,}" if node.is_folder else ""
+            if node.is_folder:
+                return ""
+            if column == COL_OFFSET:
+                return str(node.entry.get("offset", ""))
+            if column == COL_ARCHIVE:
+                return node.entry.get("archive", "")
+        elif role == Qt.DecorationRole and column == COL_NAME:
+            return self._folder_icon if node.is_folder else self._file_icon
+        elif role == Qt.TextAlignmentRole and column in (COL_SIZE, COL_COMPRESSED, COL_FILES, COL_OFFSET):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        elif role == Qt.ToolTipRole and column == COL_NAME:
+            return node.path()
+        return None
+
+    def index_of(self, node: PakNode) -> QModelIndex:
+        """Index of any node, fetching the folders above it first."""
+        chain = []
+        while node.parent is not None:
+            chain.append(node)
+            node = node.parent
+        parent_index = QModelIndex()
+        for child in reversed(chain):
+            self.fetchMore(parent_index)
+            parent_index = self.index(child.row, 0, parent_index)
+        return parent_index
+
+
+class _TreeBuilder(QObject):
+    """Builds a PakTree on a worker thread and hands it back on the GUI thread."""
+    built = Signal(object)  # PakTree, or an error message
+
+    def start(self, files_index):
+        threading.Thread(target=self._run, args=(files_index,), daemon=True, name="PakTreeBuild").start()
+
+    def _run(self, files_index):
+        try:
+            self.built.emit(PakTree(files_index))
+        except Exception as e:
+            print(f"Could not build the pak file tree: {e}")
+            self.built.emit(str(e))
+
+
+class PakContentsDialog(QDialog):
+    """Shows the file tree of a mod's pak data with folder totals and path search."""
+
+    def __init__(self, parent, title, pak_data):
+        super().__init__(parent)
+        self.setWindowTitle(f"Pak Contents - {title}")
+        self.tree_data: Optional[PakTree] = None
+        self.model: Optional[PakTreeModel] = None
+        self._match = -1
+
+        layout = QVBoxLayout(self)
+
+        total_files = pak_data.get('total_files', 0)
+        total_size = pak_data.get('total_size', 0)
+        layout.addWidget(QLabel(f"Files: {total_files:,}  Total size: {format_size(total_size)} ({total_size:,} bytes)"))
+
+        search_layout = QHBoxLayout()
+        self.search_entry = QLineEdit()
+        self.search_entry.setPlaceholderText("Find path... (Enter for next match)")
+        self.search_entry.setClearButtonEnabled(True)
+        self.search_entry.setEnabled(False)
+        self.search_entry.returnPressed.connect(self.find_next)
+        # Count matches once typing pauses; jumping waits for Enter or the pause.
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(self._on_search_changed)
+        self.search_entry.textChanged.connect(self._search_timer.start)
+        search_layout.addWidget(self.search_entry)
+        self.match_label = QLabel("")
+        search_layout.addWidget(self.match_label)
+        layout.addLayout(search_layout)
+
+        self.view = QTreeView()
+        self.view.setUniformRowHeights(True)
+        self.view.setAlternatingRowColors(True)
+        layout.addWidget(self.view)
+
+        self.status_label = QLabel("Building file tree...")
+        layout.addWidget(self.status_label)
+
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        layout.addWidget(close_btn)
+        self.resize(800, 600)
+
+        files_index = pak_data.get('files_index')
+        if files_index:
+            self._builder = _TreeBuilder(self)
+            self._builder.built.connect(self._on_tree_built)
+            self._builder.start(files_index)
+        else:
+            # Fallback for older pak_data format without a detailed index
+            self.status_label.setText("Pak file index is not detailed enough to build a file tree.")
+
+    def _on_tree_built(self, result):
+        if isinstance(result, str):
+            self.status_label.setText(f"Could not build the file tree: {result}")
+            return
+        self.tree_data = result
+        style = self.style()
+        self.model = PakTreeModel(result, style.standardIcon(QStyle.SP_DirIcon), style.standardIcon(QStyle.SP_FileIcon), self)
+        self.view.setModel(self.model)
+        header = self.view.header()
+        header.setStretchLastSection(False)
+        header.setSectionResizeMode(COL_NAME, QHeaderView.Stretch)
+        for column in range(1, len(COLUMNS)):
+            header.setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        header.setSortIndicator(COL_NAME, Qt.AscendingOrder)
+        self.view.setSortingEnabled(True)
+        self.status_label.hide()
+        self.search_entry.setEnabled(True)
+        if self.search_entry.text():
+            self._on_search_changed()
+
+    def _on_search_changed(self):
+        if self.tree_data is None:
+            return
+        text = self.search_entry.text()
+        self._match = -1
+        if not text:
+            self.match_label.setText("")
+            return
+        count = self.tree_data.count(text)
+        self.match_label.setText(f"{count:,} matches" if count else "No matches")
+        if count:
+            self.find_next()
+
+    def find_next(self):
+        if self.tree_data is None:
+            return
+        self._search_timer.stop()
+        position = self.tree_data.find(self.search_entry.text(), self._match)
+        if position < 0:
+            return
+        self._match = position
+        index = self.model.index_of(self.tree_data.node_at(position))
+        self.view.setCurrentIndex(index)
+        self.view.scrollTo(index, QTreeView.PositionAtCenter)
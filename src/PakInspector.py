@@ -1,7 +1,17 @@
 import os
+import collections
 import json
+import signal
 import subprocess
-from typing import Dict, Optional, List
+import threading
+import time
+from typing import Callable, Dict, Optional, List
+
+import IoStoreReader
+import ManifestCache
+import ModCatalog
+from Config import CONFIG_DIR
+from Profiler import traced, annotate
 
 
 def _possible_parser_paths() -> List[str]:
@@ -20,11 +30,309 @@ def _possible_parser_paths() -> List[str]:
     ]
 
 
+class ParserTimeoutError(RuntimeError):
+    """The parser did not finish within its size-derived time budget."""
+
+
+class ParserCancelledError(RuntimeError):
+    """The parse was cancelled by the caller (e.g. from the UI)."""
+
+
+# --- Adaptive timeouts ---
+# The parser's run time is modelled as a fixed start-up overhead plus the
+# archive bytes divided by a throughput. Both are measured on this machine
+# and persisted so that the first parse after a restart already uses them.
+PARSER_STATS_PATH = os.path.join(CONFIG_DIR, "parser_stats.json")
+_DEFAULT_OVERHEAD_S = 3.0
+_DEFAULT_THROUGHPUT_BPS = 20 * 1024 * 1024
+_SMALL_MOD_BYTES = 8 * 1024 * 1024  # Parses below this mostly measure start-up overhead
+_TIMEOUT_SAFETY_FACTOR = 4.0
+_MIN_TIMEOUT_S = 10.0
+_MAX_TIMEOUT_S = 30 * 60.0
+_EWMA_ALPHA = 0.3
+_POLL_INTERVAL_S = 0.25
+_LOW_PRIORITY_NICENESS = 10
+
+_stats_lock = threading.Lock()
+_parser_stats = None
+
+
+def _load_parser_stats() -> Dict:
+    global _parser_stats
+    if _parser_stats is None:
+        stats = {"overhead_s": _DEFAULT_OVERHEAD_S, "throughput_bps": _DEFAULT_THROUGHPUT_BPS}
+        try:
+            with open(PARSER_STATS_PATH, "r", encoding="utf-8") as f:
+                saved = json.load(f)
+            if isinstance(saved, dict):
+                stats.update({k: float(v) for k, v in saved.items() if k in stats and float(v) > 0})
+        except Exception:
+            pass
+        _parser_stats = stats
+    return _parser_stats
+
+
+def _record_parse_timing(total_bytes: int, elapsed: float) -> None:
+    """Folds a successful parse into the measured overhead/throughput."""
+    with _stats_lock:
+        stats = _load_parser_stats()
+        if total_bytes < _SMALL_MOD_BYTES:
+            stats["overhead_s"] += _EWMA_ALPHA * (elapsed - stats["overhead_s"])
+        else:
+            transfer_time = max(elapsed - stats["overhead_s"], 0.1)
+            sample = total_bytes / transfer_time
+            stats["throughput_bps"] += _EWMA_ALPHA * (sample - stats["throughput_bps"])
+        try:
+            with open(PARSER_STATS_PATH, "w", encoding="utf-8") as f:
+                json.dump(stats, f, indent=2)
+        except Exception:
+            pass
+
+
+def archive_bytes(mod_path: str) -> int:
+    """Total size of the .pak/.utoc/.ucas files in a mod folder."""
+    total = 0
+    for root, _, files in os.walk(mod_path):
+        for f in files:
+            if f.lower().endswith(('.pak', '.utoc', '.ucas')):
+                try:
+                    total += os.path.getsize(os.path.join(root, f))
+                except OSError:
+                    pass
+    return total
+
+
+def parser_timeout_for(total_bytes: int) -> float:
+    """Returns the timeout (seconds) for parsing `total_bytes` of archives."""
+    with _stats_lock:
+        stats = _load_parser_stats()
+        expected = stats["overhead_s"] + total_bytes / stats["throughput_bps"]
+    return min(max(expected * _TIMEOUT_SAFETY_FACTOR, _MIN_TIMEOUT_S), _MAX_TIMEOUT_S)
+
+
+def _start_parser(cmd: List[str], low_priority: bool, **popen_kwargs) -> subprocess.Popen:
+    """Starts the parser process, below normal scheduling priority if `low_priority`."""
+    if low_priority and os.name == 'nt':
+        popen_kwargs["creationflags"] = subprocess.BELOW_NORMAL_PRIORITY_CLASS
+    proc = subprocess.Popen(cmd, start_new_session=(os.name == 'posix'), **popen_kwargs)
+    if low_priority and os.name != 'nt':
+        # Lowered after the spawn: a preexec_fn can deadlock the child of a threaded process.
+        try:
+            niceness = min(os.getpriority(os.PRIO_PROCESS, 0) + _LOW_PRIORITY_NICENESS, 19)
+            os.setpriority(os.PRIO_PROCESS, proc.pid, niceness)
+        except OSError as e:
+            print(f"Could not lower the parser's priority: {e}")
+    return proc
+
+
+def _signal_kill(proc: subprocess.Popen) -> None:
+    """Kills the parser and anything it spawned, without reaping it."""
+    try:
+        if os.name == 'posix':
+            os.killpg(proc.pid, signal.SIGKILL)
+        else:
+            proc.kill()
+    except (ProcessLookupError, PermissionError, OSError):
+        pass
+
+
+def _kill_parser(proc: subprocess.Popen) -> None:
+    """Kills the parser (and anything it spawned) and reaps it."""
+    _signal_kill(proc)
+    try:
+        proc.communicate(timeout=5)
+    except subprocess.TimeoutExpired:
+        pass
+
+
+class _NdjsonUnsupported(Exception):
+    """The parser binary predates the --ndjson output mode."""
+
+
+# Parser binaries, as (path, mtime), that rejected --ndjson. They are run in
+# the single-document mode instead until they are rebuilt.
+_ndjson_unsupported = set()
+_PROGRESS_EVERY_RECORDS = 1000
+
+
+class _NdjsonManifestLoader:
+    """
+    Builds the parser's result dict from --ndjson records as they arrive.
+
+    Records are {"type": "header" | "asset" | "archive" | "end", ...}. Archive
+    records carry no file list; like the single-document output, every archive
+    is credited with all assets, so they share one path list. Unknown record
+    types are ignored so the format can grow.
+    """
+
+    def __init__(self):
+        self.header = None
+        self.end = None
+        self.pak_files: List[Dict] = []
+        self.files_index: List[Dict] = []
+        self._paths: List[str] = []
+
+    @property
+    def started(self) -> bool:
+        return self.header is not None
+
+    def feed(self, line: str) -> None:
+        line = line.strip()
+        if not line:
+            return
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise RuntimeError(f"Malformed parser record: {e}; line starts with: {line[:200]!r}")
+        kind = record.pop("type", None)
+        if kind == "asset":
+            self.files_index.append(record)
+            self._paths.append(record.get("path", ""))
+        elif kind == "archive":
+            record["files"] = self._paths
+            self.pak_files.append(record)
+        elif kind == "header":
+            self.header = record
+        elif kind == "end":
+            self.end = record
+
+    def result(self) -> Dict:
+        if self.end is None:
+            raise RuntimeError("Parser output ended before its end record")
+        result = {k: v for k, v in (self.header or {}).items() if k != "format"}
+        result["pak_data"] = {
+            "pak_files": self.pak_files,
+            "files_index": self.files_index,
+            "total_files": self.end.get("total_files", 0),
+            "total_size": self.end.get("total_size", 0),
+        }
+        return result
+
+
+def _find_parser() -> str:
+    for p in _possible_parser_paths():
+        if os.path.exists(p):
+            return p
+    raise FileNotFoundError(
+        "CrossPatchParser executable not found. Please run the build script to publish the tool for your platform. "
+        "On Linux/macOS ensure you either publish a self-contained executable or have the .NET runtime installed to run the DLL via 'dotnet'."
+    )
+
+
+def _parser_key(parser_path: str):
+    try:
+        return parser_path, os.path.getmtime(parser_path)
+    except OSError:
+        return parser_path, None
+
+
+def _watch_parser(proc: subprocess.Popen, started: float, timeout: float,
+                  cancel_event: Optional[threading.Event], outcome: Dict) -> None:
+    """Kills a streaming parser on cancel or timeout; the reader then sees EOF."""
+    while proc.poll() is None:
+        if cancel_event is not None and cancel_event.is_set():
+            outcome["stopped"] = "cancelled"
+            _signal_kill(proc)
+            return
+        if time.monotonic() - started > timeout:
+            outcome["stopped"] = "timeout"
+            _signal_kill(proc)
+            return
+        time.sleep(_POLL_INTERVAL_S)
+
+
+def _run_parser_streaming(cmd: List[str], mod_path: str, started: float, timeout: float,
+                          cancel_event: Optional[threading.Event], low_priority: bool,
+                          progress_callback: Optional[Callable[[int], None]]) -> Dict:
+    """Runs the parser with --ndjson and builds the result while it is still running."""
+    proc = _start_parser(cmd + ["--ndjson"], low_priority, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                         text=True, encoding="utf-8", errors="replace", bufsize=1 << 16)
+
+    # stderr is drained on its own thread so a chatty parser can't block on a
+    # full pipe; only the tail is kept for error messages.
+    stderr_tail = collections.deque(maxlen=50)
+    stderr_reader = threading.Thread(target=lambda: stderr_tail.extend(proc.stderr), daemon=True)
+    stderr_reader.start()
+    outcome: Dict = {}
+    threading.Thread(target=_watch_parser, args=(proc, started, timeout, cancel_event, outcome),
+                     daemon=True).start()
+
+    loader = _NdjsonManifestLoader()
+    feed_error = None
+    try:
+        for line in proc.stdout:
+            if not loader.started and not line.lstrip().startswith("{"):
+                continue  # e.g. the usage text an old parser prints for --ndjson
+            loader.feed(line)
+            if progress_callback and loader.files_index and len(loader.files_index) % _PROGRESS_EVERY_RECORDS == 0:
+                progress_callback(len(loader.files_index))
+    except Exception as e:
+        feed_error = e
+        _signal_kill(proc)
+    proc.wait()
+    stderr_reader.join(timeout=5)
+    err = "".join(stderr_tail)
+
+    # A kill can cut the last record short, so check why we stopped first.
+    if outcome.get("stopped") == "cancelled":
+        raise ParserCancelledError(f"Parsing {os.path.basename(mod_path)} was cancelled")
+    if outcome.get("stopped") == "timeout":
+        raise ParserTimeoutError(f"Parser timed out after {timeout:.0f} seconds")
+    if feed_error is not None:
+        raise feed_error
+    if proc.returncode != 0:
+        if not loader.started and "--ndjson" in err:
+            raise _NdjsonUnsupported()
+        raise RuntimeError(f"Parser failed: {err}")
+    if not loader.started:
+        raise RuntimeError(f"Parser produced no output. Stderr: {err.strip()}")
+    if progress_callback:
+        progress_callback(len(loader.files_index))
+    return loader.result()
+
+
+def _run_parser_buffered(cmd: List[str], mod_path: str, started: float, timeout: float,
+                         cancel_event: Optional[threading.Event], low_priority: bool) -> Dict:
+    """Runs a parser that only knows the single-document output and parses it at the end."""
+    proc = _start_parser(cmd, low_priority, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True)
+    # Poll instead of blocking in communicate() so that a cancel request from
+    # the UI takes effect within a fraction of a second.
+    while True:
+        try:
+            out, err = proc.communicate(timeout=_POLL_INTERVAL_S)
+            break
+        except subprocess.TimeoutExpired:
+            if cancel_event is not None and cancel_event.is_set():
+                _kill_parser(proc)
+                raise ParserCancelledError(f"Parsing {os.path.basename(mod_path)} was cancelled")
+            if time.monotonic() - started > timeout:
+                _kill_parser(proc)
+                raise ParserTimeoutError(f"Parser timed out after {timeout:.0f} seconds")
+
+    if proc.returncode != 0:
+        raise RuntimeError(f"Parser failed: {err or ''}")
+    out = out.strip()
+    if not out:
+        # If stdout is empty, include stderr for diagnostics
+        raise RuntimeError(f"Parser produced no output. Stderr: {err.strip()}")
+    try:
+        return json.loads(out)
+    except json.JSONDecodeError as e:
+        raise RuntimeError(f"Failed to parse tool output: {e}; output starts with: {out[:200]!r}")
+
+
+@traced("run_parser", "parse")
 def run_parser(mod_path: str, name: Optional[str] = None, author: Optional[str] = None,
                version: Optional[str] = None, mount_point: Optional[str] = None,
-               parser_path: Optional[str] = None) -> Dict:
+               parser_path: Optional[str] = None, timeout: Optional[float] = None,
+               cancel_event: Optional[threading.Event] = None, low_priority: bool = False,
+               progress_callback: Optional[Callable[[int], None]] = None) -> Dict:
     """
     Runs the CrossPatchParser tool to analyze pak files in a mod folder.
+
+    The parser's --ndjson output is consumed line by line as it is produced,
+    so the whole output never has to sit in memory as one string. Parser
+    builds without --ndjson fall back to the single JSON document output.
     
     Args:
         mod_path: Path to the mod folder containing pak file(s)
@@ -33,25 +341,22 @@ def run_parser(mod_path: str, name: Optional[str] = None, author: Optional[str]
         version: Optional mod version
         mount_point: Optional mount point override
         parser_path: Optional path to parser executable (to avoid searching multiple times)
-        author: Optional mod author
-        version: Optional mod version
-        mount_point: Optional mount point for pak files
+        timeout: Optional timeout in seconds. Derived from the mod's archive
+            size and the measured parser throughput when omitted.
+        cancel_event: Optional threading.Event; setting it kills the parser.
+        low_priority: Run the parser below normal priority (background work).
+        progress_callback: Optional callable(assets_read), called from this
+            thread while a streaming parse is running.
 
     Returns:
         Dict containing the parsed information
-    """
-    possible_paths = _possible_parser_paths()
-    parser_path = None
-    for p in possible_paths:
-        if os.path.exists(p):
-            parser_path = p
-            break
 
+    Raises:
+        ParserTimeoutError: If the parser exceeded its time budget.
+        ParserCancelledError: If cancel_event was set.
+    """
     if not parser_path:
-        raise FileNotFoundError(
-            "CrossPatchParser executable not found. Please run the build script to publish the tool for your platform. "
-            "On Linux/macOS ensure you either publish a self-contained executable or have the .NET runtime installed to run the DLL via 'dotnet'."
-        )
+        parser_path = _find_parser()
 
     # Determine how to invoke the parser: if it's a .dll, use `dotnet <dll>`;
     # otherwise attempt to execute the found file directly. This covers
@@ -69,23 +374,32 @@ def run_parser(mod_path: str, name: Optional[str] = None, author: Optional[str]
     if mount_point:
         cmd.extend(["--mount-point", mount_point])
 
-    try:
-        # Prevent hangs by adding a timeout (seconds). 30s is a reasonable default
-        # for analyzing a small set of pak files; adjust if needed.
-        result = subprocess.run(cmd, capture_output=True, text=True, check=True, timeout=30)
-        out = result.stdout.strip()
-        if not out:
-            # If stdout is empty, include stderr for diagnostics
-            raise RuntimeError(f"Parser produced no output. Stderr: {result.stderr.strip()}")
+    total_bytes = archive_bytes(mod_path)
+    annotate(bytes=total_bytes, detail=os.path.basename(mod_path))
+    if timeout is None:
+        timeout = parser_timeout_for(total_bytes)
+
+    started = time.monotonic()
+    result = None
+    key = _parser_key(parser_path)
+    if key not in _ndjson_unsupported:
         try:
-            return json.loads(out)
-        except json.JSONDecodeError as e:
-            raise RuntimeError(f"Failed to parse tool output: {e}; output starts with: {out[:200]!r}")
-    except subprocess.TimeoutExpired:
-        raise RuntimeError("Parser timed out after 30 seconds")
-    except subprocess.CalledProcessError as e:
-        stderr = e.stderr or ""
-        raise RuntimeError(f"Parser failed: {stderr}")
+            result = _run_parser_streaming(cmd, mod_path, started, timeout, cancel_event, low_priority, progress_callback)
+        except _NdjsonUnsupported:
+            print(f"{os.path.basename(parser_path)} has no streaming output; using the single document output.")
+            _ndjson_unsupported.add(key)
+            started = time.monotonic()
+    if result is None:
+        result = _run_parser_buffered(cmd, mod_path, started, timeout, cancel_event, low_priority)
+
+    if not low_priority:
+        # Deprioritised runs are slower by design and would skew the timeout model.
+        _record_parse_timing(total_bytes, time.monotonic() - started)
+    if isinstance(result, dict):
+        annotate(items=len((result.get("pak_data") or {}).get("files_index") or ()))
+    return result
+
+
 def self_contained_parser_available() -> bool:
     """Return True if a self-contained (native) parser executable exists for this platform.
 
@@ -110,48 +424,188 @@ def self_contained_parser_available() -> bool:
                 return True
     return False
 
-def generate_mod_pak_manifest(mod_path: str) -> Dict:
+def _iostore_container_part(mod_path: str, utoc_path: str, ucas_path: str) -> Optional[Dict]:
+    """Partial manifest for one IoStore container, or None if its TOC can't be indexed."""
+    try:
+        toc = IoStoreReader.read_utoc(utoc_path)
+    except (IoStoreReader.IoStoreError, OSError) as e:
+        print(f"IoStore fast path unavailable for {os.path.basename(utoc_path)}: {e}")
+        return None
+
+    archive_name = os.path.basename(utoc_path)
+    base_name = os.path.splitext(archive_name)[0]
+    pak_file = {
+        "file_name": f"{base_name} (IoStore)",
+        "utoc_path": os.path.relpath(utoc_path, mod_path),
+        "ucas_path": os.path.relpath(ucas_path, mod_path),
+        "file_count": len(toc.entries),
+        "total_size": toc.total_size,
+        "mount_point": toc.mount_point,
+        "files": [e[0] for e in toc.entries],
+    }
+    files_index = [
+        {"path": path, "size": size, "compressed_size": compressed_size, "offset": offset, "archive": archive_name}
+        for path, size, compressed_size, offset in toc.entries
+    ]
+    return {"pak_files": [pak_file], "files_index": files_index}
+
+
+def generate_iostore_manifest(mod_path: str) -> Optional[Dict]:
+    """
+    Builds a pak manifest straight from the .utoc files of an IoStore-only mod.
+
+    Only the TOCs are read, so this is cheap even for multi-gigabyte .ucas
+    payloads. Returns None when the mod ships standalone .pak files or a TOC
+    cannot be indexed (e.g. encrypted), in which case the full parser is needed.
+    """
+    containers, standalone_paks = IoStoreReader.find_iostore_containers(mod_path)
+    if not containers or standalone_paks:
+        return None
+
+    parts = {}
+    for utoc_path, ucas_path in containers:
+        part = _iostore_container_part(mod_path, utoc_path, ucas_path)
+        if part is None:
+            return None
+        parts[utoc_path] = part
+    return ManifestCache.assemble_manifest(parts)
+
+
+# Cache group holding every archive of a mod that must go through CrossPatchParser.
+# The parser works on whole folders, so any change in the group re-parses all of it.
+PARSER_GROUP = "*"
+
+
+def _archive_groups(mod_path: str, fingerprints: Dict[str, list]):
+    """
+    Splits a mod's archive fingerprints into cache groups.
+
+    IoStore-only mods get one group per container (keyed by its .utoc path) so
+    a changed container is re-read on its own. Anything else is one parser group,
+    as is an IoStore-only mod that already fell back to the parser because a TOC
+    couldn't be read, for as long as its archives are unchanged.
+
+    Returns:
+        ({group_key: {rel_path: fingerprint}}, {group_key: (utoc_rel, ucas_rel)})
+    """
+    if not fingerprints:
+        return {}, {}
+    containers, standalone_paks = IoStoreReader.pair_containers(list(fingerprints))
+    if (not containers or standalone_paks
+            or ManifestCache.manifest_cache.has_group(mod_path, PARSER_GROUP, fingerprints)):
+        return {PARSER_GROUP: dict(fingerprints)}, {}
+
+    groups = {}
+    container_paths = {}
+    for utoc_rel, ucas_rel in containers:
+        stub_rel = os.path.splitext(utoc_rel)[0] + ".pak"
+        members = [utoc_rel, ucas_rel] + ([stub_rel] if stub_rel in fingerprints else [])
+        groups[utoc_rel] = {rel: fingerprints[rel] for rel in members}
+        container_paths[utoc_rel] = (utoc_rel, ucas_rel)
+    return groups, container_paths
+
+
+def get_cached_manifest(mod_path: str, include_index: bool = True) -> Optional[Dict]:
+    """
+    Returns the mod's manifest if every archive group is cached and unchanged,
+    otherwise None. Never runs the parser and never reads info.json.
+
+    With include_index=False the per-asset files_index is not loaded, which is
+    all conflict checks and "is this mod analyzed yet" checks need.
+    """
+    groups, _ = _archive_groups(mod_path, ManifestCache.archive_fingerprints(mod_path))
+    parts = ManifestCache.manifest_cache.lookup(mod_path, groups, include_index=include_index)
+    if len(parts) != len(groups):
+        return None
+    return ManifestCache.assemble_manifest(parts)
+
+
+def generate_mod_pak_manifest(mod_path: str, cancel_event: Optional[threading.Event] = None,
+                              low_priority: bool = False,
+                              progress_callback: Optional[Callable[[int], None]] = None) -> Optional[Dict]:
     """
     Analyzes all pak files in a mod folder and generates a detailed manifest.
 
+    Results are cached in the central manifest cache keyed by archive
+    fingerprints; only archive groups whose fingerprints changed are parsed.
+
     Args:
         mod_path: Path to the mod folder containing pak file(s)
+        cancel_event: Optional threading.Event that aborts a running parse
+        low_priority: Run the external parser below normal priority
+        progress_callback: Optional callable(assets_read) for external parses
 
     Returns:
-        Dict containing details about all pak files in the mod
+        Dict containing details about all pak files in the mod, or None if the
+        contents are unknown because the parse timed out or was cancelled.
+        Unknown results are never cached, so the next call tries again.
     """
-    # Fast path: if the mod already has info.json with pak_data, reuse it
     try:
-        info_path = os.path.join(mod_path, "info.json")
-        if os.path.exists(info_path):
-            try:
-                with open(info_path, "r", encoding="utf-8") as f:
-                    info = json.load(f)
-                pak_data = info.get('pak_data')
-                if pak_data:
-                    return pak_data
-            except Exception:
-                # Fall back to running parser if info.json malformed
-                pass
+        fingerprints = ManifestCache.archive_fingerprints(mod_path)
+        groups, container_paths = _archive_groups(mod_path, fingerprints)
+        parts = ManifestCache.manifest_cache.lookup(mod_path, groups)
+        stale = [g for g in groups if g not in parts]
+        if not stale:
+            manifest = ManifestCache.assemble_manifest(parts)
+            ModCatalog.catalog.record_manifest(mod_path, fingerprints, manifest)
+            return manifest
 
-        result = run_parser(mod_path)
-        pak = result.get('pak_data', {})
+        if PARSER_GROUP not in groups:
+            # IoStore-only: re-read just the containers that changed.
+            for group_key in stale:
+                utoc_rel, ucas_rel = container_paths[group_key]
+                part = _iostore_container_part(mod_path, os.path.join(mod_path, utoc_rel), os.path.join(mod_path, ucas_rel))
+                if part is None:
+                    # A TOC we can't read (e.g. encrypted): let the parser handle the whole mod.
+                    groups = {PARSER_GROUP: dict(fingerprints)}
+                    parts = {}
+                    break
+                parts[group_key] = part
 
-        # Persist to info.json to speed up future runs
-        try:
-            if os.path.exists(info_path):
-                with open(info_path, "r", encoding="utf-8") as f:
-                    info = json.load(f)
-            else:
-                info = {}
-            info['pak_data'] = pak
-            with open(info_path, "w", encoding="utf-8") as f:
-                json.dump(info, f, indent=2)
-        except Exception:
-            # Non-fatal - ignore persistence failures
-            pass
+        if PARSER_GROUP in groups:
+            result = run_parser(mod_path, cancel_event=cancel_event, low_priority=low_priority,
+                                progress_callback=progress_callback)
+            parts = {PARSER_GROUP: result.get('pak_data', {})}
 
-        return pak
+        ManifestCache.manifest_cache.store(mod_path, groups, parts)
+        manifest = ManifestCache.assemble_manifest(parts)
+        ModCatalog.catalog.record_manifest(mod_path, fingerprints, manifest)
+        return manifest
+    except (ParserTimeoutError, ParserCancelledError) as e:
+        print(f"Pak contents of {os.path.basename(mod_path)} unknown: {e}")
+        return None
     except Exception as e:
         print(f"Warning: Pak analysis failed: {e}")
-        return {'pak_files': [], 'total_files': 0, 'total_size': 0}
\ No newline at end of file
+        return {'pak_files': [], 'total_files': 0, 'total_size': 0}
+
+def import_legacy_manifest(mod_path: str, pak_data: Dict, written_at_ns: int) -> bool:
+    """
+    Stores a manifest that an older CrossPatch kept in info.json ("pak_data")
+    in the manifest cache, so the mod doesn't have to be parsed again.
+
+    Legacy manifests carry no fingerprints. One is taken as still valid when
+    it names exactly the archives the mod has now and none of them changed
+    after `written_at_ns` (the info.json mtime); it is then cached as a parser
+    group under the current fingerprints.
+
+    Returns:
+        True if the manifest was imported (or the mod is already cached).
+    """
+    fingerprints = ManifestCache.archive_fingerprints(mod_path)
+    if not fingerprints or get_cached_manifest(mod_path, include_index=False) is not None:
+        return bool(fingerprints)
+    pak_files = pak_data.get("pak_files") if isinstance(pak_data, dict) else None
+    if not pak_files or "files_index" not in pak_data:
+        return False
+    listed = set()
+    for pak in pak_files:
+        for key in ("file_path", "utoc_path", "ucas_path"):
+            if pak.get(key):
+                listed.add(pak[key].replace("\\", "/"))
+    if listed != set(fingerprints) or any(fp[1] > written_at_ns for fp in fingerprints.values()):
+        return False
+    groups = {PARSER_GROUP: dict(fingerprints)}
+    parts = {PARSER_GROUP: pak_data}
+    ManifestCache.manifest_cache.store(mod_path, groups, parts)
+    ModCatalog.catalog.record_manifest(mod_path, fingerprints, ManifestCache.assemble_manifest(parts))
+    return True
@@ -0,0 +1,248 @@
+"""
+Compact binary storage for cached pak manifests.
+
+A manifest file holds every archive group of one mod. Small, irregular data
+(pak entries without their file lists, group layout, archive names) is kept as
+a JSON "META" section; the bulky per-asset data is stored column by column:
+
+    PREF/SUFL/SUFX  sorted, de-duplicated asset paths, front-coded
+                    (shared prefix length, suffix length, suffix bytes)
+    PAKF            path ids listed by each pak entry, concatenated
+    FIDX            path id of each files_index row
+    FSIZ/FCSZ/FOFF  size, compressed size and offset of each row (uint64)
+    FARC            archive id of each row (uint16, names in META)
+
+The file is memory-mapped and a column is only decoded when it is needed, so
+e.g. a conflict check never touches the size and offset columns.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Dict, List, Optional
+
+MAGIC = b"CPMF"
+FORMAT_VERSION = 1
+FILE_EXTENSION = ".cpm"
+
+# magic, version, flags, section count; then per section: tag, offset, length
+_HEADER = struct.Struct("<4sHHI")
+_SECTION = struct.Struct("<4sQQ")
+_MAX_PREFIX = 0xFFFF
+
+
+class ManifestFormatError(ValueError):
+    """Raised when a manifest file is truncated, corrupt or of an unknown version."""
+
+
+def _column_bytes(typecode: str, values) -> bytes:
+    arr = array(typecode, values)
+    if sys.byteorder != "little":
+        arr.byteswap()
+    return arr.tobytes()
+
+
+def _front_code(paths: List[str]):
+    prefix_lens = array("H")
+    suffix_lens = array("I")
+    suffixes = bytearray()
+    prev = b""
+    for path in paths:
+        cur = path.encode("utf-8")
+        limit = min(len(prev), len(cur), _MAX_PREFIX)
+        shared = 0
+        while shared < limit and prev[shared] == cur[shared]:
+            shared += 1
+        prefix_lens.append(shared)
+        suffix_lens.append(len(cur) - shared)
+        suffixes += cur[shared:]
+        prev = cur
+    return prefix_lens, suffix_lens, bytes(suffixes)
+
+
+def write_manifest(path: str, parts: Dict[str, Dict]) -> None:
+    """Writes {group_key: partial manifest} to `path` (atomically)."""
+    all_paths = set()
+    for part in parts.values():
+        for pak in part.get("pak_files", []):
+            all_paths.update(pak.get("files", []))
+        all_paths.update(e.get("path", "") for e in part.get("files_index", []))
+    sorted_paths = sorted(all_paths)
+    path_ids = {p: i for i, p in enumerate(sorted_paths)}
+
+    archives: List[str] = []
+    archive_ids: Dict[str, int] = {}
+    pak_file_ids = []
+    row_paths, row_sizes, row_csizes, row_offsets, row_archives = [], [], [], [], []
+    groups_meta = {}
+    for group_key in sorted(parts):
+        part = parts[group_key]
+        pak_meta = []
+        for pak in part.get("pak_files", []):
+            entry = {k: v for k, v in pak.items() if k != "files"}
+            files = pak.get("files", [])
+            entry["files_range"] = [len(pak_file_ids), len(files)]
+            pak_file_ids.extend(path_ids[f] for f in files)
+            pak_meta.append(entry)
+        index = part.get("files_index", [])
+        groups_meta[group_key] = {"pak_files": pak_meta, "files_index_range": [len(row_paths), len(index)]}
+        for e in index:
+            archive = e.get("archive", "")
+            if archive not in archive_ids:
+                archive_ids[archive] = len(archives)
+                archives.append(archive)
+            row_paths.append(path_ids[e.get("path", "")])
+            row_sizes.append(int(e.get("size") or 0))
+            row_csizes.append(int(e.get("compressed_size") or 0))
+            row_offsets.append(int(e.get("offset") or 0))
+            row_archives.append(archive_ids[archive])
+
+    prefix_lens, suffix_lens, suffixes = _front_code(sorted_paths)
+    meta = {"groups": groups_meta, "archives": archives}
+    sections = [
+        (b"META", json.dumps(meta, separators=(",", ":")).encode("utf-8")),
+        (b"PREF", _column_bytes("H", prefix_lens)),
+        (b"SUFL", _column_bytes("I", suffix_lens)),
+        (b"SUFX", suffixes),
+        (b"PAKF", _column_bytes("I", pak_file_ids)),
+        (b"FIDX", _column_bytes("I", row_paths)),
+        (b"FSIZ", _column_bytes("Q", row_sizes)),
+        (b"FCSZ", _column_bytes("Q", row_csizes)),
+        (b"FOFF", _column_bytes("Q", row_offsets)),
+        (b"FARC", _column_bytes("H", row_archives)),
+    ]
+
+    offset = _HEADER.size + _SECTION.size * len(sections)
+    table = bytearray(_HEADER.pack(MAGIC, FORMAT_VERSION, 0, len(sections)))
+    for tag, data in sections:
+        table += _SECTION.pack(tag, offset, len(data))
+        offset += len(data)
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(table)
+        for _, data in sections:
+            f.write(data)
+    os.replace(tmp_path, path)
+
+
+class ManifestFile:
+    """
+    Read-only, memory-mapped view of a manifest file.
+
+    Not thread-safe; ManifestCache only touches it while holding its lock.
+    Call close() before the file is replaced (Windows can't replace mapped files).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._sections = self._read_section_table()
+            self.meta = json.loads(bytes(self._section(b"META")).decode("utf-8"))
+        except Exception:
+            self.close()
+            raise
+        self._paths: Optional[List[str]] = None
+
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+
+    def _read_section_table(self):
+        if len(self._mmap) < _HEADER.size:
+            raise ManifestFormatError(f"{self.path} is truncated")
+        magic, version, _, count = _HEADER.unpack_from(self._mmap, 0)
+        if magic != MAGIC:
+            raise ManifestFormatError(f"{self.path} is not a manifest file")
+        if version != FORMAT_VERSION:
+            raise ManifestFormatError(f"{self.path} has unsupported format version {version}")
+        sections = {}
+        for i in range(count):
+            tag, offset, length = _SECTION.unpack_from(self._mmap, _HEADER.size + i * _SECTION.size)
+            if offset + length > len(self._mmap):
+                raise ManifestFormatError(f"{self.path} is truncated")
+            sections[tag] = (offset, length)
+        return sections
+
+    def _section(self, tag: bytes) -> memoryview:
+        try:
+            offset, length = self._sections[tag]
+        except KeyError:
+            raise ManifestFormatError(f"{self.path} has no {tag.decode()} section")
+        return memoryview(self._mmap)[offset:offset + length]
+
+    def _column(self, tag: bytes, typecode: str) -> array:
+        view = self._section(tag)
+        arr = array(typecode)
+        try:
+            arr.frombytes(view)
+        finally:
+            view.release()
+        if sys.byteorder != "little":
+            arr.byteswap()
+        return arr
+
+    @property
+    def groups(self) -> List[str]:
+        return list(self.meta.get("groups", {}))
+
+    def paths(self) -> List[str]:
+        """The de-duplicated path table, decoded on first use."""
+        if self._paths is None:
+            prefix_lens = self._column(b"PREF", "H")
+            suffix_lens = self._column(b"SUFL", "I")
+            suffixes = bytes(self._section(b"SUFX"))
+            paths = []
+            prev = b""
+            pos = 0
+            for shared, length in zip(prefix_lens, suffix_lens):
+                prev = prev[:shared] + suffixes[pos:pos + length]
+                pos += length
+                paths.append(prev.decode("utf-8"))
+            self._paths = paths
+        return self._paths
+
+    def parts(self, groups, include_index: bool = True) -> Dict[str, Dict]:
+        """
+        Rebuilds the partial manifests of the given groups. With
+        include_index=False the per-asset files_index columns are not read.
+        """
+        groups_meta = self.meta.get("groups", {})
+        wanted = [g for g in groups if g in groups_meta]
+        if not wanted:
+            return {}
+        paths = self.paths()
+        pak_file_ids = self._column(b"PAKF", "I")
+        if include_index:
+            row_paths = self._column(b"FIDX", "I")
+            sizes = self._column(b"FSIZ", "Q")
+            csizes = self._column(b"FCSZ", "Q")
+            offsets = self._column(b"FOFF", "Q")
+            row_archives = self._column(b"FARC", "H")
+            archives = self.meta.get("archives", [])
+
+        result = {}
+        for group_key in wanted:
+            group = groups_meta[group_key]
+            pak_files = []
+            for entry in group.get("pak_files", []):
+                pak = {k: v for k, v in entry.items() if k != "files_range"}
+                start, count = entry.get("files_range", [0, 0])
+                pak["files"] = [paths[i] for i in pak_file_ids[start:start + count]]
+                pak_files.append(pak)
+            part = {"pak_files": pak_files}
+            if include_index:
+                start, count = group.get("files_index_range", [0, 0])
+                part["files_index"] = [
+                    {"path": paths[row_paths[i]], "size": sizes[i], "compressed_size": csizes[i],
+                     "offset": offsets[i], "archive": archives[row_archives[i]]}
+                    for i in range(start, start + count)
+                ]
+            result[group_key] = part
+        return result
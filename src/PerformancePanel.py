@@ -0,0 +1,146 @@
+"""
+Settings panel summarising recent operations recorded by Profiler.
+
+Each operation type (process_mods_batch, run_parser, download, ...) is a row with its
+call count, average and longest duration and throughput over the last
+RECENT_OPERATIONS operations; expanding it lists the individual runs. The
+recorded operations can be exported as a Chrome trace for chrome://tracing
+or Perfetto.
+"""
+
+import datetime
+import time
+from collections import OrderedDict
+
+from PySide6.QtWidgets import (
+    QFrame, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QHeaderView, QFileDialog, QMessageBox
+)
+from PySide6.QtGui import QColor
+from PySide6.QtCore import Qt, QTimer
+
+import Profiler
+from PakContentsDialog import format_size
+
+RECENT_OPERATIONS = 200
+REFRESH_INTERVAL_MS = 1000
+
+
+def format_duration(seconds: float) -> str:
+    if seconds < 1:
+        return f"{seconds * 1000:.0f} ms"
+    return f"{seconds:.2f} s"
+
+
+def format_throughput(num_bytes: int, items: int, seconds: float) -> str:
+    if seconds <= 0:
+        return ""
+    if num_bytes:
+        return f"{format_size(num_bytes / seconds)}/s"
+    if items:
+        return f"{items / seconds:.1f} items/s"
+    return ""
+
+
+class PerformancePanel(QFrame):
+    """Recent operation timings, refreshed while visible."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFrameShape(QFrame.StyledPanel)
+        self._shown_count = -1
+
+        layout = QVBoxLayout(self)
+        header = QHBoxLayout()
+        header.addWidget(QLabel("<b>Performance</b>"))
+        self.summary_label = QLabel()
+        header.addWidget(self.summary_label, 1)
+        export_btn = QPushButton("Export Trace...")
+        export_btn.setToolTip("Save recorded operations as a Chrome trace (chrome://tracing or ui.perfetto.dev)")
+        export_btn.clicked.connect(self.export_trace)
+        header.addWidget(export_btn)
+        layout.addLayout(header)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Operation", "Calls", "Avg", "Max", "Data", "Throughput", "Thread"])
+        self.tree.setMinimumHeight(220)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        for column in range(1, 7):
+            self.tree.header().setSectionResizeMode(column, QHeaderView.ResizeToContents)
+        layout.addWidget(self.tree)
+
+        self._refresh_timer = QTimer(self)
+        self._refresh_timer.setInterval(REFRESH_INTERVAL_MS)
+        self._refresh_timer.timeout.connect(self.refresh)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.refresh()
+        self._refresh_timer.start()
+
+    def hideEvent(self, event):
+        self._refresh_timer.stop()
+        super().hideEvent(event)
+
+    def refresh(self):
+        recorded = Profiler.operations_recorded()
+        if recorded == self._shown_count:
+            return
+        self._shown_count = recorded
+        records = Profiler.recent_operations(RECENT_OPERATIONS)
+
+        expanded = {self.tree.topLevelItem(i).text(0) for i in range(self.tree.topLevelItemCount())
+                    if self.tree.topLevelItem(i).isExpanded()}
+        groups = OrderedDict()
+        for rec in reversed(records):  # Newest first
+            groups.setdefault(rec.name, []).append(rec)
+
+        self.tree.clear()
+        for name, runs in sorted(groups.items(), key=lambda item: sum(r.duration for r in item[1]), reverse=True):
+            total_time = sum(r.duration for r in runs)
+            total_bytes = sum(r.bytes for r in runs)
+            total_items = sum(r.items for r in runs)
+            group = QTreeWidgetItem([
+                name,
+                str(len(runs)),
+                format_duration(total_time / len(runs)),
+                format_duration(max(r.duration for r in runs)),
+                format_size(total_bytes) if total_bytes else "",
+                format_throughput(total_bytes, total_items, total_time),
+                "",
+            ])
+            group.setToolTip(0, runs[0].category)
+            for rec in runs:
+                started = datetime.datetime.fromtimestamp(time.time() - (time.perf_counter() - rec.start))
+                child = QTreeWidgetItem([
+                    f"{started:%H:%M:%S}  {rec.detail}",
+                    "",
+                    format_duration(rec.duration),
+                    "",
+                    format_size(rec.bytes) if rec.bytes else (f"{rec.items} items" if rec.items else ""),
+                    format_throughput(rec.bytes, rec.items, rec.duration),
+                    rec.thread_name,
+                ])
+                if rec.error:
+                    child.setToolTip(0, rec.error)
+                    child.setForeground(0, QColor("#ff6b6b"))
+                group.addChild(child)
+            for column in range(1, 6):
+                group.setTextAlignment(column, Qt.AlignRight | Qt.AlignVCenter)
+            self.tree.addTopLevelItem(group)
+            group.setExpanded(name in expanded)
+
+        self.summary_label.setText(f"last {len(records)} operations" if records else "no operations recorded yet")
+
+    def export_trace(self):
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Export Trace", f"crosspatch-trace-{datetime.datetime.now():%Y%m%d-%H%M%S}.json",
+            "Chrome Trace (*.json)")
+        if not path:
+            return
+        try:
+            count = Profiler.export_chrome_trace(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Export Failed", f"Could not write the trace:\n{e}")
+            return
+        QMessageBox.information(self, "Trace Exported",
+                                f"Saved {count} operations to:\n{path}\n\nOpen it in chrome://tracing or ui.perfetto.dev.")
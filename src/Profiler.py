@@ -0,0 +1,287 @@
+"""
+Opt-in timing of CrossPatch's startup and long-running phases.
+
+Run with `--profile` (or CROSSPATCH_PROFILE=1) to time named spans around
+config loading, library scans, tree population, parser runs, extraction and
+the like; a summary sorted by total time is printed at exit. The setting is
+read once, on import, and when profiling is off `profiled` hands back the
+undecorated function and `span` a shared no-op, so instrumented code costs
+nothing:
+
+    @profiled("load_config")
+    def load_config(): ...
+
+    with span("apply_mods"):
+        ...
+
+Coarse operations (deploys, parser runs, downloads, extraction, refreshes,
+conflict analysis, GameBanana calls) are recorded whether or not profiling
+is on: each keeps its start and end, thread, byte and item counts in a ring
+buffer of the last MAX_OPERATIONS, which the Settings tab summarises and
+`export_chrome_trace` writes out for chrome://tracing or Perfetto:
+
+    @traced("run_parser", "parse")
+    def run_parser(...): ...
+
+    with operation("download", "network", detail=url) as op:
+        ...
+        op.bytes += len(chunk)
+
+Code inside a traced function can add to its counts with `annotate`, and
+mark it failed with `annotate(error=...)` when it handles its own exceptions.
+"""
+
+import atexit
+import collections
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional
+
+PROFILE_FLAG = "--profile"
+ENABLED = PROFILE_FLAG in sys.argv or os.environ.get("CROSSPATCH_PROFILE") == "1"
+
+
+class _PhaseStats:
+    __slots__ = ("count", "total", "longest")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.longest = 0.0
+
+
+_lock = threading.Lock()
+_stats: Dict[str, _PhaseStats] = {}
+
+
+def record(name: str, seconds: float) -> None:
+    """Adds one timed run of phase `name`."""
+    with _lock:
+        stats = _stats.get(name)
+        if stats is None:
+            stats = _stats[name] = _PhaseStats()
+        stats.count += 1
+        stats.total += seconds
+        stats.longest = max(stats.longest, seconds)
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name: str):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, time.perf_counter() - self.start)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+def span(name: str):
+    """Context manager timing the enclosed block as phase `name`."""
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+def profiled(name: str = None):
+    """Decorator timing every call of the function as phase `name` (default: its qualified name)."""
+    def decorate(func):
+        if not ENABLED:
+            return func
+        phase = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(phase, time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+MAX_OPERATIONS = 5000
+
+_EPOCH = time.perf_counter()  # Trace timestamps are relative to module import
+_operations = collections.deque(maxlen=MAX_OPERATIONS)
+_operations_recorded = 0
+_active = threading.local()
+
+
+class OperationRecord(NamedTuple):
+    name: str
+    category: str
+    start: float  # time.perf_counter()
+    end: float
+    thread_id: int
+    thread_name: str
+    bytes: int
+    items: int
+    detail: str
+    error: str
+
+    @property
+    def duration(self) -> float:
+        return self.end - self.start
+
+
+class _Operation:
+    """A running operation; its counts may be added to until it ends."""
+    __slots__ = ("name", "category", "detail", "bytes", "items", "error", "start")
+
+    def __init__(self, name: str, category: str, detail: str = "", bytes: int = 0, items: int = 0):
+        self.name = name
+        self.category = category
+        self.detail = detail
+        self.bytes = bytes
+        self.items = items
+        self.error = ""
+
+    def __enter__(self):
+        stack = getattr(_active, "stack", None)
+        if stack is None:
+            stack = _active.stack = []
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        global _operations_recorded
+        end = time.perf_counter()
+        _active.stack.pop()
+        thread = threading.current_thread()
+        finished = OperationRecord(self.name, self.category, self.start, end, thread.ident, thread.name,
+                                  self.bytes, self.items, self.detail,
+                                  f"{exc_type.__name__}: {exc}" if exc_type else self.error)
+        with _lock:
+            _operations.append(finished)
+            _operations_recorded += 1
+        if ENABLED:
+            record(self.name, end - self.start)
+        return False
+
+
+def operation(name: str, category: str, detail: str = "", bytes: int = 0, items: int = 0) -> _Operation:
+    """Context manager recording the enclosed block as an operation."""
+    return _Operation(name, category, detail, bytes, items)
+
+
+def traced(name: str, category: str):
+    """Decorator recording every call of the function as an operation."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with _Operation(name, category):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def annotate(bytes: int = 0, items: int = 0, detail: Optional[str] = None, error: Optional[str] = None) -> None:
+    """Adds to the counts of the innermost operation running on this thread, if any."""
+    stack = getattr(_active, "stack", None)
+    if not stack:
+        return
+    current = stack[-1]
+    current.bytes += bytes
+    current.items += items
+    if detail is not None:
+        current.detail = detail
+    if error is not None:
+        current.error = error
+
+
+def recent_operations(limit: Optional[int] = None) -> List[OperationRecord]:
+    """Finished operations, oldest first; only the last `limit` if given."""
+    with _lock:
+        records = list(_operations)
+    return records[-limit:] if limit else records
+
+
+def operations_recorded() -> int:
+    """How many operations have finished so far (including ones the ring buffer has dropped)."""
+    return _operations_recorded
+
+
+def chrome_trace(records: Optional[List[OperationRecord]] = None) -> Dict:
+    """The recorded operations in Chrome Trace Event format."""
+    if records is None:
+        records = recent_operations()
+    pid = os.getpid()
+    events = []
+    thread_names = {}
+    for rec in records:
+        thread_names[rec.thread_id] = rec.thread_name
+        args = {}
+        if rec.detail:
+            args["detail"] = rec.detail
+        if rec.bytes:
+            args["bytes"] = rec.bytes
+        if rec.items:
+            args["items"] = rec.items
+        if rec.error:
+            args["error"] = rec.error
+        events.append({
+            "name": rec.name,
+            "cat": rec.category,
+            "ph": "X",
+            "ts": round((rec.start - _EPOCH) * 1e6, 1),
+            "dur": round(rec.duration * 1e6, 1),
+            "pid": pid,
+            "tid": rec.thread_id,
+            "args": args,
+        })
+    for thread_id, thread_name in thread_names.items():
+        events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": thread_id, "args": {"name": thread_name}})
+    events.append({"name": "process_name", "ph": "M", "pid": pid, "tid": 0, "args": {"name": "CrossPatch"}})
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path: str) -> int:
+    """Writes the recorded operations to `path` as a Chrome trace; returns how many were written."""
+    trace = chrome_trace()
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(trace, f)
+    return sum(1 for event in trace["traceEvents"] if event["ph"] == "X")
+
+
+def summary() -> str:
+    """The phase timings so far as a table, longest total first."""
+    with _lock:
+        rows = sorted(_stats.items(), key=lambda item: item[1].total, reverse=True)
+        lines = [f"{'Phase':<32} {'Calls':>6} {'Total ms':>10} {'Avg ms':>9} {'Max ms':>9}"]
+        for phase, stats in rows:
+            lines.append(f"{phase:<32} {stats.count:>6} {stats.total * 1000:>10.1f} "
+                         f"{stats.total * 1000 / stats.count:>9.1f} {stats.longest * 1000:>9.1f}")
+    return "\n".join(lines)
+
+
+def _print_summary():
+    if _stats:
+        print("\n--- CrossPatch profile ---")
+        print(summary())
+
+
+if ENABLED:
+    print("Profiling enabled; phase timings will be printed at exit.")
+    atexit.register(_print_summary)
@@ -0,0 +1,121 @@
+"""
+Coalescing scheduler for mod list refreshes.
+
+Refreshes are requested from many places (downloads finishing, background
+parses, profile changes, the refresh button), often several in a row. Each
+request names the steps it needs; requests arriving within a short window are
+merged into a single run. A request that arrives while a run is in flight
+marks that run as stale; the runner checks `is_stale()` between steps and gives
+up early, and its result is dropped. The merged steps then run once more.
+
+The runner is called on a worker thread as `runner(steps, generation)` and
+returns `(steps_still_needed, result)`, e.g. without UI when a rescan found
+nothing new. `finished` is emitted on the GUI thread with those steps.
+"""
+
+import enum
+import threading
+
+from PySide6.QtCore import QObject, QTimer, Signal
+
+COALESCE_WINDOW_MS = 150
+
+
+class RefreshStep(enum.IntFlag):
+    RESCAN = 1      # scan the mods folder and sync the priority list
+    UI = 2          # rebuild the mod list
+    UPDATES = 4     # check GameBanana for mod updates
+    ALL = RESCAN | UI | UPDATES
+
+
+class RefreshScheduler(QObject):
+    """Merges refresh requests and runs them one at a time."""
+    started = Signal(int, int)  # (generation, steps)
+    finished = Signal(int, int, object)  # (generation, steps still needed, result)
+    _worker_done = Signal(int, int, object)
+
+    def __init__(self, runner, parent=None, window_ms=COALESCE_WINDOW_MS):
+        super().__init__(parent)
+        self._runner = runner
+        self._lock = threading.Lock()
+        self._pending = RefreshStep(0)
+        self._running_steps = RefreshStep(0)
+        self._running = False
+        self._generation = 0
+        self._pause_reasons = set()
+
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(window_ms)
+        self._timer.timeout.connect(self._start)
+        self._worker_done.connect(self._on_worker_done)
+
+    @property
+    def busy(self):
+        return self._running or bool(self._pending)
+
+    def request(self, steps=RefreshStep.ALL):
+        """Asks for a refresh; requests within the coalescing window share one run."""
+        with self._lock:
+            self._pending |= RefreshStep(steps)
+            if self._running:
+                # Whatever is running now is out of date; redo its steps too.
+                self._generation += 1
+                self._pending |= self._running_steps
+        if not self._pause_reasons:
+            self._timer.start()
+
+    def is_stale(self, generation):
+        """True once a newer request has superseded the run with this generation."""
+        return generation != self._generation
+
+    def pause(self, reason):
+        """Holds back refreshes (e.g. during a deploy) until every reason is resumed."""
+        self._pause_reasons.add(reason)
+        self._timer.stop()
+        with self._lock:
+            if self._running:
+                self._generation += 1
+                self._pending |= self._running_steps
+
+    def resume(self, reason):
+        if reason not in self._pause_reasons:
+            return
+        self._pause_reasons.discard(reason)
+        if not self._pause_reasons and self._pending:
+            self._timer.start()
+
+    def _start(self):
+        if self._pause_reasons:
+            return
+        with self._lock:
+            if self._running or not self._pending:
+                return  # _on_worker_done starts the next run.
+            steps, self._pending = self._pending, RefreshStep(0)
+            self._running = True
+            self._running_steps = steps
+            self._generation += 1
+            generation = self._generation
+        self.started.emit(generation, int(steps))
+        threading.Thread(target=self._run, args=(generation, steps), daemon=True, name="Refresh").start()
+
+    def _run(self, generation, steps):
+        try:
+            needed, result = self._runner(steps, generation)
+        except Exception as e:
+            print(f"Error during refresh: {e}")
+            needed, result = RefreshStep(0), None
+        self._worker_done.emit(generation, int(needed), result)
+
+    def _on_worker_done(self, generation, needed, result):
+        with self._lock:
+            self._running = False
+            self._running_steps = RefreshStep(0)
+            stale = self.is_stale(generation)
+        if not stale:
+            self.finished.emit(generation, needed, result)
+        else:
+            print("Dropped the result of a superseded refresh.")
+            self.finished.emit(generation, 0, None)
+        if self._pending and not self._pause_reasons:
+            self._timer.start()
@@ -0,0 +1,129 @@
+"""
+Checks that the pak parser can run, without holding up startup.
+
+The parser needs the .NET 8 runtime unless a self-contained build of it is
+bundled. Asking `dotnet --list-runtimes` takes a noticeable fraction of a
+second (and up to 5 s when it misbehaves), so the answer is cached in
+CONFIG_DIR and reused until the dotnet install changes. The probe runs in a
+background thread once the window is up:
+
+    probe = RuntimeProbe()
+    probe.finished.connect(on_probe_finished)  # (parser runtime available)
+    probe.start()
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import threading
+from typing import List, Optional
+
+from PySide6.QtCore import QObject, Signal
+
+import PakInspector
+from Config import CONFIG_DIR
+from Profiler import profiled
+
+CACHE_FILE = os.path.join(CONFIG_DIR, "runtime_probe.json")
+
+
+@profiled("_has_dotnet_8")
+def has_dotnet_8() -> bool:
+    """Return True if a .NET runtime 8.x is present (checked via `dotnet --list-runtimes`)."""
+    try:
+        proc = subprocess.run(["dotnet", "--list-runtimes"], capture_output=True, text=True, check=True, timeout=5)
+        out = proc.stdout + proc.stderr
+        # Look for Microsoft.NETCore.App 8.* or similar runtime entries
+        for line in out.splitlines():
+            if "Microsoft.NETCore.App" in line or "Microsoft.AspNetCore.App" in line:
+                # line format: Name Version [path]
+                parts = line.strip().split()
+                if len(parts) >= 2:
+                    ver = parts[1]
+                    if ver.startswith("8.") or ver.startswith("8"):
+                        return True
+        return False
+    except (subprocess.CalledProcessError, FileNotFoundError, subprocess.TimeoutExpired):
+        return False
+
+
+def _install_key() -> Optional[List]:
+    """
+    Identifies the dotnet install on PATH: the host binary and its mtime, plus
+    the mtime of its shared runtimes folder, which changes when a runtime is
+    installed or removed without the host being touched. None if there is no
+    dotnet on PATH.
+    """
+    dotnet = shutil.which("dotnet")
+    if not dotnet:
+        return None
+    dotnet = os.path.realpath(dotnet)
+    try:
+        key = [dotnet, os.stat(dotnet).st_mtime]
+    except OSError:
+        return None
+    try:
+        key.append(os.stat(os.path.join(os.path.dirname(dotnet), "shared", "Microsoft.NETCore.App")).st_mtime)
+    except OSError:
+        key.append(None)
+    return key
+
+
+def _load_cached(key: List) -> Optional[bool]:
+    try:
+        with open(CACHE_FILE, "r", encoding="utf-8") as f:
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if isinstance(cached, dict) and cached.get("key") == key:
+        return bool(cached.get("available"))
+    return None
+
+
+def _save_cached(key: List, available: bool) -> None:
+    try:
+        with open(CACHE_FILE, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "available": available}, f)
+    except OSError as e:
+        print(f"Could not cache .NET runtime check: {e}")
+
+
+@profiled("parser_runtime_probe")
+def parser_runtime_available() -> bool:
+    """
+    True if the pak parser can run: a self-contained parser is bundled, or
+    .NET 8 is installed. Uses the cached answer while the dotnet install is
+    unchanged.
+    """
+    # If we have a self-contained parser executable for this platform, the
+    # .NET runtime is not required.
+    if getattr(PakInspector, 'self_contained_parser_available', lambda: False)():
+        return True
+    key = _install_key()
+    if key is None:
+        return False
+    cached = _load_cached(key)
+    if cached is not None:
+        print(f"[DEBUG] .NET 8 runtime check (cached): {cached}")
+        return cached
+    available = has_dotnet_8()
+    print(f"[DEBUG] .NET 8 runtime check: {available}")
+    _save_cached(key, available)
+    return available
+
+
+class RuntimeProbe(QObject):
+    """Runs `parser_runtime_available` off the GUI thread and reports the answer."""
+    finished = Signal(bool)  # parser runtime available
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, daemon=True, name="RuntimeProbe").start()
+
+    def _run(self):
+        try:
+            available = parser_runtime_available()
+        except Exception as e:
+            print(f"Error checking for the .NET runtime: {e}")
+            available = has_dotnet_8()
+        self.finished.emit(available)
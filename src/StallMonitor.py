@@ -0,0 +1,135 @@
+"""
+Watchdog for freezes of the GUI thread.
+
+A heartbeat timer on the GUI thread ticks every HEARTBEAT_MS. A watchdog
+thread checks how long ago the last tick was; once the event loop has gone
+STALL_THRESHOLD_MS without one, it samples the GUI thread's stack (and keeps
+sampling while the stall lasts). When the heartbeat comes back the stall is
+recorded with its duration and the stacks seen, so a freeze can be traced
+to the code that caused it:
+
+    stall_monitor.start()
+    stall_monitor.stall_detected.connect(...)  # (Stall)
+    stall_monitor.stalls()                     # most recent last
+"""
+
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+from typing import List, NamedTuple, Optional
+
+from PySide6.QtCore import QObject, Qt, QTimer, Signal
+
+HEARTBEAT_MS = 50
+STALL_THRESHOLD_MS = 250
+SAMPLE_INTERVAL_MS = 50
+MAX_SAMPLES_PER_STALL = 40
+MAX_STALLS = 100
+
+_APP_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+class Stall(NamedTuple):
+    started_at: float  # time.time() when the event loop stopped responding
+    duration_ms: float
+    samples: List[str]  # formatted stacks of the GUI thread, in sampling order
+
+    def common_stack(self) -> Optional[str]:
+        """The stack sampled most often during the stall, i.e. where the time went."""
+        if not self.samples:
+            return None
+        return collections.Counter(self.samples).most_common(1)[0][0]
+
+    def location(self) -> str:
+        """The innermost CrossPatch frame of the most common stack (or the innermost frame)."""
+        stack = self.common_stack()
+        if not stack:
+            return "(not sampled)"
+        frames = [line.strip() for line in stack.splitlines() if line.startswith('  File ')]
+        if not frames:
+            return "(unknown)"
+        own = [frame for frame in frames if frame.startswith(f'File "{_APP_DIR}')]
+        return (own or frames)[-1]
+
+
+class StallMonitor(QObject):
+    """Detects and records event-loop stalls. Use the shared `stall_monitor`."""
+    stall_detected = Signal(object)  # Stall
+
+    def __init__(self, parent=None, threshold_ms: int = STALL_THRESHOLD_MS):
+        super().__init__(parent)
+        self.threshold = threshold_ms / 1000
+        self._lock = threading.Lock()
+        self._last_beat = time.perf_counter()
+        self._samples: List[str] = []
+        self._stalls = collections.deque(maxlen=MAX_STALLS)
+        self._gui_thread_id = None
+        self._stop = None
+        self._watchdog = None
+        self._heartbeat = None
+
+    def start(self) -> None:
+        """Starts monitoring; call from the GUI thread."""
+        if self._watchdog is not None:
+            return
+        if self._heartbeat is None:
+            self._heartbeat = QTimer(self)
+            self._heartbeat.setTimerType(Qt.PreciseTimer)
+            self._heartbeat.setInterval(HEARTBEAT_MS)
+            self._heartbeat.timeout.connect(self._on_heartbeat)
+        self._gui_thread_id = threading.get_ident()
+        self._last_beat = time.perf_counter()
+        self._stop = threading.Event()
+        self._heartbeat.start()
+        self._watchdog = threading.Thread(target=self._watch, args=(self._stop,), daemon=True, name="StallWatchdog")
+        self._watchdog.start()
+
+    def stop(self) -> None:
+        if self._heartbeat is not None:
+            self._heartbeat.stop()
+        if self._stop is not None:
+            self._stop.set()
+        self._watchdog = None
+
+    def stalls(self) -> List[Stall]:
+        with self._lock:
+            return list(self._stalls)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._stalls.clear()
+
+    def _on_heartbeat(self):
+        now = time.perf_counter()
+        with self._lock:
+            gap = now - self._last_beat - HEARTBEAT_MS / 1000
+            samples, self._samples = self._samples, []
+            self._last_beat = now
+            if gap < self.threshold:
+                return
+            stall = Stall(time.time() - gap, gap * 1000, samples)
+            self._stalls.append(stall)
+        print(f"[STALL] GUI thread was blocked for {stall.duration_ms:.0f} ms at {stall.location()}")
+        self.stall_detected.emit(stall)
+
+    def _watch(self, stop: threading.Event):
+        while not stop.wait(SAMPLE_INTERVAL_MS / 1000):
+            with self._lock:
+                blocked = time.perf_counter() - self._last_beat
+                if blocked < self.threshold or len(self._samples) >= MAX_SAMPLES_PER_STALL:
+                    continue
+            frame = sys._current_frames().get(self._gui_thread_id)
+            if frame is None:
+                continue
+            stack = "".join(traceback.format_stack(frame))
+            del frame
+            with self._lock:
+                # The heartbeat may have come back while the stack was being formatted.
+                if time.perf_counter() - self._last_beat >= self.threshold:
+                    self._samples.append(stack)
+
+
+stall_monitor = StallMonitor()
@@ -0,0 +1,86 @@
+import datetime
+
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget,
+    QTreeWidgetItem, QPlainTextEdit, QSplitter, QHeaderView
+)
+from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt
+
+from StallMonitor import stall_monitor, STALL_THRESHOLD_MS
+
+
+class StallsDialog(QDialog):
+    """Lists recorded UI freezes with the GUI thread's stack during each one."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("UI Stalls")
+        self.resize(900, 550)
+
+        main_layout = QVBoxLayout(self)
+
+        header = QLabel(f"Times the interface stopped responding for more than {STALL_THRESHOLD_MS} ms this session.\n"
+                        "Select an entry to see where the GUI thread was at the time.")
+        main_layout.addWidget(header)
+
+        splitter = QSplitter(Qt.Vertical)
+        self.stall_list = QTreeWidget()
+        self.stall_list.setHeaderLabels(["Time", "Duration", "Samples", "Location"])
+        self.stall_list.setRootIsDecorated(False)
+        self.stall_list.header().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.stall_list.currentItemChanged.connect(self._show_stack)
+        splitter.addWidget(self.stall_list)
+
+        self.stack_view = QPlainTextEdit()
+        self.stack_view.setReadOnly(True)
+        self.stack_view.setLineWrapMode(QPlainTextEdit.NoWrap)
+        self.stack_view.setFont(QFont("Consolas", 9))
+        splitter.addWidget(self.stack_view)
+        splitter.setSizes([250, 300])
+        main_layout.addWidget(splitter)
+
+        btn_layout = QHBoxLayout()
+        clear_btn = QPushButton("Clear")
+        clear_btn.clicked.connect(self.clear)
+        btn_layout.addWidget(clear_btn)
+        btn_layout.addStretch()
+        close_btn = QPushButton("Close")
+        close_btn.clicked.connect(self.accept)
+        btn_layout.addWidget(close_btn)
+        main_layout.addLayout(btn_layout)
+
+        for stall in stall_monitor.stalls():
+            self._add_stall(stall)
+        stall_monitor.stall_detected.connect(self._add_stall)
+
+    def done(self, result):
+        stall_monitor.stall_detected.disconnect(self._add_stall)
+        super().done(result)
+
+    def _add_stall(self, stall):
+        item = QTreeWidgetItem([
+            datetime.datetime.fromtimestamp(stall.started_at).strftime("%H:%M:%S"),
+            f"{stall.duration_ms:.0f} ms",
+            str(len(stall.samples)),
+            stall.location(),
+        ])
+        item.setData(0, Qt.UserRole, stall)
+        item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+        item.setTextAlignment(2, Qt.AlignRight | Qt.AlignVCenter)
+        self.stall_list.insertTopLevelItem(0, item)  # Newest first
+
+    def _show_stack(self, current, previous=None):
+        if current is None:
+            self.stack_view.clear()
+            return
+        stall = current.data(0, Qt.UserRole)
+        stack = stall.common_stack()
+        if stack is None:
+            self.stack_view.setPlainText("The stall ended before the GUI thread could be sampled.")
+            return
+        count = stall.samples.count(stack)
+        self.stack_view.setPlainText(f"Seen in {count} of {len(stall.samples)} samples:\n\n{stack}")
+
+    def clear(self):
+        stall_monitor.clear()
+        self.stall_list.clear()
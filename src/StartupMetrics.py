@@ -0,0 +1,71 @@
+"""
+Time-to-first-paint tracking.
+
+Main records the process start as early as it can; the first time the main
+window paints, the elapsed time is printed and appended to a small history
+in CONFIG_DIR, so startup regressions show up as a number rather than a
+feeling:
+
+    timer = FirstPaintTimer(window, started_at)
+    window.show()
+"""
+
+import json
+import os
+import time
+from typing import List
+
+from PySide6.QtCore import QEvent, QObject, QTimer, Signal
+
+import Profiler
+from Config import CONFIG_DIR
+
+HISTORY_FILE = os.path.join(CONFIG_DIR, "startup_times.json")
+MAX_HISTORY = 50
+
+
+def load_history() -> List[dict]:
+    """Recorded startups, oldest first: {"time": unix time, "first_paint_ms": float}."""
+    try:
+        with open(HISTORY_FILE, "r", encoding="utf-8") as f:
+            history = json.load(f)
+        return history if isinstance(history, list) else []
+    except (OSError, ValueError):
+        return []
+
+
+def record_first_paint(elapsed_ms: float) -> None:
+    history = load_history()
+    history.append({"time": round(time.time()), "first_paint_ms": round(elapsed_ms, 1)})
+    try:
+        with open(HISTORY_FILE, "w", encoding="utf-8") as f:
+            json.dump(history[-MAX_HISTORY:], f)
+    except OSError as e:
+        print(f"Could not save startup time: {e}")
+
+
+class FirstPaintTimer(QObject):
+    """Measures from `started_at` (a time.perf_counter() value) to the end of the widget's first paint."""
+    finished = Signal(float)  # elapsed ms; startup work that can wait for the first frame hooks in here
+
+    def __init__(self, widget, started_at: float):
+        super().__init__(widget)
+        self.started_at = started_at
+        self.elapsed_ms = None
+        self._widget = widget
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if obj is self._widget and event.type() == QEvent.Paint:
+            self._widget.removeEventFilter(self)
+            # Paint events are delivered before the frame is flushed; measure once it has been.
+            QTimer.singleShot(0, self._finish)
+        return False
+
+    def _finish(self):
+        self.elapsed_ms = (time.perf_counter() - self.started_at) * 1000
+        print(f"Time to first paint: {self.elapsed_ms:.0f} ms")
+        if Profiler.ENABLED:
+            Profiler.record("time_to_first_paint", self.elapsed_ms / 1000)
+        record_first_paint(self.elapsed_ms)
+        self.finished.emit(self.elapsed_ms)
@@ -0,0 +1,256 @@
+"""
+Shared loader for Browse thumbnails.
+
+Images come from a memory LRU of decoded, ready-sized QImages, then from a
+size-bounded disk cache of the downloaded files in CONFIG_DIR, and only then
+from the network. Fetching, decoding and scaling all happen in the service's
+worker pool, so the GUI thread only turns a finished QImage into a pixmap.
+
+Requests are made on behalf of an owner (e.g. a model) with a priority.
+Concurrent requests for the same image share one fetch; a request with a
+higher priority bumps a queued fetch forward, and a queued fetch nobody wants
+any more is dropped:
+
+    key, image = thumbnail_service.request(url, QSize(210, 118), self, PRIORITY_VISIBLE)
+    if image is None:
+        ...wait for thumbnail_service.loaded(key, image) or failed(key, message)...
+    thumbnail_service.cancel(key, self)  # scrolled out of view
+"""
+
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from PySide6.QtCore import QObject, QRunnable, QSize, Qt, QThreadPool, Signal
+from PySide6.QtGui import QImage
+
+import Util
+from Config import CONFIG_DIR
+from LazyImport import lazy_module
+from Profiler import operation
+
+requests = lazy_module("requests")  # Imported on first fetch
+
+CACHE_DIR = os.path.join(CONFIG_DIR, "thumbnail_cache")
+DISK_CACHE_LIMIT = 64 * 1024 * 1024
+MEMORY_CACHE_LIMIT = 48 * 1024 * 1024  # decoded bytes
+MAX_WORKERS = 4
+
+PRIORITY_PREFETCH = 0
+PRIORITY_VISIBLE = 10
+
+
+class ThumbnailDiskCache:
+    """Downloaded image files keyed by URL, evicting the least recently used past `limit` bytes."""
+
+    def __init__(self, cache_dir: str = CACHE_DIR, limit: int = DISK_CACHE_LIMIT):
+        self.cache_dir = cache_dir
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, list]] = None  # file name -> [size, last use]
+        self._total = 0
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.blake2b(url.encode("utf-8"), digest_size=16).hexdigest())
+
+    def _load_entries(self) -> None:
+        # Called with the lock held.
+        if self._entries is not None:
+            return
+        self._entries = {}
+        self._total = 0
+        try:
+            with os.scandir(self.cache_dir) as it:
+                for entry in it:
+                    if entry.is_file() and not entry.name.endswith(".tmp"):
+                        st = entry.stat()
+                        self._entries[entry.name] = [st.st_size, st.st_mtime]
+                        self._total += st.st_size
+        except FileNotFoundError:
+            pass
+
+    def get(self, url: str) -> Optional[bytes]:
+        path = self._path(url)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        with self._lock:
+            self._load_entries()
+            entry = self._entries.get(os.path.basename(path))
+            if entry is not None:
+                try:
+                    os.utime(path)  # mtime is the last use
+                    entry[1] = os.stat(path).st_mtime
+                except OSError:
+                    pass
+        return data
+
+    def put(self, url: str, data: bytes) -> None:
+        path = self._path(url)
+        name = os.path.basename(path)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            print(f"Could not cache thumbnail {url}: {e}")
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._load_entries()
+            old = self._entries.pop(name, None)
+            if old:
+                self._total -= old[0]
+            self._entries[name] = [len(data), os.stat(path).st_mtime]
+            self._total += len(data)
+            if self._total > self.limit:
+                self._evict()
+
+    def _evict(self) -> None:
+        # Called with the lock held.
+        for name, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total <= self.limit * 0.9:
+                break
+            try:
+                os.remove(os.path.join(self.cache_dir, name))
+            except FileNotFoundError:
+                pass
+            except OSError:
+                continue
+            del self._entries[name]
+            self._total -= size
+
+
+class _FetchTask(QRunnable):
+    """Gets one image (disk cache or network), decodes and scales it, and reports back."""
+
+    def __init__(self, service, key: str, url: str, size: QSize, priority: int):
+        super().__init__()
+        self.setAutoDelete(False)  # The service holds it until it reports back.
+        self.service = service
+        self.key = key
+        self.url = url
+        self.size = size
+        self.priority = priority
+
+    def run(self):
+        try:
+            data = self.service.disk_cache.get(self.url)
+            if data is None:
+                with operation("thumbnail", "network", detail=self.url) as op:
+                    response = requests.get(self.url, headers={'User-Agent': Util.BROWSER_USER_AGENT}, timeout=10)
+                    response.raise_for_status()
+                    data = response.content
+                    op.bytes = len(data)
+                image = QImage.fromData(data)
+                if not image.isNull():
+                    self.service.disk_cache.put(self.url, data)
+            else:
+                image = QImage.fromData(data)
+            if image.isNull():
+                raise ValueError("not a valid image")
+            if image.width() > self.size.width() or image.height() > self.size.height():
+                image = image.scaled(self.size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self.service._task_done.emit(self.key, image, "")
+        except Exception as e:
+            self.service._task_done.emit(self.key, None, f"Failed to load image from {self.url}: {e}")
+
+
+class ThumbnailService(QObject):
+    """Cached, deduplicated and prioritised thumbnail loading. Use the shared `thumbnail_service`."""
+    loaded = Signal(str, QImage)  # (key, image scaled to fit the requested size)
+    failed = Signal(str, str)  # (key, message)
+    _task_done = Signal(str, object, str)
+
+    def __init__(self, parent=None, disk_cache: Optional[ThumbnailDiskCache] = None,
+                 memory_limit: int = MEMORY_CACHE_LIMIT):
+        super().__init__(parent)
+        self.disk_cache = disk_cache or ThumbnailDiskCache()
+        self._memory: "OrderedDict[str, QImage]" = OrderedDict()
+        self._memory_bytes = 0
+        self._memory_limit = memory_limit
+        self._tasks: Dict[str, _FetchTask] = {}
+        self._owners: Dict[str, set] = {}
+        self._pool = QThreadPool(self)
+        self._pool.setMaxThreadCount(MAX_WORKERS)
+        self._task_done.connect(self._on_task_done)
+
+    @staticmethod
+    def key(url: str, size: QSize) -> str:
+        return f"{size.width()}x{size.height()}:{url}"
+
+    def cached(self, key: str) -> Optional[QImage]:
+        image = self._memory.get(key)
+        if image is not None:
+            self._memory.move_to_end(key)
+        return image
+
+    def request(self, url: str, size: QSize, owner, priority: int = PRIORITY_VISIBLE) -> Tuple[str, Optional[QImage]]:
+        """
+        Returns (key, image). The image is None unless it was in memory; it
+        then arrives through `loaded` or `failed` with that key.
+        """
+        key = self.key(url, size)
+        image = self.cached(key)
+        if image is not None:
+            return key, image
+
+        self._owners.setdefault(key, set()).add(owner)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = _FetchTask(self, key, url, QSize(size), priority)
+            self._pool.start(task, priority)
+        elif priority > task.priority and self._pool.tryTake(task):
+            # Still queued: queue it again, further ahead.
+            task.priority = priority
+            self._pool.start(task, priority)
+        return key, None
+
+    def cancel(self, key: str, owner) -> None:
+        """Withdraws `owner`'s interest; a fetch nobody wants that hasn't started is dropped."""
+        owners = self._owners.get(key)
+        if owners is None:
+            return
+        owners.discard(owner)
+        if owners:
+            return
+        del self._owners[key]
+        task = self._tasks.get(key)
+        if task is not None and self._pool.tryTake(task):
+            del self._tasks[key]
+
+    def cancel_all(self, owner) -> None:
+        for key in [k for k, owners in self._owners.items() if owner in owners]:
+            self.cancel(key, owner)
+
+    def _remember(self, key: str, image: QImage) -> None:
+        old = self._memory.pop(key, None)
+        if old is not None:
+            self._memory_bytes -= old.sizeInBytes()
+        self._memory[key] = image
+        self._memory_bytes += image.sizeInBytes()
+        while self._memory_bytes > self._memory_limit and len(self._memory) > 1:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= evicted.sizeInBytes()
+
+    def _on_task_done(self, key, image, error):
+        self._tasks.pop(key, None)
+        self._owners.pop(key, None)
+        if image is not None:
+            self._remember(key, image)
+            self.loaded.emit(key, image)
+        else:
+            print(error)
+            self.failed.emit(key, error)
+
+
+thumbnail_service = ThumbnailService()
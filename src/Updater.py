@@ -5,7 +5,6 @@ import shutil
 import subprocess
 import threading
 import time
-import requests
 
 from PySide6.QtWidgets import QDialog, QVBoxLayout, QLabel, QProgressBar, QMessageBox
 from PySide6.QtCore import Signal, QObject, Qt
@@ -13,6 +12,9 @@ from PySide6.QtCore import Signal, QObject, Qt
 from Constants import APP_VERSION 
 from Config import is_packaged
 import Util
+from LazyImport import lazy_module
+
+requests = lazy_module("requests")  # Imported on first download
 
 class UpdaterSignals(QObject):
     """Defines signals for communicating from the worker thread to the GUI."""
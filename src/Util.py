@@ -1,31 +1,35 @@
 import os
 import json
-import requests
 import shutil
 import subprocess
 import zipfile
-import urllib.request
 import webbrowser
 import platform
 import re
 import sys
 import threading
-from PySide6.QtCore import QEvent, QTimer
-from PySide6.QtWidgets import QApplication, QMessageBox, QDialog, QLabel, QVBoxLayout, QProgressBar
+from PySide6.QtCore import QTimer
+from PySide6.QtWidgets import QApplication, QMessageBox, QDialog, QLabel, QVBoxLayout, QProgressBar, QPushButton
 
 from Constants import UPDATE_URL, APP_VERSION, STEAM_APP_ID
 from Constants import BROWSER_USER_AGENT # Import the new constant
 from Config import CONFIG_DIR, is_packaged 
 import PakInspector
+from MetadataCache import MetadataCache, freeze
+from RefreshScheduler import RefreshStep
+import ModCatalog
+from LazyImport import lazy_module, module_available
+from Profiler import profiled, traced, annotate, operation
+
+requests = lazy_module("requests")  # Imported on first network call
 
 # File storing user-suppressed conflict reminders. Keys are tuples stored as
 # { "mod": <mod_folder>, "provider": <provider_mod_folder> }
 IGNORED_CONFLICTS_PATH = os.path.join(CONFIG_DIR, "ignored_conflicts.json")
 
-# In-memory cache for read_mod_info to avoid repeated disk reads during refreshes
-# Maps info_file_path -> (mtime, data)
-_READ_MOD_INFO_CACHE = {}
-_BACKGROUND_PARSES = {}
+# Mods with a background pak parse in flight (see start_background_parse)
+_BACKGROUND_PARSES = set()
+_BACKGROUND_PARSES_LOCK = threading.Lock()
 
 # Flag to ensure the GB 403 error is only shown once per session.
 _GB_403_ERROR_SHOWN = False
@@ -65,25 +69,10 @@ def add_ignored_conflict(mod, provider):
         data.append(entry)
         save_ignored_conflicts(data)
 
-class ModListFetchEvent(QEvent):
-    """Custom event for when the mod list has been fetched."""
-    EVENT_TYPE = QEvent.Type(QEvent.registerEventType())
-    def __init__(self, mods_data):
-        super().__init__(self.EVENT_TYPE)
-        self.mods_data = mods_data
-
 # --- Handle optional archive dependencies for UE4SS install ---
-try:
-    import py7zr
-    PY7ZR_SUPPORT = True
-except ImportError:
-    PY7ZR_SUPPORT = False
-
-try:
-    import rarfile
-    UNRAR_SUPPORT = True
-except ImportError:
-    UNRAR_SUPPORT = False
+# Only checked for here; the modules are imported when an archive needs them.
+PY7ZR_SUPPORT = module_available("py7zr")
+UNRAR_SUPPORT = module_available("rarfile")
 
 def find_assets_dir(max_up_levels=4, verbose=False):
     """
@@ -191,7 +180,9 @@ def _gb_request(url, params=None, referer=None, timeout=10):
     session.headers.update(headers)
 
     # Try a single request; callers can retry if desired
-    resp = session.get(url, params=params, timeout=timeout)
+    with operation("gb_api", "network", detail=url) as op:
+        resp = session.get(url, params=params, timeout=timeout)
+        op.bytes = len(resp.content)
     
     global _GB_403_ERROR_SHOWN
     if resp.status_code == 403:
@@ -422,6 +413,7 @@ def is_newer_version(local, remote):
     rv += [0] * (length - len(rv))
     return rv > lv
 
+@profiled("check_for_app_updates")
 def check_for_updates_pyside(parent_window):
     print("Checking for updates...")
     remote_info = fetch_remote_version()
@@ -474,24 +466,74 @@ def list_mod_folders(path):
         return []
 
 
+def migrate_legacy_pak_data(mods_folder):
+    """
+    Moves pak manifests written into info.json by older versions into the
+    manifest cache (see ManifestCache), which keeps info.json small and
+    human-editable. Manifests whose archives changed since are dropped and
+    the mod is parsed again when needed. Readers already ignore "pak_data";
+    this rewrites the files once, through the shared info.json writer.
+    Returns the number of mods migrated.
+    """
+    from ModInfoWriter import mod_info_writer  # Local import, ModInfoWriter imports this module
+    migrated = 0
+    try:
+        entries = [e.path for e in os.scandir(mods_folder) if e.is_dir()]
+    except OSError:
+        return 0
+    for mod_path in entries:
+        info_file = os.path.join(mod_path, "info.json")
+        try:
+            with open(info_file, "r", encoding="utf-8") as f:
+                raw = f.read()
+            if '"pak_data"' not in raw:
+                continue
+            pak_data = json.loads(raw).get("pak_data")
+            written_at_ns = os.stat(info_file).st_mtime_ns
+        except (OSError, ValueError, AttributeError):
+            continue
+        try:
+            if pak_data and PakInspector.import_legacy_manifest(mod_path, pak_data, written_at_ns):
+                print(f"Moved legacy pak data of {os.path.basename(mod_path)} into the manifest cache")
+            mod_info_writer.remove(mod_path, "pak_data")
+            migrated += 1
+        except Exception as e:
+            print(f"Warning: Could not migrate legacy pak data in {info_file}: {e}")
+    return migrated
+
+def _load_info_file(info_file):
+    """MetadataCache loader: returns (mtime, data) of an info.json file."""
+    with open(info_file, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    if not isinstance(data, dict):
+        raise ValueError(f"{info_file} does not contain a JSON object")
+    # Legacy manifests are left to migrate_legacy_pak_data; don't keep them in memory.
+    data.pop("pak_data", None)
+    return os.path.getmtime(info_file), data
+
+
+# Shared, thread-safe cache of parsed info.json files, keyed by path and
+# validated by mtime. Values are read-only; use MetadataCache.thaw() to edit.
+_MOD_INFO_CACHE = MetadataCache(_load_info_file)
+
+
 def read_mod_info(mod_path):
+    """
+    Returns a mod's info.json data as a read-only mapping (defaults if the
+    file is missing or corrupt). Safe to call from any thread.
+    """
     info_file = os.path.join(mod_path, "info.json")
-    if os.path.exists(info_file):
+    try:
+        mtime = os.path.getmtime(info_file)
+    except OSError:
+        mtime = None
+    if mtime is not None:
         try:
-            mtime = os.path.getmtime(info_file)
-            cached = _READ_MOD_INFO_CACHE.get(info_file)
-            if cached and cached[0] == mtime:
-                return cached[1]
-
-            with open(info_file, "r", encoding="utf-8") as f:
-                data = json.load(f)
-            _READ_MOD_INFO_CACHE[info_file] = (mtime, data)
-            return data
+            return _MOD_INFO_CACHE.get(info_file, mtime)
         except Exception:
             # If info.json is corrupt, treat it as if it doesn't exist
             # and remove any stale cache entry
-            _READ_MOD_INFO_CACHE.pop(info_file, None)
-            pass
+            _MOD_INFO_CACHE.invalidate(info_file)
 
     # info.json does not exist or is corrupt. Auto-detect type and return a default dict.
     # The calling function will be responsible for saving it.
@@ -507,48 +549,28 @@ def read_mod_info(mod_path):
         detected_type = "ue4ss-script"
 
     print(f"Auto-detected '{mod_name}' as type: {detected_type}")
-    return {
+    return freeze({
         "name": mod_name,
         "version": "1.0",
         "author": "Unknown",
         "mod_type": detected_type
-    }
+    })
 
 def discover_mod_configuration(mod_path):
     """
     Discovers a mod's configuration by scanning its subdirectories.
     A subdirectory is considered a configuration 'category' if it contains
     at least two subfolders, each with a 'desc.ini' file.
-    
+
+    Results are cached and only rescanned when the folders or desc.ini files
+    involved change (see ConfigDiscovery).
+
     Returns:
         A dictionary representing the configuration, or None.
         Example: {'Models': {'Bass_AI': {'name': 'Bass AI', 'desc': '...'}, ...}}
     """
-    from ModConfigDialog import read_desc_ini # Local import
-    discovered_config = {}
-
-    if not os.path.isdir(mod_path):
-        return None
-
-    for category_name in os.listdir(mod_path):
-        category_path = os.path.join(mod_path, category_name)
-        if not os.path.isdir(category_path):
-            continue
-
-        options = {}
-        for option_name in os.listdir(category_path):
-            option_path = os.path.join(category_path, option_name)
-            desc_ini_path = os.path.join(option_path, 'desc.ini')
-            if os.path.isdir(option_path) and os.path.exists(desc_ini_path):
-                ini_data = read_desc_ini(desc_ini_path)
-                if ini_data:
-                    options[option_name] = ini_data
-        
-        # A valid category must have at least two configurable options
-        if len(options) >= 2:
-            discovered_config[category_name] = options
-
-    return discovered_config if discovered_config else None
+    import ConfigDiscovery  # Local import
+    return ConfigDiscovery.discover(mod_path)
 
 
 def has_file_based_configuration_quick(mod_path: str) -> bool:
@@ -635,12 +657,12 @@ def get_game_mods_folder(cfg):
     )
 
 
-def clean_ue4ss_folders(cfg):
+def clean_ue4ss_folders(cfg, snapshot):
+    """Removes deployed UE4SS mods; `snapshot` is the LibrarySnapshot of the mods folder."""
     ue4ss_logic_dst = cfg.get("ue4ss_logic_mods_folder")
     if ue4ss_logic_dst and os.path.isdir(ue4ss_logic_dst):
-        known_mods = list_mod_folders(cfg["mods_folder"])
         for item in os.listdir(ue4ss_logic_dst):
-            if item in known_mods:
+            if item in snapshot:
                 item_path = os.path.join(ue4ss_logic_dst, item)
                 try:
                     shutil.rmtree(item_path)
@@ -650,16 +672,14 @@ def clean_ue4ss_folders(cfg):
     # Clean UE4SS mods folder
     ue4ss_dst = cfg.get("ue4ss_mods_folder")
     if ue4ss_dst and os.path.isdir(ue4ss_dst):
-        # Get a list of all known mod folder names from the source mods folder
-        known_mod_folders = list_mod_folders(cfg["mods_folder"])
         for item in os.listdir(ue4ss_dst):
             # Only remove folders that are recognized as mods managed by CrossPatch
-            if item in known_mod_folders:
+            entry = snapshot.get(item)
+            if entry is not None:
                 item_path = os.path.join(ue4ss_dst, item)
                 try:
                     # Check if it's a UE4SS mod before removing
-                    mod_info = read_mod_info(os.path.join(cfg["mods_folder"], item))
-                    if mod_info.get("mod_type") == "ue4ss-script":
+                    if entry.mod_type == "ue4ss-script":
                         # For UE4SS script mods, we must remove the entire folder to ensure
                         # a clean re-installation on refresh, preventing orphaned files.
                         if os.path.isdir(item_path):
@@ -811,13 +831,14 @@ def check_mod_conflicts(mod_name, mod_info, cfg, profile_data, active_paks=None)
                           if profile_data.get("enabled_mods", {}).get(m, False) and m != mod_name]
 
 
-    # If this mod has no pak metadata, nothing to compare
-    if not mod_info.get("pak_data"):
+    # If this mod has no (up to date) pak metadata, nothing to compare
+    pak_data = PakInspector.get_cached_manifest(os.path.join(mods_folder, mod_name), include_index=False)
+    if not pak_data:
         return conflicts
 
     # Build a set/map of files provided by this mod (respecting active_paks if given)
     this_mod_files = {}
-    for pak in mod_info.get("pak_data", {}).get("pak_files", []):
+    for pak in pak_data.get("pak_files", []):
         pak_path = pak.get("file_path", "")
         pak_name = pak.get("file_name") or os.path.basename(pak_path)
         if active_paks is not None:
@@ -830,12 +851,13 @@ def check_mod_conflicts(mod_name, mod_info, cfg, profile_data, active_paks=None)
     # Compare against other enabled mods
     for other in other_enabled_mods:
         other_path = os.path.join(mods_folder, other)
-        other_info = read_mod_info(other_path)
-        if not other_info.get("pak_data"):
+        other_pak_data = PakInspector.get_cached_manifest(other_path, include_index=False)
+        if not other_pak_data:
             continue
 
+        other_info = ModCatalog.catalog.get_info(other_path)
         other_active = get_active_pak_files(other_path, other_info, profile_data)
-        for pak in other_info.get("pak_data", {}).get("pak_files", []):
+        for pak in other_pak_data.get("pak_files", []):
             other_pak_path = pak.get("file_path", "")
             other_pak_name = pak.get("file_name") or os.path.basename(other_pak_path)
             if other_active is not None and not any(other_pak_path.endswith(p) for p in other_active):
@@ -864,14 +886,11 @@ def enable_mod(mod_name, cfg, priority, profile_data):
     mod_info = read_mod_info(mod_path)
     mod_type = mod_info.get("mod_type", "pak") # Default to 'pak' if not specified
 
-    # If this is a pak mod, analyze its contents and update info.json
-    if mod_type == "pak" and not mod_info.get("pak_data"):
+    # If this is a pak mod, make sure its manifest is cached. generate_mod_pak_manifest
+    # only re-parses archives that changed; unknown (timed out) results are not saved.
+    if mod_type == "pak":
         try:
-            pak_data = PakInspector.generate_mod_pak_manifest(mod_path)
-            if pak_data:
-                mod_info["pak_data"] = pak_data
-                with open(os.path.join(mod_path, "info.json"), "w", encoding="utf-8") as f:
-                    json.dump(mod_info, f, indent=2)
+            PakInspector.generate_mod_pak_manifest(mod_path)
         except Exception as e:
             print(f"Warning: Could not analyze pak files for {mod_name}: {e}")
 
@@ -909,10 +928,10 @@ def enable_mod_with_ui_pyside(mod_name, cfg, priority, root_window, profile_data
     # This was the missing piece: actually call the function that copies the files.
     enable_mod(mod_name, cfg, priority, profile_data)
 
-    # For pak mods, if we don't have pak_data yet, start a non-blocking background
-    # parse that will persist pak_data and run conflict detection when complete.
-    if mod_type == "pak" and not mod_info.get("pak_data"):
-        mod_path = os.path.join(cfg["mods_folder"], mod_name)
+    # For pak mods without an up to date cached manifest, start a non-blocking
+    # background parse that caches it and runs conflict detection when complete.
+    mod_path = os.path.join(cfg["mods_folder"], mod_name)
+    if mod_type == "pak" and PakInspector.get_cached_manifest(mod_path, include_index=False) is None:
         try:
             start_background_parse(root_window, mod_path, mod_name, cfg, profile_data)
         except Exception as e:
@@ -920,13 +939,19 @@ def enable_mod_with_ui_pyside(mod_name, cfg, priority, root_window, profile_data
 
 def _parse_pak_with_progress(parent, mod_path, mod_name):
     """Run PakInspector.generate_mod_pak_manifest in a background thread while
-    showing a modal progress dialog. Returns the pak_data dict or None.
+    showing a modal progress dialog. Returns the pak_data dict, or None if the
+    parse timed out or the user cancelled it.
     """
-    result = {"pak": None, "error": None, "done": False}
+    result = {"pak": None, "error": None, "done": False, "assets": 0}
+    cancel_event = threading.Event()
+
+    def on_progress(assets_read):
+        result["assets"] = assets_read
 
     def worker():
         try:
-            pak = PakInspector.generate_mod_pak_manifest(mod_path)
+            pak = PakInspector.generate_mod_pak_manifest(mod_path, cancel_event=cancel_event,
+                                                         progress_callback=on_progress)
             result["pak"] = pak
         except Exception as e:
             result["error"] = str(e)
@@ -944,6 +969,16 @@ def _parse_pak_with_progress(parent, mod_path, mod_name):
     progress = QProgressBar()
     progress.setRange(0, 0)  # busy indicator
     layout.addWidget(progress)
+    cancel_btn = QPushButton("Cancel")
+    layout.addWidget(cancel_btn)
+
+    def on_cancel():
+        cancel_event.set()
+        cancel_btn.setEnabled(False)
+        label.setText("Cancelling...")
+    cancel_btn.clicked.connect(on_cancel)
+    # Closing the dialog (Esc / X) also cancels the parse
+    dialog.rejected.connect(cancel_event.set)
 
     # Poll for completion using QTimer
     timer = QTimer(dialog)
@@ -951,10 +986,13 @@ def _parse_pak_with_progress(parent, mod_path, mod_name):
         if result["done"]:
             timer.stop()
             dialog.accept()
+        elif result["assets"] and not cancel_event.is_set():
+            label.setText(f"Analyzing pak files for '{mod_name}'... ({result['assets']} assets read)")
     timer.timeout.connect(check_done)
     timer.start(200)
 
     dialog.exec()
+    timer.stop()
 
     if result["error"]:
         raise RuntimeError(result["error"])
@@ -966,43 +1004,32 @@ def start_background_parse(parent, mod_path, mod_name, cfg, profile_data):
     when finished. This is non-blocking from the caller's perspective.
     """
     # Avoid starting the same parse multiple times
-    if _BACKGROUND_PARSES.get(mod_path):
-        return
-    _BACKGROUND_PARSES[mod_path] = True
+    with _BACKGROUND_PARSES_LOCK:
+        if mod_path in _BACKGROUND_PARSES:
+            return
+        _BACKGROUND_PARSES.add(mod_path)
 
     def worker():
         try:
+            # generate_mod_pak_manifest caches successful results itself. A
+            # None result means the contents are unknown (e.g. the parse timed out).
             pak = PakInspector.generate_mod_pak_manifest(mod_path)
 
-            # Persist pak_data into info.json
-            info_path = os.path.join(mod_path, "info.json")
-            try:
-                if os.path.exists(info_path):
-                    with open(info_path, "r", encoding="utf-8") as f:
-                        info = json.load(f)
-                else:
-                    info = {}
-                info["pak_data"] = pak
-                with open(info_path, "w", encoding="utf-8") as f:
-                    json.dump(info, f, indent=2)
-                # Update cache
-                try:
-                    mtime = os.path.getmtime(info_path)
-                    _READ_MOD_INFO_CACHE[info_path] = (mtime, info)
-                except Exception:
-                    pass
-            except Exception:
-                pass
-
             # Schedule UI work on main thread
             def ui_done():
-                _BACKGROUND_PARSES.pop(mod_path, None)
+                with _BACKGROUND_PARSES_LOCK:
+                    _BACKGROUND_PARSES.discard(mod_path)
                 try:
                     if parent and hasattr(parent, 'refresh'):
-                        parent.refresh()
+                        # A parse changes no files; only the list needs redrawing.
+                        parent.refresh(RefreshStep.UI)
                 except Exception:
                     pass
 
+                if pak is None:
+                    # Contents unknown; conflicts cannot be checked until a later parse succeeds.
+                    return
+
                 # Run conflict detection now that pak_data is available
                 try:
                     mod_info = read_mod_info(mod_path)
@@ -1044,7 +1071,8 @@ def start_background_parse(parent, mod_path, mod_name, cfg, profile_data):
 
             QTimer.singleShot(0, ui_done)
         except Exception as e:
-            _BACKGROUND_PARSES.pop(mod_path, None)
+            with _BACKGROUND_PARSES_LOCK:
+                _BACKGROUND_PARSES.discard(mod_path)
             def ui_err():
                 try:
                     QMessageBox.warning(parent, "Pak Parser Error", f"Background pak parsing failed for {mod_name}: {e}")
@@ -1065,10 +1093,12 @@ def enable_mods_from_priority(priority_list, enabled_mods_dict, cfg, root_window
     pak_mods_to_process = []
     enabled_pak_mod_count = 0
     
+    mod_infos = ModCatalog.catalog.mod_infos(cfg["mods_folder"], priority_list)
+
     # First pass: Handle non-pak mods immediately and build list of pak mods for batching
     for mod_name in priority_list:
         is_enabled = enabled_mods_dict.get(mod_name, False)
-        mod_info = read_mod_info(os.path.join(cfg["mods_folder"], mod_name))
+        mod_info = mod_infos.get(mod_name, {})
         mod_type = mod_info.get("mod_type", "pak")
 
         if mod_type == "pak":
@@ -1089,6 +1119,7 @@ def enable_mods_from_priority(priority_list, enabled_mods_dict, cfg, root_window
         # This call will block until the batch processing (including any dialogs) is complete
         batch_processor.process_mods_batch(root_window, pak_mods_to_process)
 
+@traced("extract_archive", "extract")
 def extract_archive(archive_path, dest_path, progress_signal=None, clean_destination=True, finished_signal=None):
     """
     Extracts an archive to a destination path and handles nested folders.
@@ -1101,6 +1132,10 @@ def extract_archive(archive_path, dest_path, progress_signal=None, clean_destina
         finished_signal (Signal, optional): A PySide6 signal to emit when extraction is complete.
     """
     print(f"Starting extraction of '{os.path.basename(archive_path)}' to '{dest_path}'")
+    try:
+        annotate(bytes=os.path.getsize(archive_path), detail=os.path.basename(archive_path))
+    except OSError:
+        pass
     
     if clean_destination:
         if os.path.isdir(dest_path):
@@ -1118,10 +1153,12 @@ def extract_archive(archive_path, dest_path, progress_signal=None, clean_destina
         with zipfile.ZipFile(archive_path, 'r') as z_ref:
             z_ref.extractall(dest_path)
     elif archive_format == '.7z' and PY7ZR_SUPPORT:
+        import py7zr  # Local import
         print("Using py7zr to extract.")
         with py7zr.SevenZipFile(archive_path, 'r') as z_ref:
             z_ref.extractall(path=dest_path)
     elif archive_format == '.rar' and UNRAR_SUPPORT:
+        import rarfile  # Local import
         print("Using unrar to extract.")
         # Check for a bundled unrar executable in the assets folder first
         assets_dir = find_assets_dir()
@@ -6,6 +6,7 @@ using System.Linq;
 using System.Collections.Generic;
 using CUE4Parse.UE4.Objects.Core.Misc;
 using CUE4Parse.UE4.Versions;
+using System.Text;
 using System.Text.Json;
 
 namespace CrossPatchParser;
@@ -20,6 +21,7 @@ class Program
         var pathOption = new Option<DirectoryInfo>("--path", "Mod path containing pak, ucas, and utoc") { IsRequired = true };
         var outputOption = new Option<FileInfo?>("--output", "Output file path (defaults to stdout)");
         var mountPointOption = new Option<string>("--mount-point", "Mount point for pak files");
+        var ndjsonOption = new Option<bool>("--ndjson", "Stream one JSON record per line (header, assets, archives, end) instead of a single document");
 
         var rootCommand = new RootCommand("CrossPatch Mod Parser - Analyzes UE4/5 pak files and generates mod info")
         {
@@ -28,10 +30,11 @@ class Program
             versionOption,
             pathOption,
             outputOption,
-            mountPointOption
+            mountPointOption,
+            ndjsonOption
         };
 
-        rootCommand.SetHandler(async (path, name, author, version, output, mountPoint) =>
+        rootCommand.SetHandler(async (path, name, author, version, output, mountPoint, ndjson) =>
         {
             try 
             {
@@ -51,45 +54,11 @@ class Program
 
                 Console.Error.WriteLine($"Found: {pakFiles.Length} pak files, {utocFiles.Length} utoc files, {ucasFiles.Length} ucas files");
 
-                var pakInfo = new List<object>();
-
-                // Build a global index of all files discovered by the provider and extract common metadata via reflection
-                var filesIndex = new List<object>();
-                foreach (var kv in provider.Files)
-                {
-                    try
-                    {
-                        var fileKey = kv.Key.ToString();
-                        var fileVal = kv.Value;
-                        var valType = fileVal.GetType();
-
-                        object size = null;
-                        object compressedSize = null;
-                        object offset = null;
-                        object archiveName = null;
-
-                        var prop = valType.GetProperty("Size");
-                        if (prop != null) size = prop.GetValue(fileVal);
-                        prop = valType.GetProperty("CompressedSize");
-                        if (prop != null) compressedSize = prop.GetValue(fileVal);
-                        prop = valType.GetProperty("Offset");
-                        if (prop != null) offset = prop.GetValue(fileVal);
-                        prop = valType.GetProperty("ArchiveName");
-                        if (prop != null) archiveName = prop.GetValue(fileVal)?.ToString();
-
-                        filesIndex.Add(new {
-                            path = fileKey,
-                            size = size,
-                            compressed_size = compressedSize,
-                            offset = offset,
-                            archive = archiveName
-                        });
-                    }
-                    catch (Exception)
-                    {
-                        // ignore reflection failures per-entry
-                    }
-                }
+                // Archive entries are built without their file lists; the single
+                // document output adds them below, the NDJSON output leaves them implied.
+                var pakInfo = new List<Dictionary<string, object?>>();
+                var providerFileCount = provider.Files.Count;
+                var providerTotalSize = provider.Files.Values.Sum(f => f.Size);
 
                 // Map to track which IoStore files we've processed
                 var processedIoStores = new HashSet<string>();
@@ -100,14 +69,13 @@ class Program
                     Console.Error.WriteLine($"Processing pak file: {pakFile}");
                     try
                     {
-                        pakInfo.Add(new
+                        pakInfo.Add(new Dictionary<string, object?>
                         {
-                            file_name = Path.GetFileName(pakFile),
-                            file_path = Path.GetRelativePath(path.FullName, pakFile),
-                            file_count = provider.Files.Count,
-                            total_size = provider.Files.Values.Sum(f => f.Size),
-                            mount_point = mountPoint ?? "",
-                            files = provider.Files.Keys.Select(k => k.ToString()).ToList()
+                            ["file_name"] = Path.GetFileName(pakFile),
+                            ["file_path"] = Path.GetRelativePath(path.FullName, pakFile),
+                            ["file_count"] = providerFileCount,
+                            ["total_size"] = providerTotalSize,
+                            ["mount_point"] = mountPoint ?? ""
                         });
                     }
                     catch (Exception ex)
@@ -131,15 +99,14 @@ class Program
                         Console.Error.WriteLine($"Processing IoStore: {baseName}");
                         try
                         {
-                            pakInfo.Add(new
+                            pakInfo.Add(new Dictionary<string, object?>
                             {
-                                file_name = $"{baseName} (IoStore)",
-                                utoc_path = Path.GetRelativePath(path.FullName, utocFile),
-                                ucas_path = Path.GetRelativePath(path.FullName, ucasFile),
-                                file_count = provider.Files.Count,
-                                total_size = provider.Files.Values.Sum(f => f.Size),
-                                mount_point = mountPoint ?? "",
-                              files = provider.Files.Keys.Select(k => k.ToString()).ToList()
+                                ["file_name"] = $"{baseName} (IoStore)",
+                                ["utoc_path"] = Path.GetRelativePath(path.FullName, utocFile),
+                                ["ucas_path"] = Path.GetRelativePath(path.FullName, ucasFile),
+                                ["file_count"] = providerFileCount,
+                                ["total_size"] = providerTotalSize,
+                                ["mount_point"] = mountPoint ?? ""
                             });
                             processedIoStores.Add(baseName);
                         }
@@ -151,8 +118,65 @@ class Program
                 }
 
                 // Compute totals using long to avoid implicit conversion issues
-                var totalFiles = pakInfo.Select(p => (long)((dynamic)p).file_count).Sum();
-                var totalSize = pakInfo.Select(p => (long)((dynamic)p).total_size).Sum();
+                var totalFiles = pakInfo.Select(p => Convert.ToInt64(p["file_count"])).Sum();
+                var totalSize = pakInfo.Select(p => Convert.ToInt64(p["total_size"])).Sum();
+
+                if (ndjson)
+                {
+                    // One compact record per line, flushed as the buffer fills, so the
+                    // reader can start consuming before the whole mod has been walked.
+                    await using var stream = output != null ? File.Create(output.FullName) : Console.OpenStandardOutput();
+                    await using var writer = new StreamWriter(stream, new UTF8Encoding(false), 1 << 16);
+
+                    await writer.WriteLineAsync(JsonSerializer.Serialize(new
+                    {
+                        type = "header",
+                        format = 1,
+                        name = name ?? "YOUR MOD NAME",
+                        version = version ?? "1.0",
+                        author = author ?? "Unknown",
+                        mod_type = "pak"
+                    }));
+
+                    foreach (var kv in provider.Files)
+                    {
+                        var entry = DescribeFile(kv.Key.ToString(), kv.Value);
+                        if (entry == null)
+                            continue;
+                        entry["type"] = "asset";
+                        await writer.WriteLineAsync(JsonSerializer.Serialize(entry));
+                    }
+
+                    // Archive records carry no file list: like the document output,
+                    // every archive is credited with all assets the provider mounted.
+                    foreach (var archive in pakInfo)
+                    {
+                        archive["type"] = "archive";
+                        await writer.WriteLineAsync(JsonSerializer.Serialize(archive));
+                    }
+
+                    await writer.WriteLineAsync(JsonSerializer.Serialize(new
+                    {
+                        type = "end",
+                        total_files = totalFiles,
+                        total_size = totalSize
+                    }));
+                    await writer.FlushAsync();
+                    return;
+                }
+
+                // Build a global index of all files discovered by the provider
+                var filesIndex = new List<object>();
+                foreach (var kv in provider.Files)
+                {
+                    var entry = DescribeFile(kv.Key.ToString(), kv.Value);
+                    if (entry != null)
+                        filesIndex.Add(entry);
+                }
+
+                var allFiles = provider.Files.Keys.Select(k => k.ToString()).ToList();
+                foreach (var archive in pakInfo)
+                    archive["files"] = allFiles;
 
                 var info = new
                 {
@@ -189,8 +213,45 @@ class Program
                 Environment.Exit(1);
             }
         },
-        pathOption, nameOption, authorOption, versionOption, outputOption, mountPointOption);
+        pathOption, nameOption, authorOption, versionOption, outputOption, mountPointOption, ndjsonOption);
 
         return await rootCommand.InvokeAsync(args);
     }
+
+    // Extracts common metadata of a provider file via reflection; null if that fails.
+    static Dictionary<string, object?>? DescribeFile(string fileKey, object fileVal)
+    {
+        try
+        {
+            var valType = fileVal.GetType();
+
+            object? size = null;
+            object? compressedSize = null;
+            object? offset = null;
+            object? archiveName = null;
+
+            var prop = valType.GetProperty("Size");
+            if (prop != null) size = prop.GetValue(fileVal);
+            prop = valType.GetProperty("CompressedSize");
+            if (prop != null) compressedSize = prop.GetValue(fileVal);
+            prop = valType.GetProperty("Offset");
+            if (prop != null) offset = prop.GetValue(fileVal);
+            prop = valType.GetProperty("ArchiveName");
+            if (prop != null) archiveName = prop.GetValue(fileVal)?.ToString();
+
+            return new Dictionary<string, object?>
+            {
+                ["path"] = fileKey,
+                ["size"] = size,
+                ["compressed_size"] = compressedSize,
+                ["offset"] = offset,
+                ["archive"] = archiveName
+            };
+        }
+        catch (Exception)
+        {
+            // ignore reflection failures per-entry
+            return null;
+        }
+    }
 }
\ No newline at end of file